@@ -1,5 +1,13 @@
+import os
+import sys
+import zlib
+
 import ply.lex as lex
 
+import Diagnosticos
+
+_log = Diagnosticos.obtener("lexico")
+
 # Palabras reservadas
 reserved = {
     'int': 'INT',
@@ -84,7 +92,71 @@ def t_newline(t):
     t.lexer.lineno += len(t.value)
 
 def t_error(t):
-    print(f"Carácter ilegal '{t.value[0]}'")
+    _log.error("Carácter ilegal '%s'", t.value[0])
     t.lexer.skip(1)
 
-lexer = lex.lex()
+# === Construcción del lexer con caché en disco (lextab de PLY) ===
+# La primera vez se construye validando las reglas y se guarda el lextab (regex maestra
+# ya armada) en .cache/; las siguientes se carga en modo optimizado, sin validar ni
+# volver a armar la regex. El nombre lleva un CRC de este archivo y de la versión de
+# PLY, así que cualquier cambio en las reglas lo invalida. (CRC en lugar de hashlib:
+# importarlo costaría más que lo que ahorra la caché.)
+DIR_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+PREFIJO_LEXTAB = "lextab_"
+
+def clave_lextab():
+    with open(__file__, "rb") as f:
+        fuente = f.read()
+    return f"{zlib.crc32(fuente, zlib.crc32(lex.__version__.encode())):08x}"
+
+def construir_lexer(dir_cache=DIR_CACHE):
+    modulo = sys.modules[__name__]
+    if not dir_cache:
+        return lex.lex(module=modulo)
+    nombre = PREFIJO_LEXTAB + clave_lextab()
+    ruta_lextab = os.path.join(dir_cache, nombre + ".py")
+    try:
+        # Import normal (con dir_cache en sys.path) para que Python guarde el bytecode del lextab
+        sys.path.insert(0, dir_cache)
+        try:
+            lextab = __import__(nombre)
+        finally:
+            sys.path.remove(dir_cache)
+        if getattr(lextab, '_tabversion', None) != lex.__tabversion__:
+            raise ImportError("lextab de otra versión de PLY")
+        return lex.lex(module=modulo, optimize=True, lextab=lextab)
+    except (OSError, SyntaxError, ImportError, AttributeError, KeyError):
+        pass # No existe o está corrupto: se reconstruye
+
+    nuevo = lex.lex(module=modulo)
+    try:
+        os.makedirs(dir_cache, exist_ok=True)
+        # El temporal no empieza con PREFIJO_LEXTAB: otro proceso que limpia la caché a la
+        # vez (trabajadores de --jobs, pruebas en paralelo) no lo puede borrar
+        temporal = f"tmp_{nombre}_{os.getpid()}"
+        nuevo.writetab(temporal, dir_cache)
+        os.replace(os.path.join(dir_cache, temporal + ".py"), ruta_lextab) # Escritura atómica
+    except OSError as e:
+        _log.warning("Advertencia: No se pudo escribir la caché del lexer: %s", e)
+        return nuevo
+    # Borrar los lextabs de otras claves, nunca el que se acaba de publicar
+    for archivo in os.listdir(dir_cache):
+        if archivo.startswith(PREFIJO_LEXTAB) and archivo.endswith(".py") and archivo != nombre + ".py":
+            try:
+                os.remove(os.path.join(dir_cache, archivo))
+            except OSError:
+                pass # Ya lo borró otro proceso
+    return nuevo
+
+# Lexer prototipo: se construye una sola vez y nunca se le da entrada. Cada compilación
+# trabaja sobre su propia copia (nuevo_lexer), así el estado (entrada, posición, lineno)
+# no se comparte entre compilaciones del mismo proceso.
+lexer = construir_lexer()
+
+def nuevo_lexer(contenido=None, lineno=1):
+    # clone() reutiliza las regex y reglas ya construidas; solo copia el estado
+    lx = lexer.clone()
+    lx.lineno = lineno
+    if contenido is not None:
+        lx.input(contenido)
+    return lx
@@ -0,0 +1,158 @@
+import re
+from array import array
+
+import AnalizadorLexico
+import Diagnosticos
+
+# === Lexer rápido: una sola regex maestra recorrida con finditer ===
+# Reconoce exactamente los mismos tokens que las reglas PLY de AnalizadorLexico: la regex
+# maestra se arma desde esas reglas y en el mismo orden que usa PLY (primero las funciones
+# t_* en orden de definición y luego las reglas de cadena de la más larga a la más corta).
+# En lugar de un LexToken y un dict por token, llena arreglos paralelos (TokensCompactos).
+
+_log = Diagnosticos.obtener("lexico")
+
+TIPOS_TOKEN = list(AnalizadorLexico.tokens) # id de tipo -> nombre del token
+ID_TIPO = {nombre: i for i, nombre in enumerate(TIPOS_TOKEN)}
+
+# Acciones de la regex maestra (índice del grupo -> acción)
+_IGNORAR, _NUEVA_LINEA, _COMENTARIO, _SIMPLE, _ID, _ENTERO, _FLOTANTE, _CADENA, _ERROR = range(9)
+_ACCION_FUNCION = {
+    't_newline': _NUEVA_LINEA, 't_COMMENT': _COMENTARIO, 't_ID': _ID,
+    't_INT_NUM': _ENTERO, 't_FLOAT_NUM': _FLOTANTE, 't_STRING_LITERAL': _CADENA,
+}
+
+
+def _reglas_ply():
+    funciones, cadenas = [], []
+    for nombre, regla in vars(AnalizadorLexico).items():
+        if not nombre.startswith('t_') or nombre in ('t_ignore', 't_error'):
+            continue
+        if callable(regla):
+            funciones.append((regla.__code__.co_firstlineno, nombre, regla.__doc__))
+        elif isinstance(regla, str):
+            cadenas.append((nombre, regla))
+    funciones.sort()
+    cadenas.sort(key=lambda regla: len(regla[1]), reverse=True) # Como PLY: estable, la más larga primero
+    return [(nombre, patron) for _, nombre, patron in funciones] + cadenas
+
+
+def _literal(patron):
+    # Texto fijo que reconoce un patrón sin metacaracteres (la regla de '+' -> '+'), o None
+    # si el patrón no es un literal
+    literal = []
+    escapado = False
+    for c in patron:
+        if escapado:
+            if c.isalnum(): # \d, \w, \n, ...: no es un literal
+                return None
+            literal.append(c)
+            escapado = False
+        elif c == '\\':
+            escapado = True
+        elif c in '.^$*+?{}[]|()# \t\n':
+            return None
+        else:
+            literal.append(c)
+    return None if escapado else ''.join(literal)
+
+
+def _compilar_maestra():
+    # Las reglas de cadena van todas seguidas al final, así que se juntan en un único grupo
+    # (mismas alternativas, mismo orden) y el tipo sale del texto: la regex prueba muchas
+    # menos alternativas por token.
+    partes = [f"(?P<_ignorar>[{re.escape(AnalizadorLexico.t_ignore)}]+)"] # PLY los salta de a uno; aquí en bloque
+    acciones = [None, _IGNORAR]
+    simples = []
+    for nombre, patron in _reglas_ply():
+        if nombre in _ACCION_FUNCION:
+            partes.append(f"(?P<{nombre}>{patron})")
+            acciones.append(_ACCION_FUNCION[nombre])
+            # Los grupos sin nombre de cada patrón ocupan índices que nunca serán lastindex
+            acciones.extend([None] * re.compile(patron, re.VERBOSE).groups)
+        elif nombre[2:] in ID_TIPO and _literal(patron) is not None:
+            simples.append((patron, _literal(patron), ID_TIPO[nombre[2:]]))
+        else:
+            raise ValueError(f"Regla léxica sin acción en el lexer rápido: {nombre}")
+    partes.append(f"(?P<_simple>{'|'.join(patron for patron, _, _ in simples)})")
+    acciones.append(_SIMPLE)
+    partes.append(r"(?P<_error>[\s\S])") # Cualquier otro carácter: error léxico (se salta)
+    acciones.append(_ERROR)
+    # re.VERBOSE: los mismos flags con los que PLY compila sus reglas
+    tipo_simple = {literal: tipo for _, literal, tipo in simples}
+    return re.compile("|".join(partes), re.VERBOSE), acciones, tipo_simple
+
+
+_MAESTRA, _ACCIONES, _TIPO_SIMPLE = _compilar_maestra()
+_ID_RESERVADA = {palabra: ID_TIPO[tipo] for palabra, tipo in AnalizadorLexico.reserved.items()}
+_TIPO_ID = ID_TIPO['ID']
+_TIPO_ENTERO = ID_TIPO['INT_NUM']
+_TIPO_FLOTANTE = ID_TIPO['FLOAT_NUM']
+_TIPO_CADENA = ID_TIPO['STRING_LITERAL']
+
+
+class TokensCompactos:
+    """Tokens en arreglos paralelos: tipos (id en TIPOS_TOKEN), inicios (lexpos),
+    lineas y valores. Se indexa como la lista de dicts de ejecutar_lexer para la traza
+    y los mensajes de error, pero el parser lee los arreglos directamente."""
+    __slots__ = ('tipos', 'inicios', 'lineas', 'valores')
+
+    def __init__(self):
+        self.tipos = array('B')
+        self.inicios = array('L')
+        self.lineas = array('L')
+        self.valores = []
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return {'type': TIPOS_TOKEN[self.tipos[i]], 'value': self.valores[i],
+                'lineno': self.lineas[i], 'lexpos': self.inicios[i]}
+
+    def como_dicts(self):
+        return self[:]
+
+
+def tokenizar(contenido, lineno=1):
+    """Equivalente a recorrer el lexer PLY sobre 'contenido' empezando en 'lineno'."""
+    tokens = TokensCompactos()
+    tipos = tokens.tipos.append
+    inicios = tokens.inicios.append
+    lineas = tokens.lineas.append
+    valores = tokens.valores.append
+    acciones = _ACCIONES
+    tipo_simple = _TIPO_SIMPLE
+    reservadas = _ID_RESERVADA
+
+    for m in _MAESTRA.finditer(contenido):
+        accion = acciones[m.lastindex]
+        if accion == _SIMPLE:
+            texto = m.group()
+            tipos(tipo_simple[texto])
+        elif accion == _IGNORAR or accion == _COMENTARIO: # Los comentarios no cuentan líneas (igual que en PLY)
+            continue
+        elif accion == _NUEVA_LINEA:
+            lineno += m.end() - m.start()
+            continue
+        elif accion == _ID:
+            texto = m.group()
+            tipos(reservadas.get(texto, _TIPO_ID))
+        elif accion == _ENTERO:
+            texto = int(m.group())
+            tipos(_TIPO_ENTERO)
+        elif accion == _FLOTANTE:
+            texto = float(m.group())
+            tipos(_TIPO_FLOTANTE)
+        elif accion == _CADENA:
+            texto = m.group()[1:-1] # Remueve las comillas
+            tipos(_TIPO_CADENA)
+        else: # _ERROR
+            _log.error("Carácter ilegal '%s'", m.group())
+            continue
+        inicios(m.start())
+        lineas(lineno)
+        valores(texto)
+    return tokens
@@ -0,0 +1,411 @@
+from ArbolSintactico import ID_EPSILON
+from TablaSimbolos import SymbolType
+
+# === Árbol de sintaxis abstracta ===
+# Se construye a partir del árbol de derivación LL(1) (Node) una vez aceptada la cadena.
+# Las cadenas X -> Y X_rest de las expresiones se pliegan en BinOp asociativos a la
+# izquierda y las listas recursivas (funciones, instrucciones, parámetros, argumentos)
+# se aplanan en listas de Python, así que el AST no tiene nodos ε.
+# Todos los nodos tienen 'lineno'; en las expresiones es la línea de su primer token.
+# El análisis semántico anota los nodos con el símbolo resuelto ('simbolo': la entrada de
+# la tabla de símbolos) y el tipo inferido ('tipo'), y el generador de código los usa
+# directamente sin volver a consultar la tabla. Antes del análisis valen None.
+
+class NodoAST:
+    __slots__ = ('lineno',)
+    campos = () # Atributos que contienen nodos o listas de nodos hijos, en orden
+
+    def hijos(self):
+        for campo in self.campos:
+            valor = getattr(self, campo)
+            if isinstance(valor, list):
+                yield from valor
+            elif valor is not None:
+                yield valor
+
+    def __repr__(self):
+        atributos = ", ".join(f"{s}={getattr(self, s)!r}" for s in self.__slots__)
+        return f"{type(self).__name__}({atributos})"
+
+
+class Program(NodoAST):
+    __slots__ = ('decls',) # FuncDef y VarDecl globales, en orden
+    campos = ('decls',)
+
+    def __init__(self, decls, lineno=1):
+        self.decls = decls
+        self.lineno = lineno
+
+
+class FuncDef(NodoAST):
+    __slots__ = ('nombre', 'tipo_retorno', 'params', 'cuerpo', 'es_main', 'simbolo')
+    campos = ('params', 'cuerpo')
+
+    def __init__(self, nombre, tipo_retorno, params, cuerpo, lineno, es_main=False):
+        self.nombre = nombre
+        self.tipo_retorno = tipo_retorno
+        self.params = params
+        self.cuerpo = cuerpo
+        self.es_main = es_main
+        self.simbolo = None
+        self.lineno = lineno
+
+
+class Param(NodoAST):
+    __slots__ = ('nombre', 'tipo', 'simbolo')
+
+    def __init__(self, nombre, tipo, lineno):
+        self.nombre = nombre
+        self.tipo = tipo
+        self.simbolo = None
+        self.lineno = lineno
+
+
+class VarDecl(NodoAST):
+    __slots__ = ('nombre', 'tipo', 'init', 'simbolo')
+    campos = ('init',)
+
+    def __init__(self, nombre, tipo, init, lineno):
+        self.nombre = nombre
+        self.tipo = tipo
+        self.init = init # Expresión o None
+        self.simbolo = None
+        self.lineno = lineno
+
+
+# --- Instrucciones ---
+class Assign(NodoAST):
+    __slots__ = ('nombre', 'valor', 'simbolo')
+    campos = ('valor',)
+
+    def __init__(self, nombre, valor, lineno):
+        self.nombre = nombre
+        self.valor = valor
+        self.simbolo = None # Variable asignada
+        self.lineno = lineno
+
+
+class ExprStmt(NodoAST):
+    __slots__ = ('valor',) # Normalmente un Call: 'f(x);'
+    campos = ('valor',)
+
+    def __init__(self, valor, lineno):
+        self.valor = valor
+        self.lineno = lineno
+
+
+class Print(NodoAST):
+    __slots__ = ('valor',)
+    campos = ('valor',)
+
+    def __init__(self, valor, lineno):
+        self.valor = valor # Expresión o None para print()
+        self.lineno = lineno
+
+
+class If(NodoAST):
+    __slots__ = ('cond', 'entonces', 'sino')
+    campos = ('cond', 'entonces', 'sino')
+
+    def __init__(self, cond, entonces, sino, lineno):
+        self.cond = cond
+        self.entonces = entonces # Lista de instrucciones
+        self.sino = sino         # Lista de instrucciones o None si no hay else
+        self.lineno = lineno
+
+
+class While(NodoAST):
+    __slots__ = ('cond', 'cuerpo')
+    campos = ('cond', 'cuerpo')
+
+    def __init__(self, cond, cuerpo, lineno):
+        self.cond = cond
+        self.cuerpo = cuerpo
+        self.lineno = lineno
+
+
+class For(NodoAST):
+    __slots__ = ('init', 'cond', 'paso', 'cuerpo')
+    campos = ('init', 'cond', 'paso', 'cuerpo')
+
+    def __init__(self, init, cond, paso, cuerpo, lineno):
+        self.init = init # Assign
+        self.cond = cond
+        self.paso = paso # Assign
+        self.cuerpo = cuerpo
+        self.lineno = lineno
+
+
+class Return(NodoAST):
+    __slots__ = ('valor',)
+    campos = ('valor',)
+
+    def __init__(self, valor, lineno):
+        self.valor = valor # Expresión o None
+        self.lineno = lineno
+
+
+# --- Expresiones ---
+class BinOp(NodoAST):
+    __slots__ = ('op', 'izq', 'der', 'lineno_op', 'tipo')
+    campos = ('izq', 'der')
+
+    def __init__(self, op, izq, der, lineno, lineno_op):
+        self.op = op # Nombre del token: 'PLUS', 'LT', 'AND', ...
+        self.izq = izq
+        self.der = der
+        self.tipo = None
+        self.lineno = lineno
+        self.lineno_op = lineno_op
+
+
+class Call(NodoAST):
+    __slots__ = ('nombre', 'args', 'simbolo', 'tipo')
+    campos = ('args',)
+
+    def __init__(self, nombre, args, lineno):
+        self.nombre = nombre
+        self.args = args
+        self.simbolo = None
+        self.tipo = None # Tipo de retorno
+        self.lineno = lineno
+
+
+class Var(NodoAST):
+    __slots__ = ('nombre', 'simbolo', 'tipo')
+
+    def __init__(self, nombre, lineno):
+        self.nombre = nombre
+        self.simbolo = None
+        self.tipo = None
+        self.lineno = lineno
+
+
+class Literal(NodoAST):
+    __slots__ = ('valor', 'tipo')
+
+    def __init__(self, valor, tipo, lineno):
+        self.valor = valor # int, float, str o bool
+        self.tipo = tipo   # SymbolType: INT, FLOAT, STRING o BOOL
+        self.lineno = lineno
+
+
+# === Construcción del AST desde el árbol de derivación ===
+TIPOS = {'INT': SymbolType.INT, 'FLOAT': SymbolType.FLOAT, 'BOOL': SymbolType.BOOL,
+         'STRING': SymbolType.STRING, 'VOID': SymbolType.VOID}
+TIPOS_LITERAL = {'INT_NUM': SymbolType.INT, 'FLOAT_NUM': SymbolType.FLOAT, 'STRING_LITERAL': SymbolType.STRING}
+
+
+def _es_epsilon(nodo):
+    return nodo.children[0].id_simbolo == ID_EPSILON
+
+
+def construir_ast(raiz):
+    """Convierte el árbol de derivación aceptado (programa) en un Program."""
+    decls = []
+    funciones = raiz.children[0]
+    while not _es_epsilon(funciones): # funciones -> funcion funciones
+        decls.append(_funcion(funciones.children[0]))
+        funciones = funciones.children[1]
+    return Program(decls, raiz.lineno)
+
+
+def _tipo(nodo_tipo):
+    return TIPOS[nodo_tipo.children[0].simbolo] # La gramática solo deriva tipo -> INT | FLOAT | BOOL | STRING | VOID
+
+
+def _funcion(nodo):
+    primero = nodo.children[0]
+    if primero.simbolo == 'MAIN': # MAIN LPAREN RPAREN LBRACE bloque RBRACE
+        return FuncDef("main", SymbolType.VOID, [], _bloque(nodo.children[4]), primero.lineno, es_main=True)
+
+    # tipo ID funcion_rest
+    tipo = _tipo(primero)
+    id_nodo = nodo.children[1]
+    resto = nodo.children[2]
+    if resto.children[0].simbolo == 'inicializacion': # Variable global
+        return VarDecl(id_nodo.value, tipo, _inicializacion(resto.children[0]), id_nodo.lineno)
+    # LPAREN parametros RPAREN LBRACE bloque RBRACE
+    return FuncDef(id_nodo.value, tipo, _parametros(resto.children[1]), _bloque(resto.children[4]), id_nodo.lineno)
+
+
+def _parametros(nodo):
+    params = []
+    # parametros -> parametro parametros_rest | ε ; parametros_rest -> COMMA parametro parametros_rest | ε
+    while not _es_epsilon(nodo):
+        hijos = nodo.children
+        parametro, nodo = (hijos[0], hijos[1]) if len(hijos) == 2 else (hijos[1], hijos[2])
+        id_nodo = parametro.children[1]
+        params.append(Param(id_nodo.value, _tipo(parametro.children[0]), id_nodo.lineno))
+    return params
+
+
+def _bloque(nodo_bloque):
+    instrucciones = []
+    nodo = nodo_bloque.children[0] # bloque -> instrucciones
+    while not _es_epsilon(nodo): # instrucciones -> instruccion instrucciones
+        instrucciones.append(_instruccion(nodo.children[0]))
+        nodo = nodo.children[1]
+    return instrucciones
+
+
+def _instruccion(nodo):
+    primero = nodo.children[0]
+    simbolo = primero.simbolo
+    if simbolo == 'declaracion': # tipo ID inicializacion (el SEMI queda en instruccion)
+        id_nodo = primero.children[1]
+        return VarDecl(id_nodo.value, _tipo(primero.children[0]), _inicializacion(primero.children[2]), id_nodo.lineno)
+    if simbolo == 'ID':
+        resto = nodo.children[1] # id_rhs_instruccion
+        if resto.children[0].simbolo == 'EQUALS':
+            return Assign(primero.value, _exp(resto.children[1]), primero.lineno)
+        return ExprStmt(_id_o_llamada(primero, resto.children[0]), primero.lineno)
+    return _INSTRUCCIONES[simbolo](primero)
+
+
+def _if(nodo): # IF LPAREN exp RPAREN LBRACE bloque RBRACE Else
+    nodo_else = nodo.children[7]
+    sino = None if _es_epsilon(nodo_else) else _bloque(nodo_else.children[2])
+    return If(_exp(nodo.children[2]), _bloque(nodo.children[5]), sino, nodo.lineno)
+
+
+def _while(nodo): # WHILE LPAREN exp RPAREN LBRACE bloque RBRACE
+    return While(_exp(nodo.children[2]), _bloque(nodo.children[5]), nodo.lineno)
+
+
+def _for(nodo): # FOR LPAREN for_assignment SEMI exp SEMI for_assignment RPAREN LBRACE bloque RBRACE
+    return For(_for_assignment(nodo.children[2]), _exp(nodo.children[4]),
+               _for_assignment(nodo.children[6]), _bloque(nodo.children[9]), nodo.lineno)
+
+
+def _for_assignment(nodo): # ID EQUALS exp
+    id_nodo = nodo.children[0]
+    return Assign(id_nodo.value, _exp(nodo.children[2]), id_nodo.lineno)
+
+
+def _print(nodo): # PRINT LPAREN exp_opt RPAREN SEMI
+    return Print(_exp_opt(nodo.children[2]), nodo.lineno)
+
+
+def _return(nodo): # RETURN exp_opt SEMI
+    return Return(_exp_opt(nodo.children[1]), nodo.children[0].lineno)
+
+
+_INSTRUCCIONES = {'If': _if, 'While': _while, 'For': _for, 'Print': _print, 'Return': _return}
+
+
+def _inicializacion(nodo): # EQUALS exp | ε
+    return None if _es_epsilon(nodo) else _exp(nodo.children[1])
+
+
+def _exp_opt(nodo): # exp | ε
+    return None if _es_epsilon(nodo) else _exp(nodo.children[0])
+
+
+def _exp(nodo): # exp -> E
+    return _binaria(nodo.children[0])
+
+
+def _binaria(nodo):
+    # E, C, R, T y F tienen la forma X -> Y X_rest con X_rest -> op Y X_rest | ε
+    hijo = nodo.children[0]
+    izq = _primaria(hijo) if hijo.simbolo == 'A' else _binaria(hijo)
+    resto = nodo.children[1]
+    while not _es_epsilon(resto):
+        op, operando, resto = resto.children
+        der = _primaria(operando) if operando.simbolo == 'A' else _binaria(operando)
+        izq = BinOp(op.simbolo, izq, der, izq.lineno, op.lineno)
+    return izq
+
+
+def _primaria(nodo): # A
+    primero = nodo.children[0]
+    simbolo = primero.simbolo
+    if simbolo == 'ID':
+        return _id_o_llamada(primero, nodo.children[1])
+    if simbolo == 'LPAREN': # LPAREN exp RPAREN
+        return _exp(nodo.children[1])
+    if simbolo == 'TRUE' or simbolo == 'FALSE':
+        return Literal(simbolo == 'TRUE', SymbolType.BOOL, primero.lineno)
+    return Literal(primero.value, TIPOS_LITERAL[simbolo], primero.lineno)
+
+
+def _id_o_llamada(id_nodo, llamada): # ID llamada_func
+    if _es_epsilon(llamada):
+        return Var(id_nodo.value, id_nodo.lineno)
+    args = []
+    nodo = llamada.children[1] # LPAREN lista_args RPAREN
+    # lista_args -> exp lista_args_rest | ε ; lista_args_rest -> COMMA exp lista_args_rest | ε
+    while not _es_epsilon(nodo):
+        hijos = nodo.children
+        exp, nodo = (hijos[0], hijos[1]) if len(hijos) == 2 else (hijos[1], hijos[2])
+        args.append(_exp(exp))
+    return Call(id_nodo.value, args, id_nodo.lineno)
+
+
+def clases_ast():
+    return NodoAST.__subclasses__()
+
+
+def tabla_despacho(visitante, prefijo, generico):
+    """Tabla {clase de nodo: función} para un visitante, construida una sola vez por clase.
+    Busca '<prefijo><clase en minúsculas>' en el visitante; las clases sin método usan
+    'generico', salvo las hojas (sin campos hijos), que no tienen nada que recorrer."""
+    tabla = {}
+    for clase in clases_ast():
+        metodo = getattr(visitante, prefijo + clase.__name__.lower(), None)
+        if metodo is None:
+            metodo = generico if clase.campos else _visita_hoja
+        tabla[clase] = metodo
+    return tabla
+
+
+def _visita_hoja(visitante, nodo):
+    return None
+
+
+# === Recorridos con pila explícita ===
+# Las listas de instrucciones y las cadenas de operadores pueden tener cientos de miles
+# de elementos: estos recorridos no usan la recursión de Python, así que la profundidad
+# de la pila no crece con el tamaño del programa.
+def _hijos_de(nodo):
+    return tuple(nodo.hijos()) if isinstance(nodo, NodoAST) else nodo.children
+
+
+def recorrer(raices, hijos=_hijos_de):
+    """Preorden de izquierda a derecha desde una lista de raíces. Sirve para el AST y
+    para el árbol de derivación; 'hijos' decide en qué nodos se desciende."""
+    pila = list(reversed(raices))
+    while pila:
+        nodo = pila.pop()
+        yield nodo
+        pila.extend(reversed(hijos(nodo)))
+
+
+def _bloques_anidados(instruccion):
+    if isinstance(instruccion, If):
+        return instruccion.entonces + instruccion.sino if instruccion.sino else instruccion.entonces
+    if isinstance(instruccion, (While, For)):
+        return instruccion.cuerpo
+    return ()
+
+
+def recorrer_instrucciones(instrucciones):
+    """Las instrucciones de un bloque y las de sus bloques anidados (if/else, while, for), en orden."""
+    return recorrer(instrucciones, _bloques_anidados)
+
+
+def espina_izquierda(exp):
+    """Desarma una cadena de BinOp asociativa a la izquierda ((a op b) op c) ...:
+    devuelve el operando más a la izquierda y los BinOp del más interno al más externo."""
+    operaciones = []
+    while isinstance(exp, BinOp):
+        operaciones.append(exp)
+        exp = exp.izq
+    operaciones.reverse()
+    return exp, operaciones
+
+
+def contar_nodos(raiz):
+    """Número de nodos de un AST o de un árbol de derivación."""
+    return sum(1 for _ in recorrer([raiz]))
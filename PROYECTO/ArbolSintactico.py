@@ -1,31 +1,104 @@
 
 import os
 import csv
+import hashlib
+import pickle
+import itertools
+import time
+from array import array
+from collections import deque
 import AnalizadorLexico  # Ahora importamos nuestro lexer personalizado
+import AnalizadorLexicoRapido
+import Diagnosticos
 from graphviz import Digraph
 
+_log = Diagnosticos.obtener("sintactico")
+
 # === Clase para nodos del AST ===
+# Los nombres de símbolo se internan como enteros compartidos por todos los nodos
+# (NOMBRES_NODO[id] -> nombre). El lexema de ID/INT_NUM/... va en un campo aparte;
+# 'value' devuelve el lexema si existe y si no el nombre del símbolo, como antes.
+NOMBRES_NODO = []
+_IDS_NODO = {}
+
+def id_nodo(nombre):
+    id_simbolo = _IDS_NODO.get(nombre)
+    if id_simbolo is None:
+        id_simbolo = _IDS_NODO[nombre] = len(NOMBRES_NODO)
+        NOMBRES_NODO.append(nombre)
+    return id_simbolo
+
+ID_EPSILON = id_nodo('ε')
+SIN_HIJOS = () # Tupla compartida por todas las hojas
+
 class Node:
+    __slots__ = ('id_simbolo', 'lexema', 'children', 'lineno')
+
     def __init__(self, value, children=None, lineno=-1):
-        self.value = value
-        self.children = children if children else []
+        self.id_simbolo = id_nodo(value)
+        self.lexema = None
+        self.children = children if children else SIN_HIJOS
         self.lineno = lineno
 
-    def to_dot(self, dot, terminal_symbols):
-        node_id = str(id(self))
-        prefix = ""
-        if self.value == 'ε':
-            prefix = "[T]"
-        elif self.value in terminal_symbols:
-            prefix = "[T]"
-        else:
-            prefix = "[N]"
+    @property
+    def simbolo(self):
+        return NOMBRES_NODO[self.id_simbolo]
 
-        dot.node(node_id, f"{prefix} {self.value}")
-        for child in self.children:
-            child_id = child.to_dot(dot, terminal_symbols)
-            dot.edge(node_id, child_id)
-        return node_id # retorna un puntero al nodo raiz
+    @property
+    def value(self):
+        return self.lexema if self.lexema is not None else NOMBRES_NODO[self.id_simbolo]
+
+    @value.setter
+    def value(self, valor):
+        self.lexema = valor
+
+    @classmethod
+    def nuevo(cls, id_simbolo, lineno=-1):
+        # Constructor rápido para el parser: el id ya está internado
+        nodo = cls.__new__(cls)
+        nodo.id_simbolo = id_simbolo
+        nodo.lexema = None
+        nodo.children = SIN_HIJOS
+        nodo.lineno = lineno
+        return nodo
+
+    def to_dot(self, dot, terminal_symbols, contador=None):
+        # Los ε son compartidos, así que los ids de graphviz salen de un contador y no de id(self).
+        # Pila explícita: la cadena instrucciones -> instruccion instrucciones es tan profunda
+        # como el número de instrucciones.
+        if contador is None:
+            contador = itertools.count()
+        raiz_id = None
+        pila = [(self, None)]
+        while pila:
+            nodo, padre_id = pila.pop()
+            node_id = str(next(contador))
+            prefix = ""
+            if nodo.value == 'ε':
+                prefix = "[T]"
+            elif nodo.value in terminal_symbols:
+                prefix = "[T]"
+            else:
+                prefix = "[N]"
+
+            dot.node(node_id, f"{prefix} {nodo.value}")
+            if padre_id is None:
+                raiz_id = node_id
+            else:
+                dot.edge(padre_id, node_id)
+            pila.extend((child, node_id) for child in reversed(nodo.children))
+        return raiz_id # retorna un puntero al nodo raiz
+
+
+# Nodos ε compartidos, uno por línea (conservan el lineno que tenían antes).
+# Son hojas inmutables: nadie debe modificar su lexema ni su lineno.
+_epsilons = {}
+
+def nodo_epsilon(lineno):
+    nodo = _epsilons.get(lineno)
+    if nodo is None:
+        nodo = _epsilons[lineno] = Node.nuevo(ID_EPSILON, lineno)
+    return nodo
 
 # === Cargar tabla sintáctica desde CSV ===
 def cargar_tabla_sintactica(ruta_archivo):
@@ -46,144 +119,402 @@ def cargar_tabla_sintactica(ruta_archivo):
     return tabla, terminales
 
 
+# === Tabla sintáctica compilada ===
+# Los símbolos se internan como enteros: terminales (columnas) en [0, n_terminales),
+# una columna extra para tokens desconocidos y luego los no terminales (filas).
+# 'acciones' es un array('H') plano de filas x columnas con índice de producción + 1
+# (0 = error) y cada producción es una tupla de ids ya separada (vacía para ε).
+LEXEME_TERMINALS = {"ID", "INT_NUM", "FLOAT_NUM", "STRING_LITERAL", "TRUE", "FALSE"}
+
+class TablaCompilada:
+    def __init__(self, tabla, terminales, raiz=None):
+        self.terminales = list(terminales)
+        self.no_terminales = list(tabla.keys())
+        self.raiz = raiz if raiz is not None else self.no_terminales[-2]
+        self.clave_cache = None # Lo asigna la caché en disco
+        self.desde_cache = False
+        self.conflictos = []        # Solo para tablas generadas desde la gramática
+        self.tiempos_generacion = {} # Segundos por fase de crearTabla.generar_tabla
+
+        self.n_terminales = len(self.terminales)
+        self.id_desconocido = self.n_terminales
+        self.n_columnas = self.n_terminales + 1
+
+        # Nombres de símbolos indexados por id (los no terminales van después de la columna extra)
+        self.simbolos = self.terminales + ['?'] + self.no_terminales
+        self.id_terminal = {t: i for i, t in enumerate(self.terminales)}
+        ids = dict(self.id_terminal)
+        for i, nt in enumerate(self.no_terminales):
+            ids[nt] = self.n_columnas + i # Un nombre que es fila y columna es no terminal
+        self.ids = ids
+        self.id_fin = self.id_terminal['$']
+        self.id_raiz = ids[self.raiz]
+        self.es_lexema = bytearray(len(self.simbolos))
+        for t in LEXEME_TERMINALS:
+            if t in self.id_terminal:
+                self.es_lexema[self.id_terminal[t]] = 1
+
+        self.producciones = [] # tuplas de ids
+        self.reglas = []       # texto de cada producción, solo para la traza
+        indice_regla = {}
+        acciones = array('H', bytes(2 * len(self.no_terminales) * self.n_columnas))
+        for fila, nt in enumerate(self.no_terminales):
+            base = fila * self.n_columnas
+            for terminal, regla in tabla[nt].items():
+                if regla == '' or terminal not in self.id_terminal:
+                    continue
+                if regla not in indice_regla:
+                    indice_regla[regla] = len(self.producciones)
+                    partes = () if regla == 'ε' else tuple(ids[s] if s in ids else self._agregar_simbolo(s) for s in regla.split())
+                    self.producciones.append(partes)
+                    self.reglas.append(regla)
+                acciones[base + self.id_terminal[terminal]] = indice_regla[regla] + 1
+        # Filas vacías (todo error) para los símbolos agregados por _agregar_simbolo
+        extra = len(self.simbolos) - self.n_columnas - len(self.no_terminales)
+        acciones.frombytes(bytes(2 * extra * self.n_columnas))
+        self.acciones = acciones
+
+    def _agregar_simbolo(self, simbolo):
+        # Símbolo de una producción que no es fila ni columna de la tabla; nunca coincide con un token
+        self.ids[simbolo] = len(self.simbolos)
+        self.simbolos.append(simbolo)
+        self.es_lexema.append(0)
+        return self.ids[simbolo]
+
+
+def compilar_tabla(tabla, terminales, raiz=None):
+    return TablaCompilada(tabla, terminales, raiz)
+
+
+# Tablas compiladas por ruta de origen (CSV o gramática), para reutilizarlas entre
+# compilaciones del mismo proceso
+_tablas_compiladas = {}
+
+def cargar_tabla_compilada(ruta_archivo, ruta_gramatica=None, dir_cache=None):
+    """Carga la tabla del CSV ya compilada.
+
+    Con dir_cache, la tabla compilada se guarda en disco (pickle) con una clave que es el
+    hash de la gramática y del CSV, así que cualquier cambio en ellos la invalida."""
+    ruta = os.path.abspath(ruta_archivo)
+
+    def construir():
+        tabla, terminales = cargar_tabla_sintactica(ruta)
+        return compilar_tabla(tabla, terminales)
+
+    return _cargar_tabla(ruta, "csv", construir, [ruta_gramatica, ruta], dir_cache)
+
+
+def generar_tabla_compilada(ruta_gramatica, dir_cache=None):
+    """Construye la tabla directamente desde la gramática (FIRST/FOLLOW/PREDICT en el
+    proceso), sin leer ni escribir el CSV. Usa la misma caché en disco que
+    cargar_tabla_compilada, con clave derivada solo de la gramática."""
+    import crearTabla # Importación diferida: solo se necesita al generar la tabla
+    ruta = os.path.abspath(ruta_gramatica)
+
+    def construir():
+        generada = crearTabla.generar_tabla(ruta)
+        inicio = time.perf_counter()
+        compilada = compilar_tabla(generada.tabla, generada.terminales, raiz=generada.raiz)
+        compilada.conflictos = generada.conflictos
+        compilada.tiempos_generacion = dict(generada.tiempos, compilacion=time.perf_counter() - inicio)
+        return compilada
+
+    return _cargar_tabla(ruta, "gramatica", construir, [ruta], dir_cache)
+
+
+def _cargar_tabla(ruta, origen, construir, rutas_clave, dir_cache):
+    mtime = os.path.getmtime(ruta)
+    en_memoria = _tablas_compiladas.get(ruta)
+    if en_memoria and en_memoria[0] == mtime:
+        return en_memoria[1]
+    if dir_cache:
+        compilada = _cargar_tabla_cache_disco(origen, construir, rutas_clave, dir_cache)
+    else:
+        compilada = construir()
+    _tablas_compiladas[ruta] = (mtime, compilada)
+    return compilada
+
+
+# === Caché binaria de la tabla compilada ===
+# Subir la versión si cambia el formato de TablaCompilada o la forma de generarla.
+VERSION_CACHE_TABLA = 3
+PREFIJO_CACHE_TABLA = "tabla_ll1_"
+
+def clave_cache_tabla(*rutas):
+    h = hashlib.sha256(f"v{VERSION_CACHE_TABLA}".encode())
+    for ruta in rutas:
+        if ruta is None or not os.path.exists(ruta):
+            continue
+        with open(ruta, "rb") as f:
+            h.update(f.read())
+        h.update(b"\0")
+    return h.hexdigest()
+
+def _cargar_tabla_cache_disco(origen, construir, rutas_clave, dir_cache):
+    clave = clave_cache_tabla(*rutas_clave)
+    prefijo = f"{PREFIJO_CACHE_TABLA}{origen}_"
+    ruta_cache = os.path.join(dir_cache, f"{prefijo}{clave[:32]}.pickle")
+    try:
+        with open(ruta_cache, "rb") as f:
+            compilada = pickle.load(f)
+        if isinstance(compilada, TablaCompilada) and getattr(compilada, 'clave_cache', None) == clave:
+            compilada.desde_cache = True
+            return compilada
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        pass # No existe o está corrupta: se reconstruye
+
+    compilada = construir()
+    compilada.clave_cache = clave
+    try:
+        os.makedirs(dir_cache, exist_ok=True)
+        # Borrar entradas anteriores del mismo origen
+        for nombre in os.listdir(dir_cache):
+            if nombre.startswith(prefijo) and nombre.endswith(".pickle"):
+                os.remove(os.path.join(dir_cache, nombre))
+        temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as f:
+            pickle.dump(compilada, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta_cache) # Escritura atómica
+    except OSError as e:
+        _log.warning("Advertencia: No se pudo escribir la caché de la tabla sintáctica: %s", e)
+    return compilada
+
+
 # === Ejecutar Lexer e imprimir tokens (debug opcional) ===
-def ejecutar_lexer(contenido):
-    AnalizadorLexico.lexer.input(contenido)  # Accedemos al lexer construido en lexer.py
-    tokens = []
-    while True:
-        tok = AnalizadorLexico.lexer.token()
+# motor="ply" devuelve una lista de dicts; motor="rapido" usa AnalizadorLexicoRapido y
+# devuelve TokensCompactos (mismos tokens, en arreglos paralelos).
+MOTORES_LEXER = ("ply", "rapido")
+
+class FlujoTokens:
+    """Tokens de PLY (mismos dicts que ejecutar_lexer) generados a demanda mientras se
+    itera, con un token de anticipación en 'siguiente' (None al final de la entrada).
+    analizar_cadena lo consume directamente, así el lexer y el parser avanzan juntos y
+    nunca hay más de un token en memoria. 'consumidos' cuenta los tokens ya entregados."""
+    __slots__ = ('_lexer', 'siguiente', 'consumidos')
+
+    def __init__(self, contenido):
+        self._lexer = AnalizadorLexico.nuevo_lexer(contenido)  # Lexer propio de esta compilación (lineno desde 1)
+        self.consumidos = 0
+        self.siguiente = self._leer()
+
+    def _leer(self):
+        tok = self._lexer.token()
         if not tok:
-            break
-        tokens.append({
+            return None
+        return {
             'type': tok.type,
             'value': tok.value,
             'lineno': tok.lineno,
             'lexpos': tok.lexpos
-        })
-    return tokens
+        }
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.siguiente
+        if tok is None:
+            raise StopIteration
+        self.siguiente = self._leer()
+        self.consumidos += 1
+        return tok
+
+
+def ejecutar_lexer(contenido, motor="ply"):
+    if motor == "rapido":
+        return AnalizadorLexicoRapido.tokenizar(contenido)
+    return list(FlujoTokens(contenido))
+
+# === Destinos de la traza del análisis sintáctico (paso a paso) ===
+# analizar_cadena llama a traza.registrar(paso, pila, tokens, pos, accion) en cada paso.
+# 'pila' es la lista de nombres de símbolos de la pila y 'tokens[pos:]' la entrada
+# restante (sin $), así que cada destino decide cuánto copia o formatea.
+def _entrada_restante(tokens, pos):
+    tipos = [t['type'] for t in tokens[pos:]]
+    if pos <= len(tokens):
+        tipos.append('$')
+    return ' '.join(tipos)
+
+
+def _escapar_celda(texto):
+    return texto.replace('|', '\\|')
+
+
+class TrazaArchivo:
+    """Escribe cada paso como fila markdown en cuanto se produce, sin guardarlo en memoria."""
+    ENCABEZADO = "| Paso | Pila | Entrada | Acción |\n|------|------|---------|--------|\n"
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.filas_escritas = 0
+        self._archivo = open(ruta, "w", encoding="utf-8")
+        self._archivo.write(self.ENCABEZADO)
+
+    def registrar(self, paso, pila, tokens, pos, accion):
+        pila_str = ' '.join(pila)
+        self.escribir_fila(paso, pila_str, _entrada_restante(tokens, pos), accion)
+
+    def escribir_fila(self, paso, pila_str, entrada_str, accion):
+        self._archivo.write(f"| {paso} | {_escapar_celda(pila_str)} | {_escapar_celda(entrada_str)} | {_escapar_celda(accion)} |\n")
+        self.filas_escritas += 1
+
+    def cerrar(self):
+        if self._archivo.closed:
+            return
+        if self.filas_escritas == 0:
+            self._archivo.write("|      |      |         |                |\n") # Fila vacía si no hay historial
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class TrazaUltimos:
+    """Buffer circular con los últimos n pasos (n=None conserva todos).
+
+    Solo copia los símbolos de la pila y la posición del cursor; la entrada
+    restante se formatea al consultar filas()."""
+    def __init__(self, n=None):
+        if n is not None and n < 1:
+            raise ValueError(f"TrazaUltimos necesita n >= 1, no {n}")
+        self.pasos = deque(maxlen=n)
+        self._tokens = ()
+
+    def registrar(self, paso, pila, tokens, pos, accion):
+        self._tokens = tokens
+        self.pasos.append((paso, tuple(pila), pos, accion))
+
+    def filas(self):
+        return [{
+            "paso": paso,
+            "pila": ' '.join(pila),
+            "entrada": _entrada_restante(self._tokens, pos),
+            "accion": accion
+        } for paso, pila, pos, accion in self.pasos]
+
+    def volcar(self, traza_archivo):
+        """Copia las filas retenidas a una TrazaArchivo."""
+        for fila in self.filas():
+            traza_archivo.escribir_fila(fila["paso"], fila["pila"], fila["entrada"], fila["accion"])
+
+
+def _entrada_tuplas(tokens, id_terminal, id_desconocido):
+    """Iterador de (id de terminal en la tabla, valor, lineno, lexpos) para la lista de
+    dicts de ejecutar_lexer, un FlujoTokens o TokensCompactos (leyendo sus arreglos sin
+    crear dicts)."""
+    if isinstance(tokens, AnalizadorLexicoRapido.TokensCompactos):
+        id_por_tipo = [id_terminal.get(nombre, id_desconocido) for nombre in AnalizadorLexicoRapido.TIPOS_TOKEN]
+        return zip(map(id_por_tipo.__getitem__, tokens.tipos), tokens.valores, tokens.lineas, tokens.inicios)
+    return ((id_terminal.get(t['type'], id_desconocido), t['value'], t['lineno'], t['lexpos']) for t in tokens)
+
 
 # === Analizador Bottom-Up LL1 con construcción de AST ===
-def analizar_cadena(tabla, tokens, terminales, contenido):
-    root = list(tabla.keys())[-2]
+# La entrada se recorre con un iterador de tuplas (_entrada_tuplas) y un contador pos,
+# sin copiarla ni hacer pop(0); 'tokens' puede ser un FlujoTokens, que se lee a demanda.
+# Si traza es None no se registra nada; si no, se le entrega cada paso (ver TrazaArchivo
+# y TrazaUltimos). La traza muestra la entrada restante, así que en ese caso un
+# FlujoTokens se lee completo antes de empezar.
+# 'tabla' puede ser una TablaCompilada o el dict de cargar_tabla_sintactica (se compila
+# en cada llamada, así que conviene pasar la tabla ya compilada).
+def analizar_cadena(tabla, tokens, terminales, contenido, traza=None):
+    if not isinstance(tabla, TablaCompilada):
+        tabla = compilar_tabla(tabla, terminales)
+    if traza is not None and isinstance(tokens, FlujoTokens):
+        tokens = list(tokens)
+
+    simbolos = tabla.simbolos
+    producciones = tabla.producciones
+    acciones = tabla.acciones
+    es_lexema = tabla.es_lexema
+    id_terminal = tabla.id_terminal
+    id_desconocido = tabla.id_desconocido
+    n_columnas = tabla.n_columnas
+    id_fin = tabla.id_fin
+
+    ids_nodo = [id_nodo(nombre) for nombre in simbolos] # id de la tabla -> id de nodo
+    nuevo_nodo = Node.nuevo
+
+    root = tabla.raiz
     nodo_raiz_arbol = Node(root, lineno=1) # Root node lineno set to 1
-    stack = [('$', None), (root, nodo_raiz_arbol)]
-    
-    print(root)
-
-    entrada = [{'token': t['type'], 'value': t['value'], 'pos': t['lexpos'], 'lineno': t['lineno']} for t in tokens]
-    # Añadir el token de fin de cadena ($)
-    entrada.append({
-        'token': '$',
-        'value': '$',
-        'pos': len(contenido),
-        'lineno': tokens[-1]['lineno'] if tokens else 1
-    })
-    
+    stack = [(id_fin, None), (tabla.id_raiz, nodo_raiz_arbol)]
+    _log.debug("Símbolo inicial: %s", root)
+
+    # Token de fin de cadena ($), se entrega cuando se acaba la entrada; su línea es la del último token
+    entrada = _entrada_tuplas(tokens, id_terminal, id_desconocido)
+    pos = 0
+    id_entrada, valor_actual, linea_actual, lexpos_actual = next(entrada, None) or (id_fin, '$', 1, len(contenido))
+
     paso = 0
-    historial = []
     aceptado = True
     error_info = {}
 
-    LEXEME_TERMINALS = {"ID", "INT_NUM", "FLOAT_NUM", "STRING_LITERAL", "TRUE", "FALSE"}
-    #LEXEME_TERMINALS = AnalizadorLexico.tokens
-
-    while len(stack) > 0:
+    while stack:
         paso += 1
-        simbolo_pila, nodo_en_pila = stack[-1]
-        token_entrada = entrada[0]['token']
-        valor_entrada = entrada[0]['value']
-        current_lookahead_token_lineno = entrada[0]['lineno']
+        id_pila, nodo_en_pila = stack[-1]
+        id_previsto = id_entrada # El lookahead al empezar el paso, antes de coincidir
+        current_lookahead_token_lineno = linea_actual
 
-        if nodo_en_pila and nodo_en_pila.lineno == -1 and simbolo_pila != '$':
+        if nodo_en_pila is not None and nodo_en_pila.lineno == -1:
             nodo_en_pila.lineno = current_lookahead_token_lineno
 
-        accion = ""
-        if simbolo_pila == token_entrada:
-            accion = f"Coincidir '{simbolo_pila}'"
-            terminal_node_from_stack = nodo_en_pila
-            if terminal_node_from_stack: # Ensure node exists
-                 terminal_node_from_stack.lineno = current_lookahead_token_lineno
-            if simbolo_pila in LEXEME_TERMINALS:
-                if terminal_node_from_stack: # Ensure node exists
-                    terminal_node_from_stack.value = valor_entrada
+        if id_pila == id_entrada:
+            if traza is not None:
+                accion = f"Coincidir '{simbolos[id_pila]}'"
+            if nodo_en_pila is not None:
+                nodo_en_pila.lineno = current_lookahead_token_lineno
+                if es_lexema[id_pila]:
+                    nodo_en_pila.lexema = valor_actual
             stack.pop()
-            entrada.pop(0)
-
-        elif simbolo_pila in tabla and token_entrada in tabla[simbolo_pila]:
-            lhs_node = nodo_en_pila # This is the node being expanded
-            if lhs_node and lhs_node.lineno == -1 : # Set lineno if not already set by earlier top-of-stack update
-                lhs_node.lineno = current_lookahead_token_lineno
+            pos += 1
+            id_entrada, valor_actual, linea_actual, lexpos_actual = next(entrada, None) or (id_fin, '$', linea_actual, len(contenido))
 
+        elif id_pila >= n_columnas and acciones[(id_pila - n_columnas) * n_columnas + id_entrada]:
+            indice = acciones[(id_pila - n_columnas) * n_columnas + id_entrada] - 1
+            rhs = producciones[indice]
             stack.pop()
-            regla = tabla[simbolo_pila][token_entrada]
-
-            if regla == '':
-                aceptado = False
-                error_info = {
-                    "token": valor_entrada,
-                    "linea": entrada[0]['lineno'],
-                    "columna": entrada[0]['pos'] + 1
-                }
-                break
-
-            if regla == 'ε':
-                accion = f"{simbolo_pila} → ε"
-                epsilon_child_node = Node('ε', lineno=current_lookahead_token_lineno)
-                if lhs_node: # Ensure node exists
-                    lhs_node.children = [epsilon_child_node]
-                    # Optionally, update lhs_node.lineno if it was -1, though top-of-stack logic should handle it
-                    if lhs_node.lineno == -1:
-                        lhs_node.lineno = current_lookahead_token_lineno
+
+            if traza is not None:
+                accion = f"{simbolos[id_pila]} → {tabla.reglas[indice]}"
+            if not rhs:
+                if nodo_en_pila is not None:
+                    nodo_en_pila.children = (nodo_epsilon(current_lookahead_token_lineno),)
             else:
-                accion = f"{simbolo_pila} → {regla}"
-                partes_rhs = regla.split()
-                children_nodes_for_lhs = []
-                for parte_symbol in partes_rhs:
-                    child_node = Node(parte_symbol)
-                    children_nodes_for_lhs.append(child_node)
-
-                if lhs_node: # Ensure node exists
-                    lhs_node.children = children_nodes_for_lhs
-                    if lhs_node.lineno == -1:
-                        lhs_node.lineno = current_lookahead_token_lineno
-
-                for i in range(len(partes_rhs) - 1, -1, -1):
-                    stack.append((partes_rhs[i], children_nodes_for_lhs[i]))
+                hijos = tuple([nuevo_nodo(ids_nodo[s]) for s in rhs])
+                if nodo_en_pila is not None:
+                    nodo_en_pila.children = hijos
+                stack.extend(zip(reversed(rhs), reversed(hijos)))
         else:
             aceptado = False
             error_info = {
-                "token": valor_entrada,
-                "linea": entrada[0]['lineno'],
-                "columna": entrada[0]['pos'] + 1
+                "token": valor_actual,
+                "linea": linea_actual,
+                "columna": lexpos_actual + 1
             }
             break
 
-        historial.append({
-            "paso": paso,
-            "pila": ' '.join([s[0] for s in stack]),
-            "entrada": ' '.join([t['token'] for t in entrada]),
-            "accion": accion
-        })
+        if traza is not None:
+            traza.registrar(paso, [simbolos[s] for s, _ in stack], tokens, pos, accion)
 
-        if len(stack) == 1 and stack[0][0] == '$' and token_entrada == '$':
-            if stack[0][0] == simbolo_pila and simbolo_pila == token_entrada : #This case should be handled by the first if in the loop
-                 stack.pop() # pop $
-                 entrada.pop(0) # pop $ from input
+        # Si el último paso coincidió un terminal, queda un paso más que coincide '$' y vacía la pila
+        if len(stack) == 1 and stack[0][0] == id_fin and id_previsto == id_fin:
             break
 
     ast_to_return = None
     if aceptado:
         ast_to_return = nodo_raiz_arbol
 
-    return historial, aceptado, error_info, ast_to_return
+    return aceptado, error_info, ast_to_return
 
 # === Generar archivo DOT y renderizado del AST ===
 def guardar_ast(ast, terminales, nombre_salida="arbol_sintactico/"):
-    os.makedirs("arbol_sintactico", exist_ok=True)
+    os.makedirs(os.path.dirname(nombre_salida) or ".", exist_ok=True) # Junto a nombre_salida, no en el directorio actual
     dot = Digraph(comment='Árbol Sintáctico Abstracto')
     dot = Digraph(comment='https://dreampuf.github.io/GraphvizOnline')
     if ast:
         ast.to_dot(dot, terminales)
+        dot.save(filename=nombre_salida + ".dot") # Antes de renderizar: el .dot no necesita el ejecutable de Graphviz
         dot.render(nombre_salida, format='png', cleanup=True)
-        dot.save(filename=nombre_salida + ".dot")
-        print(f"✅ Árbol guardado en arbol_sintactico/{os.path.basename(nombre_salida)}")
\ No newline at end of file
+        _log.info("✅ Árbol guardado en arbol_sintactico/%s", os.path.basename(nombre_salida))
\ No newline at end of file
@@ -0,0 +1,223 @@
+import re
+from bisect import bisect_right
+
+from InstruccionesMIPS import Instruccion, Virtual, destinos
+
+# === Asignación de registros por barrido lineal (linear scan) ===
+# El generador emite el cuerpo de cada función con registros virtuales ilimitados (ids
+# Virtual: '%tN' para enteros/punteros y '%fN' para flotantes). Aquí se calcula el intervalo de vida de
+# cada virtual, desde su primera hasta su última aparición. Los temporales no sobreviven a
+# la instrucción fuente que los creó, así que nunca cruzan una etiqueta ni un salto hacia
+# atrás y ese intervalo es exacto. Después se recorren en orden de inicio asignando
+# registros físicos. Cuando no queda ninguno libre se derrama (spill) a una ranura de la
+# pila, debajo de las locales, el intervalo vivo que termina más tarde.
+# Los virtuales vivos a través de un jal también van a la pila: la función llamada usa
+# los mismos $t/$f sin guardarlos.
+
+REGISTROS_ENTEROS = tuple(f"$t{i}" for i in range(8))
+REGISTROS_FLOTANTES = tuple(f"$f{i}" for i in list(range(4, 12)) + list(range(16, 30)))
+# Tablas por banco, indexadas con el bit 0 del id virtual (0: enteros, 1: flotantes)
+REGISTROS = (REGISTROS_ENTEROS, REGISTROS_FLOTANTES)
+# Registros de trabajo para cargar y guardar los derramados alrededor de cada instrucción
+# (una instrucción tiene como mucho dos registros de cada banco). No se asignan a intervalos.
+AUXILIARES = (('$t8', '$t9'), ('$f30', '$f31'))
+_CARGA = ('lw', 'l.s')
+_GUARDADO = ('sw', 's.s')
+_VIRTUAL = re.compile(r"%([tf])(\d+)")
+
+
+class Intervalo:
+    __slots__ = ('virtual', 'inicio', 'fin', 'registro', 'ranura')
+
+    def __init__(self, virtual, inicio):
+        self.virtual = virtual
+        self.inicio = inicio
+        self.fin = inicio
+        self.registro = None # Índice en REGISTROS[banco], o None si quedó en la pila
+        self.ranura = None   # Desplazamiento respecto de $fp si se derramó
+
+
+def _intervalos(instrucciones, cota):
+    # Devuelve (intervalos indexados por id, los mismos en orden de inicio, posiciones de los
+    # jal, posiciones de las instrucciones con virtuales en los operandos o en el comentario:
+    # son las únicas que hay que reescribir)
+    intervalos = [None] * cota
+    orden = []
+    llamadas = []
+    a_reescribir = []
+    for i, instruccion in enumerate(instrucciones):
+        comentario = instruccion.comentario
+        marcada = comentario is not None and '%' in comentario
+        for operando in instruccion.operandos:
+            if type(operando) is Virtual:
+                intervalo = intervalos[operando]
+                if intervalo is None:
+                    intervalo = intervalos[operando] = Intervalo(operando, i)
+                    orden.append(intervalo)
+                else:
+                    intervalo.fin = i
+                marcada = True
+        if marcada:
+            a_reescribir.append(i)
+        if instruccion.op == 'jal':
+            llamadas.append(i)
+    return intervalos, orden, llamadas, a_reescribir
+
+
+class _Ranuras:
+    # Ranuras de 4 bytes debajo de las locales; se reutilizan cuando su intervalo termina
+    def __init__(self, tamano_locales):
+        self.base = -tamano_locales
+        self.total = 0
+        self.libres = []   # (fin del último intervalo que la usó, desplazamiento)
+        self.ocupadas = [] # Intervalos derramados vivos
+
+    def tomar(self, intervalo):
+        # Un intervalo que ya estaba en un registro y se derrama tarde necesita una ranura
+        # libre desde su inicio, no solo desde la posición actual del barrido
+        for i, (fin, ranura) in enumerate(self.libres):
+            if fin < intervalo.inicio:
+                del self.libres[i]
+                intervalo.ranura = ranura
+                break
+        else:
+            self.total += 1
+            intervalo.ranura = self.base - 4 * self.total
+        self.ocupadas.append(intervalo)
+
+    def expirar(self, posicion):
+        vivas = []
+        for intervalo in self.ocupadas:
+            if intervalo.fin < posicion:
+                self.libres.append((intervalo.fin, intervalo.ranura))
+            else:
+                vivas.append(intervalo)
+        self.ocupadas = vivas
+
+
+def _barrido(orden, llamadas, ranuras):
+    # Registros libres de cada banco como máscara de bits (bit i encendido: REGISTROS[banco][i]
+    # libre); tomar el de menor índice y devolverlo son O(1)
+    libres = [(1 << len(registros)) - 1 for registros in REGISTROS]
+    activos = ([], []) # Por banco, ordenados por fin
+    derramados = 0
+    for intervalo in orden:
+        banco = intervalo.virtual & 1
+        inicio = intervalo.inicio
+        if ranuras.ocupadas:
+            ranuras.expirar(inicio)
+        vivos = activos[banco]
+        while vivos and vivos[0].fin < inicio:
+            libres[banco] |= 1 << vivos.pop(0).registro
+        if llamadas and bisect_right(llamadas, inicio) < bisect_right(llamadas, intervalo.fin - 1):
+            ranuras.tomar(intervalo) # Vivo a través de un jal
+            derramados += 1
+            continue
+        mascara = libres[banco]
+        if mascara:
+            intervalo.registro = (mascara & -mascara).bit_length() - 1
+            libres[banco] = mascara & (mascara - 1)
+        else:
+            ultimo = vivos[-1]
+            if ultimo.fin > intervalo.fin: # Se derrama el que termina más tarde
+                intervalo.registro, ultimo.registro = ultimo.registro, None
+                vivos.pop()
+                ranuras.tomar(ultimo)
+            else:
+                ranuras.tomar(intervalo)
+                derramados += 1
+                continue
+            derramados += 1
+        posicion = len(vivos)
+        while posicion and vivos[posicion - 1].fin > intervalo.fin:
+            posicion -= 1
+        vivos.insert(posicion, intervalo)
+    return derramados
+
+
+def _con_spill(instruccion, intervalos):
+    # Carga los operandos derramados en registros de trabajo antes de la instrucción y
+    # guarda después los que escribe. Devuelve (cargas, guardados) y deja los operandos ya
+    # reescritos en la instrucción.
+    escritos = destinos(instruccion)
+    operandos = list(instruccion.operandos)
+    auxiliares = {} # id virtual derramado -> registro de trabajo
+    cargas, guardados = [], []
+    # Primero los operandos leídos, cada uno con su registro de trabajo; el destino se
+    # escribe después de leerlos, así que si solo se escribe puede reusar el primero
+    leidos = [p for p in range(len(operandos)) if p not in escritos]
+    for posicion in leidos + list(escritos):
+        operando = operandos[posicion]
+        if type(operando) is not Virtual:
+            continue
+        intervalo = intervalos[operando]
+        banco = operando & 1
+        if intervalo.registro is not None:
+            operandos[posicion] = REGISTROS[banco][intervalo.registro]
+            continue
+        auxiliar = auxiliares.get(operando)
+        if auxiliar is None:
+            n = 0 if posicion in escritos else sum(1 for v in auxiliares if v & 1 == banco)
+            auxiliar = auxiliares[operando] = AUXILIARES[banco][n]
+        ranura = f"{intervalo.ranura}($fp)"
+        if posicion in escritos:
+            guardados.append(Instruccion(_GUARDADO[banco], (auxiliar, ranura), f"Spill: guardar {operando}"))
+        else:
+            cargas.append(Instruccion(_CARGA[banco], (auxiliar, ranura), f"Spill: recargar {operando}"))
+        operandos[posicion] = auxiliar
+    instruccion.operandos = tuple(operandos)
+    return cargas, guardados
+
+
+def _reescribir(instrucciones, intervalos, orden, a_reescribir):
+    # Reescribe en el lugar; solo arma una lista nueva si hay que intercalar código de spill
+    fisicos = [None] * len(intervalos) # id -> registro físico; None: derramado
+    nombres = [None] * len(intervalos) # id -> texto para los comentarios
+    for intervalo in orden:
+        virtual = intervalo.virtual
+        if intervalo.registro is None:
+            nombres[virtual] = f"{intervalo.ranura}($fp)"
+        else:
+            fisicos[virtual] = nombres[virtual] = REGISTROS[virtual & 1][intervalo.registro]
+
+    def reemplazo(m):
+        virtual = int(m.group(2)) << 1 | (m.group(1) == 'f')
+        nombre = nombres[virtual] if virtual < len(nombres) else None
+        return nombre or m.group()
+
+    intercalados = []
+    for i in a_reescribir:
+        instruccion = instrucciones[i]
+        comentario = instruccion.comentario
+        if comentario is not None and '%' in comentario:
+            instruccion.comentario = _VIRTUAL.sub(reemplazo, comentario)
+        operandos = tuple([fisicos[o] if type(o) is Virtual else o for o in instruccion.operandos])
+        if None in operandos:
+            intercalados.append((i, _con_spill(instruccion, intervalos)))
+        else:
+            instruccion.operandos = operandos
+    if not intercalados:
+        return instrucciones
+    resultado = []
+    anterior = 0
+    for i, (cargas, guardados) in intercalados:
+        resultado.extend(instrucciones[anterior:i])
+        resultado.extend(cargas)
+        resultado.append(instrucciones[i])
+        resultado.extend(guardados)
+        anterior = i + 1
+    resultado.extend(instrucciones[anterior:])
+    return resultado
+
+
+def asignar_registros(instrucciones, tamano_locales, cota_virtuales):
+    """Reemplaza los registros virtuales del cuerpo de una función por registros físicos.
+    cota_virtuales es mayor que cualquier id Virtual del cuerpo. Devuelve (instrucciones,
+    bytes de ranuras de spill a reservar en el marco, intervalos derramados). Las ranuras
+    quedan en -tamano_locales - 4, -tamano_locales - 8, ... ($fp)."""
+    intervalos, orden, llamadas, a_reescribir = _intervalos(instrucciones, cota_virtuales)
+    if not orden:
+        return instrucciones, 0, 0
+    ranuras = _Ranuras(tamano_locales)
+    derramados = _barrido(orden, llamadas, ranuras)
+    return _reescribir(instrucciones, intervalos, orden, a_reescribir), 4 * ranuras.total, derramados
@@ -0,0 +1,45 @@
+import logging
+import sys
+
+# === Diagnósticos del compilador ===
+# Cada módulo pide su logger con obtener("semantico"), obtener("codigo"), ... y registra con
+# argumentos diferidos (log.debug("... %s", x)): si el nivel está desactivado el mensaje
+# ni siquiera se formatea. Los bloques de depuración que recorren algo van además bajo
+# log.isEnabledFor(DEPURACION). main.py elige el nivel con configurar().
+DEPURACION = logging.DEBUG
+INFO = logging.INFO
+ADVERTENCIA = logging.WARNING
+ERROR = logging.ERROR
+
+RAIZ = "compilador"
+
+
+def obtener(nombre):
+    return logging.getLogger(f"{RAIZ}.{nombre}")
+
+
+class _SalidaEstandar(logging.Handler):
+    # Escribe en el sys.stdout vigente al emitir (respeta redirect_stdout, que usa el modo
+    # lote). Los errores de escritura se propagan, igual que con print.
+    def emit(self, registro):
+        sys.stdout.write(self.format(registro) + "\n")
+
+
+def configurar(nivel=INFO):
+    """Fija el nivel de todos los loggers del compilador. Con INFO la salida es la de
+    siempre; con ADVERTENCIA (modo silencioso) solo salen advertencias y errores; con
+    DEPURACION también las trazas internas de las fases."""
+    raiz = logging.getLogger(RAIZ)
+    raiz.setLevel(nivel)
+    raiz.propagate = False
+    if not any(isinstance(manejador, _SalidaEstandar) for manejador in raiz.handlers):
+        manejador = _SalidaEstandar()
+        manejador.setFormatter(logging.Formatter("%(message)s"))
+        raiz.addHandler(manejador)
+
+
+def nivel():
+    return logging.getLogger(RAIZ).level
+
+
+configurar() # Por defecto, los mensajes salen por stdout como antes
@@ -1,16 +1,50 @@
+import Diagnosticos
+from ArbolAbstracto import BinOp, Call, Literal, VarDecl, espina_izquierda, recorrer_instrucciones, tabla_despacho
+from AsignadorRegistros import asignar_registros
+from InstruccionesMIPS import COMENTARIO, ETIQUETA, Instruccion, Virtual, renderizar
+from OptimizadorMirilla import VENTANA, optimizar
+from PlegadoConstantes import a_precision_simple, plegar_constantes
+
+_log = Diagnosticos.obtener("codigo")
+
+
+def _texto_float(valor):
+    # Seis decimales, salvo que pierdan precisión simple (p. ej. un 1.0 / 3 plegado)
+    texto = f"{float(valor):.6f}"
+    if a_precision_simple(float(texto)) == a_precision_simple(float(valor)):
+        return texto
+    return repr(float(valor))
+
+
+def _en_fpu(registro):
+    # $fN físico o Virtual del banco flotante (bit 0 encendido)
+    if type(registro) is Virtual:
+        return registro & 1 == 1
+    return registro[1] == 'f'
+
+
 class GeneradorSPIM:
-    def __init__(self):
+    def __init__(self, ventana_mirilla=VENTANA, reglas_mirilla=None):
         self.codigo_data = []
-        self.codigo_text = []
+        self.codigo_text = [] # Instruccion; el texto se arma al final de generar()
         self.contador_etiquetas = 0
         self.tabla_simbolos = None
         self.ast_root = None
-        self.registros_temporales = [f"$t{i}" for i in range(10)]
-        self.registros_usados = [False] * 10
-        self.registros_flotantes_temporales = [f"$f{i}" for i in list(range(4, 12)) + list(range(16,30))]
-        self.registros_flotantes_usados = [False] * len(self.registros_flotantes_temporales)
+        # Los temporales son registros virtuales (ids enteros, ver Virtual) sin límite y
+        # numerados desde 0 en cada función; AsignadorRegistros los reemplaza por $t/$f (o
+        # ranuras de spill) al terminar la función
+        self.contador_temporales = 0
+        self.temporales_derramados = 0
+        self._necesidades = {} # BinOp -> (necesidad de Sethi–Ullman, sin llamadas)
+        # Optimización de mirilla sobre codigo_text antes de renderizar (ver OptimizadorMirilla);
+        # reglas_mirilla None: todas las de REGLAS; () la desactiva
+        self.ventana_mirilla = ventana_mirilla
+        self.reglas_mirilla = reglas_mirilla
+        self.eliminadas_mirilla = {} # Regla -> instrucciones eliminadas
         self.funcion_actual_nombre = None
         self.funcion_actual_info = {}
+        self.funcion_actual_return_type = None
+        self.etiqueta_retorno = None # Epílogo de la función actual; lo crea el primer return
         self.offsets_locales_actuales = {}
         self.offset_local_actual = 0
 
@@ -18,101 +52,56 @@ class GeneradorSPIM:
         self.contador_etiquetas += 1
         return f"{prefijo}{self.contador_etiquetas}"
 
+    def _emitir(self, op, *operandos, comentario=None):
+        self.codigo_text.append(Instruccion(op, operandos, comentario))
+
+    def _etiqueta(self, nombre, comentario=None, separada=False):
+        if separada: self.codigo_text.append(Instruccion(COMENTARIO)) # Línea en blanco
+        self.codigo_text.append(Instruccion(ETIQUETA, (nombre,), comentario))
+
+    def _comentario(self, texto, separado=False):
+        if separado: self.codigo_text.append(Instruccion(COMENTARIO))
+        self.codigo_text.append(Instruccion(COMENTARIO, (), texto))
+
     def _obtener_registro_temporal(self):
-        for i, usado in enumerate(self.registros_usados):
-            if not usado:
-                self.registros_usados[i] = True
-                return self.registros_temporales[i]
-        print("ERROR CRÍTICO: ¡No hay registros temporales $tX disponibles! Se necesita spilling.")
-        return self.registros_temporales[-1]
+        self.contador_temporales += 2
+        return Virtual(self.contador_temporales)
 
     def _obtener_registro_flotante_temporal(self):
-        for i, usado in enumerate(self.registros_flotantes_usados):
-            if not usado:
-                self.registros_flotantes_usados[i] = True
-                return self.registros_flotantes_temporales[i]
-        print("ERROR CRÍTICO: ¡No hay registros flotantes $fX disponibles! Se necesita spilling.")
-        return self.registros_flotantes_temporales[-1]
-
-    def _liberar_registro_temporal(self, registro_a_liberar):
-        if registro_a_liberar is None: return # No intentar liberar None
-        if registro_a_liberar.startswith("$f"):
-            try:
-                index = self.registros_flotantes_temporales.index(registro_a_liberar)
-                if self.registros_flotantes_usados[index]:
-                    self.registros_flotantes_usados[index] = False
-                # else: print(f"Advertencia: Intento de liberar registro flotante ({registro_a_liberar}) no usado.")
-            except ValueError:
-                # No es un temporal nuestro, podría ser $f0, $f12, etc. No hacer nada.
-                pass
-        elif registro_a_liberar.startswith("$t"):
-            try:
-                index = self.registros_temporales.index(registro_a_liberar)
-                if self.registros_usados[index]:
-                    self.registros_usados[index] = False
-                # else: print(f"Advertencia: Intento de liberar registro CPU ({registro_a_liberar}) no usado.")
-            except ValueError:
-                 # No es un temporal nuestro, podría ser $a0, $v0, etc. No hacer nada.
-                pass
-
-    def _reset_registros_temporales_para_nueva_expresion(self):
-        self.registros_usados = [False] * 10
-        self.registros_flotantes_usados = [False] * len(self.registros_flotantes_temporales)
+        self.contador_temporales += 2
+        return Virtual(self.contador_temporales | 1)
 
     def _calcular_offsets_funcion_actual(self, nodo_funcion):
-        nombre_func = ""
-        bloque_nodo = None
-        if nodo_funcion.children[0].value == 'MAIN':
-            nombre_func = "main"
-            bloque_nodo = nodo_funcion.children[4]
+        nombre_func = nodo_funcion.nombre
+        if nodo_funcion.es_main:
             self.funcion_actual_info = {'locals_size': 0, 'params_count': 0, 'params_on_stack_map': {}}
-        elif nodo_funcion.children[0].value == 'tipo':
-            id_nodo = nodo_funcion.children[1]
-            nombre_func = id_nodo.value
-            funcion_rest_nodo = nodo_funcion.children[2]
-            if len(funcion_rest_nodo.children) == 6: # Es una definición de función completa
-                parametros_nodo = funcion_rest_nodo.children[1]
-                bloque_nodo = funcion_rest_nodo.children[4]
-            else: return # Variable global, no una función con cuerpo
         self.funcion_actual_nombre = nombre_func
         self.offsets_locales_actuales = {}
         self.offset_local_actual = 0
-        info_simbolo_func = self.tabla_simbolos.lookup_symbol(nombre_func)
-        if not info_simbolo_func or not info_simbolo_func['type'].startswith("FUNCTION"):
-            print(f"Error: No se encontró info de función para '{nombre_func}' al calcular offsets.")
+        info_simbolo_func = nodo_funcion.simbolo # Anotado por el análisis semántico
+        if not info_simbolo_func or not info_simbolo_func.is_function:
+            _log.error("Error: No se encontró info de función para '%s' al calcular offsets.", nombre_func)
             return
-        nombres_params_ordenados = info_simbolo_func.get('param_names_ordered', [])
+        nombres_params_ordenados = info_simbolo_func.param_names
         param_offset = 8
         params_map = {}
         for i, nombre_param in enumerate(nombres_params_ordenados):
             self.offsets_locales_actuales[nombre_param] = param_offset
-            params_map[nombre_param] = {'offset': param_offset, 'type': info_simbolo_func['param_types'][i]}
+            params_map[nombre_param] = {'offset': param_offset, 'type': info_simbolo_func.param_types[i]}
+            nodo_funcion.params[i].simbolo.offset = param_offset # El offset queda también en el símbolo
             param_offset += 4
         self.funcion_actual_info = {'locals_size': 0, 'params_count': len(nombres_params_ordenados), 'params_on_stack_map': params_map}
-        if bloque_nodo: self._pre_scan_locales(bloque_nodo)
-
-    def _pre_scan_locales(self, nodo_bloque_o_instrucciones):
-        if not nodo_bloque_o_instrucciones: return
-        for hijo in nodo_bloque_o_instrucciones.children:
-            if not hijo: continue
-            if hijo.value == 'instrucciones': self._pre_scan_locales(hijo)
-            elif hijo.value == 'instruccion':
-                if hijo.children and hijo.children[0].value == 'declaracion':
-                    decl_node = hijo.children[0]
-                    id_node = decl_node.children[1]
-                    nombre_var = id_node.value
-                    self.offset_local_actual -= 4
-                    self.offsets_locales_actuales[nombre_var] = self.offset_local_actual
-                    self.funcion_actual_info['locals_size'] += 4
-            elif hijo.value == 'If' and len(hijo.children) == 8:
-                self._pre_scan_locales(hijo.children[5]) # bloque if
-                if hijo.children[7].children and hijo.children[7].children[0].value != 'ε':
-                    self._pre_scan_locales(hijo.children[7].children[2]) # bloque else
-            elif hijo.value == 'While' and len(hijo.children) == 7: # Similar para While
-                 self._pre_scan_locales(hijo.children[5]) # bloque while
-            elif hijo.value == 'For' and len(hijo.children) == 11: # Similar para For
-                 self._pre_scan_locales(hijo.children[9]) # bloque for
-            elif hijo.value == 'bloque': self._pre_scan_locales(hijo)
+        self._pre_scan_locales(nodo_funcion.cuerpo)
+
+    def _pre_scan_locales(self, instrucciones):
+        # Reserva un offset para cada declaración local, también las de bloques anidados
+        for instruccion in recorrer_instrucciones(instrucciones):
+            if isinstance(instruccion, VarDecl):
+                self.offset_local_actual -= 4
+                self.offsets_locales_actuales[instruccion.nombre] = self.offset_local_actual
+                self.funcion_actual_info['locals_size'] += 4
+                if instruccion.simbolo is not None:
+                    instruccion.simbolo.offset = self.offset_local_actual
 
     def _obtener_offset_variable(self, nombre_variable):
         return self.offsets_locales_actuales.get(nombre_variable)
@@ -120,273 +109,223 @@ class GeneradorSPIM:
     def generar(self, ast_root, tabla_simbolos):
         self.ast_root = ast_root
         self.tabla_simbolos = tabla_simbolos
+        self._plegar_constantes(ast_root)
         self.codigo_data.append(".data")
         if "newline_char: .asciiz \"\\n\"" not in self.codigo_data:
             self.codigo_data.append("newline_char: .asciiz \"\\n\"  # Para saltos de línea en print")
-        self.codigo_text.append(".text")
-        self.codigo_text.append(".globl main")
         self._visitar(ast_root)
-        return "\n".join(self.codigo_data) + "\n\n" + "\n".join(self.codigo_text)
+        self._optimizar_mirilla()
+        texto = [".text", ".globl main"]
+        texto.extend(map(renderizar, self.codigo_text))
+        return "\n".join(self.codigo_data) + "\n\n" + "\n".join(texto)
+
+    def _plegar_constantes(self, ast_root):
+        plegados = plegar_constantes(ast_root)
+        if plegados:
+            _log.debug("Plegado de constantes: %s operaciones resueltas al compilar", plegados)
+
+    def _optimizar_mirilla(self):
+        self.codigo_text, self.eliminadas_mirilla = optimizar(self.codigo_text, self.ventana_mirilla,
+                                                              self.reglas_mirilla)
+        if any(self.eliminadas_mirilla.values()):
+            _log.debug("Mirilla: %s", ", ".join(f"{regla} -{n}" for regla, n in self.eliminadas_mirilla.items()))
 
     def _visitar(self, nodo):
         if nodo is None: return
-        nombre_metodo = f'_visitar_{nodo.value.lower().replace("(", "_lparen_").replace(")", "_rparen_")}'
-        visitor = getattr(self, nombre_metodo, self._visitar_generico)
-        return visitor(nodo)
+        return self._despacho[type(nodo)](self, nodo) # Tabla armada al final del módulo
 
     def _visitar_generico(self, nodo):
         if nodo is None: return
-        for hijo in nodo.children: self._visitar(hijo)
+        for hijo in nodo.hijos(): self._visitar(hijo)
         return None
 
-    def _visitar_programa(self, nodo):
-        for hijo in nodo.children: self._visitar(hijo)
-
-    def _visitar_funciones(self, nodo):
-        if nodo.children and nodo.children[0].value != 'ε':
-            self._visitar(nodo.children[0])
-            if len(nodo.children) > 1: self._visitar(nodo.children[1])
+    def _visitar_program(self, nodo):
+        for decl in nodo.decls: self._visitar(decl)
 
-    def _visitar_funcion(self, nodo):
-        if not nodo.children: return
-        primer_hijo = nodo.children[0]
-        nombre_func_o_var = ""
+    def _visitar_funcdef(self, nodo):
+        nombre_func = nodo.nombre
         old_funcion_actual_nombre = self.funcion_actual_nombre
         old_funcion_actual_info = self.funcion_actual_info.copy()
         old_offsets_locales_actuales = self.offsets_locales_actuales.copy()
         old_offset_local_actual = self.offset_local_actual
-
-        is_regular_function_def = (primer_hijo.value == 'tipo' and
-                                   len(nodo.children) > 2 and
-                                   nodo.children[2].children and
-                                   len(nodo.children[2].children) == 6) # LPAREN parametros RPAREN LBRACE bloque RBRACE
-        is_main_function = primer_hijo.value == 'MAIN'
-
-        if is_main_function or is_regular_function_def:
-            self._calcular_offsets_funcion_actual(nodo)
-
-        if is_main_function:
-            nombre_func_o_var = "main"
-            if len(nodo.children) == 6 and nodo.children[4].value == 'bloque':
-                bloque_nodo_func = nodo.children[4]
-                self.codigo_text.append(f"\n{nombre_func_o_var}:")
-                self.codigo_text.append(f"  # Prólogo de {nombre_func_o_var}")
-                self.codigo_text.append(f"  addiu $sp, $sp, -4   # Espacio para guardar $fp antiguo")
-                self.codigo_text.append(f"  sw $fp, 0($sp)        # Guardar frame pointer antiguo")
-                self.codigo_text.append(f"  move $fp, $sp         # Nuevo frame pointer")
-                locals_total_size = self.funcion_actual_info.get('locals_size', 0)
-                if locals_total_size > 0:
-                    self.codigo_text.append(f"  addiu $sp, $sp, -{locals_total_size}  # Espacio para locales")
-                self._visitar(bloque_nodo_func)
-                self.codigo_text.append(f"\n  # Fin de {nombre_func_o_var}")
-                if locals_total_size > 0:
-                     self.codigo_text.append(f"  move $sp, $fp          # Liberar locales, $sp apunta a $fp guardado")
-                self.codigo_text.append(f"  lw $fp, 0($sp)        # Restaurar $fp antiguo")
-                self.codigo_text.append(f"  addiu $sp, $sp, 4   # Liberar espacio de $fp guardado")
-                self.codigo_text.append(f"  li $v0, 10            # Syscall para terminar programa")
-                self.codigo_text.append(f"  syscall")
-        elif primer_hijo.value == 'tipo':
-            id_nodo = nodo.children[1]
-            nombre_func_o_var = id_nodo.value
-            funcion_rest_nodo = nodo.children[2]
-            if funcion_rest_nodo.children and len(funcion_rest_nodo.children) == 2 and \
-               funcion_rest_nodo.children[0].value == 'inicializacion' and \
-               funcion_rest_nodo.children[1].value == 'SEMI': # Variable Global
-                tipo_str = self._obtener_tipo_de_nodo_tipo(primer_hijo)
-                inicializacion_nodo = funcion_rest_nodo.children[0]
-                # ... (código de manejo de variables globales sin cambios) ...
-                if tipo_str == 'int' or tipo_str == 'bool':
-                    valor_inicial = 0
-                    if inicializacion_nodo.children and inicializacion_nodo.children[0].value != 'ε':
-                        exp_nodo = inicializacion_nodo.children[1]
-                        val_expr = self._evaluar_expresion_literal_para_data(exp_nodo)
-                        if val_expr is not None: valor_inicial = val_expr
-                        else: print(f"Advertencia: Inicializador no constante para global '{nombre_func_o_var}'.")
-                    self.codigo_data.append(f"  {nombre_func_o_var}: .word {valor_inicial}  # Global {tipo_str}")
-                elif tipo_str == 'float':
-                    valor_inicial = 0.0
-                    if inicializacion_nodo.children and inicializacion_nodo.children[0].value != 'ε':
-                        exp_nodo = inicializacion_nodo.children[1]
-                        val_expr = self._evaluar_expresion_literal_para_data(exp_nodo)
-                        if isinstance(val_expr, (int, float)): valor_inicial = float(val_expr)
-                        else: print(f"Advertencia: Inicializador no constante/numérico para global float '{nombre_func_o_var}'.")
-                    self.codigo_data.append(f"  {nombre_func_o_var}: .float {valor_inicial:.6f}  # Global float")
-                elif tipo_str == 'string':
-                    valor_inicial_str = None
-                    if inicializacion_nodo.children and inicializacion_nodo.children[0].value != 'ε':
-                        exp_nodo = inicializacion_nodo.children[1]
-                        val_expr = self._evaluar_expresion_literal_para_data(exp_nodo)
-                        if isinstance(val_expr, str):
-                            valor_inicial_str = val_expr
-                        else: print(f"Advertencia: Inicializador no string para global string '{nombre_func_o_var}'.")
-                    if valor_inicial_str is not None:
-                        self.codigo_data.append(f"  {nombre_func_o_var}: .asciiz \"{valor_inicial_str}\"  # Global string")
-                    else:
-                        self.codigo_data.append(f"  {nombre_func_o_var}: .word 0  # Global string (puntero no inicializado)")
-                else: print(f"Advertencia: Tipo global '{tipo_str}' no manejado para .data.")
-            elif is_regular_function_def: # Definición de función regular (no main)
-                id_func_actual = nombre_func_o_var # Ya se obtuvo de id_nodo.value
-                info_func_ts = self.tabla_simbolos.lookup_symbol(id_func_actual, "global")
-                self.funcion_actual_return_type = info_func_ts['type'].split(' -> ')[-1].lower() if info_func_ts else "unknown"
-
-                bloque_nodo_func = funcion_rest_nodo.children[4]
-                self.codigo_text.append(f"\n{nombre_func_o_var}:  # Definición de función '{nombre_func_o_var}'")
-                self.codigo_text.append(f"  # Prólogo de {nombre_func_o_var}")
-                self.codigo_text.append(f"  addiu $sp, $sp, -8   # Espacio para guardar $ra y $fp antiguos")
-                self.codigo_text.append(f"  sw $ra, 4($sp)        # Guardar dirección de retorno $ra")
-                self.codigo_text.append(f"  sw $fp, 0($sp)        # Guardar frame pointer antiguo")
-                self.codigo_text.append(f"  move $fp, $sp         # Nuevo frame pointer")
-                locals_total_size = self.funcion_actual_info.get('locals_size',0)
-                if locals_total_size > 0:
-                    self.codigo_text.append(f"  addiu $sp, $sp, -{locals_total_size}  # Espacio para locales")
-                self._visitar(bloque_nodo_func)
-                epilogo_label = self._nueva_etiqueta(f"epilogo_{nombre_func_o_var}")
-                self.codigo_text.append(f"{epilogo_label}:") # Etiqueta para saltos de return
-                self.codigo_text.append(f"  # Epílogo de {nombre_func_o_var}")
-                if locals_total_size > 0: # Liberar locales
-                     self.codigo_text.append(f"  move $sp, $fp          # $sp apunta a $fp/$ra guardados")
-                self.codigo_text.append(f"  lw $fp, 0($sp)        # Restaurar $fp antiguo")
-                self.codigo_text.append(f"  lw $ra, 4($sp)        # Restaurar $ra original")
-                self.codigo_text.append(f"  addiu $sp, $sp, 8   # Liberar espacio de $ra y $fp guardados")
-                self.codigo_text.append(f"  jr $ra                # Retorno de {nombre_func_o_var}")
-        else: self._visitar_generico(nodo)
+        old_etiqueta_retorno, self.etiqueta_retorno = self.etiqueta_retorno, None
+
+        self._calcular_offsets_funcion_actual(nodo)
+        info_func_ts = nodo.simbolo
+        self.funcion_actual_return_type = info_func_ts.type if info_func_ts else "unknown"
+
+        if nodo.es_main:
+            self._etiqueta(nombre_func, separada=True)
+            self._comentario(f"Prólogo de {nombre_func}")
+            self._emitir("addiu", "$sp", "$sp", "-4", comentario="Espacio para guardar $fp antiguo")
+            self._emitir("sw", "$fp", "0($sp)", comentario="Guardar frame pointer antiguo")
+            self._emitir("move", "$fp", "$sp", comentario="Nuevo frame pointer")
+            cuerpo, locals_total_size = self._generar_cuerpo(nodo)
+            if locals_total_size > 0:
+                self._emitir("addiu", "$sp", "$sp", f"-{locals_total_size}", comentario="Espacio para locales y spills")
+            self.codigo_text.extend(cuerpo)
+            if self.etiqueta_retorno is not None:
+                self._etiqueta(self.etiqueta_retorno) # Destino de los return de main
+            self._comentario(f"Fin de {nombre_func}", separado=True)
+            if locals_total_size > 0:
+                 self._emitir("move", "$sp", "$fp", comentario="Liberar locales, $sp apunta a $fp guardado")
+            self._emitir("lw", "$fp", "0($sp)", comentario="Restaurar $fp antiguo")
+            self._emitir("addiu", "$sp", "$sp", "4", comentario="Liberar espacio de $fp guardado")
+            self._emitir("li", "$v0", "10", comentario="Syscall para terminar programa")
+            self._emitir("syscall")
+        else: # Definición de función regular (no main)
+            self._etiqueta(nombre_func, comentario=f"Definición de función '{nombre_func}'", separada=True)
+            self._comentario(f"Prólogo de {nombre_func}")
+            self._emitir("addiu", "$sp", "$sp", "-8", comentario="Espacio para guardar $ra y $fp antiguos")
+            self._emitir("sw", "$ra", "4($sp)", comentario="Guardar dirección de retorno $ra")
+            self._emitir("sw", "$fp", "0($sp)", comentario="Guardar frame pointer antiguo")
+            self._emitir("move", "$fp", "$sp", comentario="Nuevo frame pointer")
+            cuerpo, locals_total_size = self._generar_cuerpo(nodo)
+            if locals_total_size > 0:
+                self._emitir("addiu", "$sp", "$sp", f"-{locals_total_size}", comentario="Espacio para locales y spills")
+            self.codigo_text.extend(cuerpo)
+            epilogo_label = self.etiqueta_retorno or self._nueva_etiqueta(f"epilogo_{nombre_func}")
+            self._etiqueta(epilogo_label) # Etiqueta para saltos de return
+            self._comentario(f"Epílogo de {nombre_func}")
+            if locals_total_size > 0: # Liberar locales
+                 self._emitir("move", "$sp", "$fp", comentario="$sp apunta a $fp/$ra guardados")
+            self._emitir("lw", "$fp", "0($sp)", comentario="Restaurar $fp antiguo")
+            self._emitir("lw", "$ra", "4($sp)", comentario="Restaurar $ra original")
+            self._emitir("addiu", "$sp", "$sp", "8", comentario="Liberar espacio de $ra y $fp guardados")
+            self._emitir("jr", "$ra", comentario=f"Retorno de {nombre_func}")
 
         self.funcion_actual_nombre = old_funcion_actual_nombre
         self.funcion_actual_info = old_funcion_actual_info
         self.offsets_locales_actuales = old_offsets_locales_actuales
         self.offset_local_actual = old_offset_local_actual
-
-    def _obtener_tipo_de_nodo_tipo(self, tipo_node):
-        # ... (sin cambios)
-        if tipo_node and tipo_node.value == 'tipo' and tipo_node.children:
-            type_keyword_node = tipo_node.children[0]
-            type_mapping = {'INT': 'int', 'FLOAT': 'float', 'BOOL': 'bool', 'STRING': 'string', 'VOID': 'void'}
-            return type_mapping.get(type_keyword_node.value, "UnknownType")
-        return "UnknownType"
+        self.etiqueta_retorno = old_etiqueta_retorno
+
+    def _generar_cuerpo(self, nodo):
+        # El cuerpo se genera aparte, con registros virtuales, y se le asignan registros antes
+        # de emitir el prólogo: el marco tiene que reservar también las ranuras de spill
+        codigo_text, self.codigo_text = self.codigo_text, []
+        contador_temporales, self.contador_temporales = self.contador_temporales, 0
+        self._visitar_bloque(nodo.cuerpo)
+        cuerpo, self.codigo_text = self.codigo_text, codigo_text
+        cota_virtuales, self.contador_temporales = self.contador_temporales + 2, contador_temporales
+        locals_size = self.funcion_actual_info.get('locals_size', 0)
+        cuerpo, bytes_spill, derramados = asignar_registros(cuerpo, locals_size, cota_virtuales)
+        if derramados:
+            self.temporales_derramados += derramados
+            _log.debug("%s: %s temporales derramados a la pila (%s bytes)", nodo.nombre, derramados, bytes_spill)
+        return cuerpo, locals_size + bytes_spill
+
+    def _visitar_vardecl(self, nodo):
+        if self.funcion_actual_nombre:
+            self._generar_declaracion_local(nodo)
+            return
+        # Variable global
+        nombre_var = nodo.nombre
+        tipo_str = nodo.tipo
+        if tipo_str == 'int' or tipo_str == 'bool':
+            valor_inicial = 0
+            if nodo.init is not None:
+                val_expr = self._evaluar_expresion_literal_para_data(nodo.init)
+                if val_expr is not None: valor_inicial = val_expr
+                else: _log.warning("Advertencia: Inicializador no constante para global '%s'.", nombre_var)
+            self.codigo_data.append(f"  {nombre_var}: .word {valor_inicial}  # Global {tipo_str}")
+        elif tipo_str == 'float':
+            valor_inicial = 0.0
+            if nodo.init is not None:
+                val_expr = self._evaluar_expresion_literal_para_data(nodo.init)
+                if isinstance(val_expr, (int, float)): valor_inicial = float(val_expr)
+                else: _log.warning("Advertencia: Inicializador no constante/numérico para global float '%s'.", nombre_var)
+            self.codigo_data.append(f"  {nombre_var}: .float {_texto_float(valor_inicial)}  # Global float")
+        elif tipo_str == 'string':
+            valor_inicial_str = None
+            if nodo.init is not None:
+                val_expr = self._evaluar_expresion_literal_para_data(nodo.init)
+                if isinstance(val_expr, str):
+                    valor_inicial_str = val_expr
+                else: _log.warning("Advertencia: Inicializador no string para global string '%s'.", nombre_var)
+            if valor_inicial_str is not None:
+                self.codigo_data.append(f"  {nombre_var}: .asciiz \"{valor_inicial_str}\"  # Global string")
+            else:
+                self.codigo_data.append(f"  {nombre_var}: .word 0  # Global string (puntero no inicializado)")
+        else: _log.warning("Advertencia: Tipo global '%s' no manejado para .data.", tipo_str)
 
     def _evaluar_expresion_literal_para_data(self, exp_nodo):
-        # ... (sin cambios)
-        try:
-            nodo_a = exp_nodo.children[0].children[0].children[0].children[0].children[0].children[0]
-            literal_node = nodo_a.children[0]
-            if isinstance(literal_node.value, int): return int(literal_node.value)
-            if isinstance(literal_node.value, float): return float(literal_node.value)
-            if literal_node.value == 'true': return 1
-            if literal_node.value == 'false': return 0
-            if isinstance(literal_node.value, str) and nodo_a.children[0].value.startswith('"'):
-                 val_str = literal_node.value
-                 if val_str.startswith('"') and val_str.endswith('"'): val_str = val_str[1:-1]
-                 return val_str
-        except: pass
+        # generar() ya plegó las constantes: un inicializador constante es ahora un Literal
+        if isinstance(exp_nodo, Literal):
+            if exp_nodo.tipo == 'bool': return 1 if exp_nodo.valor else 0
+            if exp_nodo.tipo == 'int': return int(exp_nodo.valor)
+            if exp_nodo.tipo == 'float': return float(exp_nodo.valor)
+            if exp_nodo.tipo == 'string': return exp_nodo.valor
         return None
 
-    def _visitar_bloque(self, nodo):
-        # ... (sin cambios)
-        for hijo in nodo.children:
-            if hijo.value == 'instrucciones' or hijo.value == 'ε': self._visitar(hijo)
-
-    def _visitar_instrucciones(self, nodo):
-        # ... (sin cambios)
-        if nodo.children and nodo.children[0].value != 'ε':
-            self._visitar(nodo.children[0])
-            if len(nodo.children) > 1: self._visitar(nodo.children[1])
-
-    def _visitar_instruccion(self, nodo_instruccion):
-        if nodo_instruccion.children:
-            nodo_principal_instruccion = nodo_instruccion.children[0] # Puede ser ID, Print, If, etc.
-
-            # Caso: ID (podría ser asignación o llamada a función como statement)
-            if nodo_principal_instruccion.value not in ['declaracion', 'Print', 'If', 'While', 'For', 'Return', 'bloque', 'MAIN'] and \
-               len(nodo_instruccion.children) > 1 and nodo_instruccion.children[1].value == 'id_rhs_instruccion':
-
-                id_nodo_lhs = nodo_principal_instruccion # Este es el ID
-                id_rhs_nodo = nodo_instruccion.children[1]
-
-                # Subcaso: Asignación (ID EQUALS exp SEMI)
-                if id_rhs_nodo.children and id_rhs_nodo.children[0].value == 'EQUALS':
-                    exp_nodo_rhs = id_rhs_nodo.children[1]
-                    self._generar_asignacion(id_nodo_lhs, exp_nodo_rhs)
-                # Subcaso: Llamada a función como statement (ID llamada_func SEMI)
-                elif id_rhs_nodo.children and id_rhs_nodo.children[0].value == 'llamada_func':
-                    llamada_func_nodo = id_rhs_nodo.children[0]
-                    self.codigo_text.append(f"  # Inicio llamada a función (statement): {id_nodo_lhs.value}")
-                    # id_nodo_lhs es el nodo ID de la función
-                    # llamada_func_nodo es el nodo 'llamada_func'
-                    reg_ret_ignorado = self._visitar_llamada_func_como_expresion(id_nodo_lhs, llamada_func_nodo)
-                    self._liberar_registro_temporal(reg_ret_ignorado) # Liberar si se usó un temporal para el retorno
-                    self.codigo_text.append(f"  # Fin llamada a función (statement): {id_nodo_lhs.value}")
-                else:
-                    # Podría ser un ID solo seguido de SEMI (aunque la gramática podría no permitirlo como instrucción)
-                    # o alguna otra estructura no esperada aquí.
-                    self.codigo_text.append(f"  # Instrucción con ID '{id_nodo_lhs.value}' no reconocida completamente.")
-                    self._visitar(nodo_principal_instruccion) # Comportamiento genérico si no coincide
-
-            # Caso: Otras instrucciones directas (Print, If, While, For, Return, declaracion, bloque)
-            else:
-                self._visitar(nodo_principal_instruccion)
+    def _visitar_bloque(self, instrucciones):
+        for instruccion in instrucciones:
+            self._visitar(instruccion)
+
+    def _visitar_assign(self, nodo):
+        self._generar_asignacion(nodo.nombre, nodo.valor, nodo.simbolo)
 
-            self._reset_registros_temporales_para_nueva_expresion()
+    def _visitar_exprstmt(self, nodo):
+        llamada = nodo.valor
+        if isinstance(llamada, Call): # Llamada a función como statement (ID llamada_func SEMI)
+            self._comentario(f"Inicio llamada a función (statement): {llamada.nombre}")
+            reg_ret_ignorado = self._generar_llamada(llamada)
+            self._comentario(f"Fin llamada a función (statement): {llamada.nombre}")
+        else: # 'x;': se evalúa y se descarta
+            reg, _ = self._visitar(llamada)
 
-    def _generar_asignacion(self, id_nodo_lhs, exp_nodo_rhs):
-        nombre_variable = id_nodo_lhs.value
+    def _generar_asignacion(self, nombre_variable, exp_nodo_rhs, simbolo_lhs):
         # Comentario mejorado
-        self.codigo_text.append(f"  # Inicio Asignación: {nombre_variable} = ...")
+        self._comentario(f"Inicio Asignación: {nombre_variable} = ...")
         resultado_rhs = self._visitar(exp_nodo_rhs)
         if resultado_rhs is None or resultado_rhs[0] is None:
-            print(f"Error: No se obtuvo valor/registro para RHS en asignación a '{nombre_variable}'.")
+            _log.error("Error: No se obtuvo valor/registro para RHS en asignación a '%s'.", nombre_variable)
             return
         reg_rhs, tipo_rhs_str = resultado_rhs
-        simbolo_lhs = self.tabla_simbolos.lookup_symbol(nombre_variable, self.funcion_actual_nombre)
         if not simbolo_lhs:
-            print(f"Error de generación: Variable LHS '{nombre_variable}' no encontrada.")
-            self._liberar_registro_temporal(reg_rhs)
+            _log.error("Error de generación: Variable LHS '%s' no encontrada.", nombre_variable)
             return
-        tipo_lhs_str = simbolo_lhs['type'].lower()
+        tipo_lhs_str = simbolo_lhs.type
         store_instruction = "sw"
         comment_type = "entero/puntero"
         if tipo_lhs_str == "float":
             store_instruction = "s.s"
             comment_type = "float"
-            if not reg_rhs.startswith("$f"):
-                print(f"ADVERTENCIA: Asignando a float '{nombre_variable}' pero RHS reg '{reg_rhs}' no es FPU. Se requiere conversión.")
+            if not _en_fpu(reg_rhs):
+                _log.warning("ADVERTENCIA: Asignando a float '%s' pero RHS reg '%s' no es FPU. Se requiere conversión.", nombre_variable, reg_rhs)
                 # Aquí se necesitaría conversión explícita si no se hizo en la expresión
         offset = self._obtener_offset_variable(nombre_variable)
         if offset is not None:
-            self.codigo_text.append(f"  {store_instruction} {reg_rhs}, {offset}($fp)  # Guardar {comment_type} en local '{nombre_variable}'")
-        elif simbolo_lhs['scope_attr'] == 'global':
-            self.codigo_text.append(f"  {store_instruction} {reg_rhs}, {nombre_variable}  # Guardar {comment_type} en global '{nombre_variable}'")
-        else: print(f"Error: Variable '{nombre_variable}' sin ubicación para asignación.")
-        self._liberar_registro_temporal(reg_rhs)
-        self.codigo_text.append(f"  # Fin Asignación: {nombre_variable}")
-
-
-    def _visitar_declaracion(self, nodo_decl):
-        # ... (lógica de obtención de nombre_variable, tipo_str, offset sin cambios) ...
-        tipo_nodo = nodo_decl.children[0]
-        id_nodo = nodo_decl.children[1]
-        inicializacion_nodo = nodo_decl.children[2]
-        nombre_variable = id_nodo.value
-        tipo_str = self._obtener_tipo_de_nodo_tipo(tipo_nodo)
+            self._emitir(store_instruction, reg_rhs, f"{offset}($fp)", comentario=f"Guardar {comment_type} en local '{nombre_variable}'")
+        elif simbolo_lhs.scope_attr == 'global':
+            self._emitir(store_instruction, reg_rhs, nombre_variable, comentario=f"Guardar {comment_type} en global '{nombre_variable}'")
+        else: _log.error("Error: Variable '%s' sin ubicación para asignación.", nombre_variable)
+        self._comentario(f"Fin Asignación: {nombre_variable}")
+
+
+    def _generar_declaracion_local(self, nodo_decl):
+        nombre_variable = nodo_decl.nombre
+        tipo_str = nodo_decl.tipo
         offset = self._obtener_offset_variable(nombre_variable)
 
         # Comentario para la declaración (reserva de espacio ya hecha en prólogo)
-        self.codigo_text.append(f"  # Declaración de local '{nombre_variable}' de tipo {tipo_str} en offset {offset}($fp)")
+        self._comentario(f"Declaración de local '{nombre_variable}' de tipo {tipo_str} en offset {offset}($fp)")
 
 
         if offset is None and self.funcion_actual_nombre: # Esto es un parche, el pre-scan debería haberlo cubierto
-            print(f"Error CRÍTICO: Local '{nombre_variable}' sin offset en _visitar_declaracion.")
+            _log.error("Error CRÍTICO: Local '%s' sin offset en _visitar_declaracion.", nombre_variable)
             self.offset_local_actual -= 4
             self.offsets_locales_actuales[nombre_variable] = self.offset_local_actual
             self.funcion_actual_info['locals_size'] += 4
             offset = self.offset_local_actual
-            self.codigo_text.append(f"  # ADVERTENCIA: Offset para '{nombre_variable}' asignado dinámicamente: {offset}($fp)")
+            self._comentario(f"ADVERTENCIA: Offset para '{nombre_variable}' asignado dinámicamente: {offset}($fp)")
 
-        if inicializacion_nodo.children and inicializacion_nodo.children[0].value != 'ε':
-            self.codigo_text.append(f"  # Inicio Inicialización de '{nombre_variable}'")
-            exp_nodo_rhs = inicializacion_nodo.children[1]
+        if nodo_decl.init is not None:
+            self._comentario(f"Inicio Inicialización de '{nombre_variable}'")
+            exp_nodo_rhs = nodo_decl.init
             resultado_rhs = self._visitar(exp_nodo_rhs)
             if resultado_rhs is None or resultado_rhs[0] is None:
-                print(f"Error: No se obtuvo reg para inicializador de '{nombre_variable}'.")
+                _log.error("Error: No se obtuvo reg para inicializador de '%s'.", nombre_variable)
                 if offset is not None:
                     if tipo_str == 'float':
                         # Cargar 0.0 a un registro flotante y guardarlo
@@ -394,14 +333,12 @@ class GeneradorSPIM:
                         zero_float_label = self._nueva_etiqueta("zero_float_lit_")
                         if f"{zero_float_label}: .float 0.0" not in self.codigo_data: # Evitar duplicados
                              self.codigo_data.append(f"  {zero_float_label}: .float 0.0")
-                        self.codigo_text.append(f"  l.s {reg_fzero}, {zero_float_label}   # Cargar 0.0 para inicializar {nombre_variable}")
-                        self.codigo_text.append(f"  s.s {reg_fzero}, {offset}($fp)      # Inicializar float local '{nombre_variable}' a 0.0")
-                        self._liberar_registro_temporal(reg_fzero)
+                        self._emitir("l.s", reg_fzero, zero_float_label, comentario=f"Cargar 0.0 para inicializar {nombre_variable}")
+                        self._emitir("s.s", reg_fzero, f"{offset}($fp)", comentario=f"Inicializar float local '{nombre_variable}' a 0.0")
                     else: # int, bool, string (puntero)
                         reg_zero = self._obtener_registro_temporal()
-                        self.codigo_text.append(f"  li {reg_zero}, 0")
-                        self.codigo_text.append(f"  sw {reg_zero}, {offset}($fp)      # Inicializar local '{nombre_variable}' a 0 por error en RHS")
-                        self._liberar_registro_temporal(reg_zero)
+                        self._emitir("li", reg_zero, "0")
+                        self._emitir("sw", reg_zero, f"{offset}($fp)", comentario=f"Inicializar local '{nombre_variable}' a 0 por error en RHS")
                 return
 
             reg_rhs, tipo_rhs_str = resultado_rhs
@@ -411,689 +348,532 @@ class GeneradorSPIM:
                 if tipo_str == 'float':
                     store_instr_decl = "s.s"
                     comment_type_decl = "float"
-                    if not reg_rhs.startswith("$f"):
-                         print(f"ADVERTENCIA: Inicializando float local '{nombre_variable}' pero RHS reg '{reg_rhs}' no es FPU.")
+                    if not _en_fpu(reg_rhs):
+                         _log.warning("ADVERTENCIA: Inicializando float local '%s' pero RHS reg '%s' no es FPU.", nombre_variable, reg_rhs)
                          # Aquí se necesitaría conversión explícita si no se hizo en la expresión RHS
-                self.codigo_text.append(f"  {store_instr_decl} {reg_rhs}, {offset}($fp)  # Inicializar local '{nombre_variable}' ({comment_type_decl})")
-            else: print(f"Error: No se pudo almacenar inicialización para '{nombre_variable}'.")
-            self._liberar_registro_temporal(reg_rhs)
-            self.codigo_text.append(f"  # Fin Inicialización de '{nombre_variable}'")
-
-
-    def _visitar_print(self, nodo_print_rule):
-        # ... (lógica sin cambios significativos, excepto comentarios y liberación de reg_con_valor)
-        exp_opt_nodo = nodo_print_rule.children[2]
-        if exp_opt_nodo.children and exp_opt_nodo.children[0].value != 'ε':
-            exp_nodo_a_imprimir = exp_opt_nodo.children[0]
-            self.codigo_text.append(f"  # Inicio Print: evaluando expresión en línea {exp_nodo_a_imprimir.lineno}")
+                self._emitir(store_instr_decl, reg_rhs, f"{offset}($fp)", comentario=f"Inicializar local '{nombre_variable}' ({comment_type_decl})")
+            else: _log.error("Error: No se pudo almacenar inicialización para '%s'.", nombre_variable)
+            self._comentario(f"Fin Inicialización de '{nombre_variable}'")
+
+
+    def _visitar_print(self, nodo_print):
+        if nodo_print.valor is not None:
+            exp_nodo_a_imprimir = nodo_print.valor
+            self._comentario(f"Inicio Print: evaluando expresión en línea {exp_nodo_a_imprimir.lineno}")
             resultado_exp = self._visitar(exp_nodo_a_imprimir)
             if resultado_exp is None or resultado_exp[0] is None:
-                print(f"Error: No se pudo obtener valor/tipo para print en línea {exp_opt_nodo.lineno}.")
+                _log.error("Error: No se pudo obtener valor/tipo para print en línea %s.", exp_nodo_a_imprimir.lineno)
                 # Aun así, imprimir un newline
-                self.codigo_text.append(f"  la $a0, newline_char  # Cargar dirección de newline")
-                self.codigo_text.append(f"  li $v0, 4             # Syscall para imprimir string")
-                self.codigo_text.append(f"  syscall")
+                self._emitir("la", "$a0", "newline_char", comentario="Cargar dirección de newline")
+                self._emitir("li", "$v0", "4", comentario="Syscall para imprimir string")
+                self._emitir("syscall")
                 return
 
             reg_con_valor, tipo_expresion = resultado_exp
 
-            self.codigo_text.append(f"  # Print: valor de tipo '{tipo_expresion}' en registro '{reg_con_valor}'")
+            self._comentario(f"Print: valor de tipo '{tipo_expresion}'")
             if tipo_expresion == "int" or tipo_expresion == "bool":
-                self.codigo_text.append(f"  move $a0, {reg_con_valor}    # Preparar para imprimir int/bool")
-                self.codigo_text.append(f"  li $v0, 1           # Syscall para imprimir entero")
+                self._emitir("move", "$a0", reg_con_valor, comentario="Preparar para imprimir int/bool")
+                self._emitir("li", "$v0", "1", comentario="Syscall para imprimir entero")
             elif tipo_expresion == "string":
-                self.codigo_text.append(f"  move $a0, {reg_con_valor}    # Preparar para imprimir string (dirección)")
-                self.codigo_text.append(f"  li $v0, 4           # Syscall para imprimir string")
+                self._emitir("move", "$a0", reg_con_valor, comentario="Preparar para imprimir string (dirección)")
+                self._emitir("li", "$v0", "4", comentario="Syscall para imprimir string")
             elif tipo_expresion == "float":
-                self.codigo_text.append(f"  mov.s $f12, {reg_con_valor} # Mover float a $f12 para imprimir")
-                self.codigo_text.append(f"  li $v0, 2             # Syscall para imprimir float")
-            else:
-                print(f"Advertencia: Tipo desconocido '{tipo_expresion}' para print. Intentando imprimir como entero.")
-                self.codigo_text.append(f"  move $a0, {reg_con_valor}    # Fallback: Mover a $a0")
-                self.codigo_text.append(f"  li $v0, 1             # Fallback: Syscall para imprimir entero")
-            self.codigo_text.append(f"  syscall               # Ejecutar print")
-            self._liberar_registro_temporal(reg_con_valor) # Liberar después de usarlo en syscall
-
-        self.codigo_text.append(f"  la $a0, newline_char  # Cargar dirección de newline")
-        self.codigo_text.append(f"  li $v0, 4             # Syscall para imprimir string (newline)")
-        self.codigo_text.append(f"  syscall               # Ejecutar print de newline")
-        self.codigo_text.append(f"  # Fin Print")
-
-    # ... (resto de los visitors de expresiones con posibles mejoras en comentarios y liberación de registros)
-
-    def _visitar_exp(self, nodo_exp):
-        # ... (sin cambios)
-        if nodo_exp.children: return self._visitar(nodo_exp.children[0])
-        return None, None
-
-    def _visitar_e(self, nodo_e):
-        # ... (sin cambios)
-        if len(nodo_e.children) == 2:
-            reg_c, tipo_c = self._visitar(nodo_e.children[0])
-            if reg_c is None: return None, None
-            return self._visitar_e_rest(nodo_e.children[1], reg_c, tipo_c)
-        return None, None
-
-    def _visitar_e_rest(self, nodo_e_rest, reg_lhs, tipo_lhs):
-        # ... (revisar liberación de reg_rhs)
-        if nodo_e_rest.children and nodo_e_rest.children[0].value != 'ε':
-            op_nodo = nodo_e_rest.children[0]
-            reg_rhs, tipo_rhs = self._visitar(nodo_e_rest.children[1])
-            if reg_rhs is None:
-                self._liberar_registro_temporal(reg_lhs) # Liberar LHS si RHS falla
-                return None, None
-            if tipo_lhs == 'bool' and tipo_rhs == 'bool':
-                self.codigo_text.append(f"  # Operación OR: {reg_lhs} = {reg_lhs} or {reg_rhs}")
-                self.codigo_text.append(f"  or {reg_lhs}, {reg_lhs}, {reg_rhs}")
-                self._liberar_registro_temporal(reg_rhs) # Liberar RHS después de la operación
-                return self._visitar_e_rest(nodo_e_rest.children[2], reg_lhs, 'bool')
+                self._emitir("mov.s", "$f12", reg_con_valor, comentario="Mover float a $f12 para imprimir")
+                self._emitir("li", "$v0", "2", comentario="Syscall para imprimir float")
             else:
-                print(f"Error de tipo en OR: {tipo_lhs} con {tipo_rhs}")
-                self._liberar_registro_temporal(reg_lhs)
-                self._liberar_registro_temporal(reg_rhs)
-                return None, None
-        return reg_lhs, tipo_lhs
-
-    def _visitar_c(self, nodo_c):
-        # ... (sin cambios)
-        if len(nodo_c.children) == 2:
-            reg_r, tipo_r = self._visitar(nodo_c.children[0])
-            if reg_r is None: return None, None
-            return self._visitar_c_rest(nodo_c.children[1], reg_r, tipo_r)
-        return None, None
-
-    def _visitar_c_rest(self, nodo_c_rest, reg_lhs, tipo_lhs):
-        # ... (revisar liberación de reg_rhs)
-        if nodo_c_rest.children and nodo_c_rest.children[0].value != 'ε':
-            op_nodo = nodo_c_rest.children[0]
-            reg_rhs, tipo_rhs = self._visitar(nodo_c_rest.children[1])
+                _log.warning("Advertencia: Tipo desconocido '%s' para print. Intentando imprimir como entero.", tipo_expresion)
+                self._emitir("move", "$a0", reg_con_valor, comentario="Fallback: Mover a $a0")
+                self._emitir("li", "$v0", "1", comentario="Fallback: Syscall para imprimir entero")
+            self._emitir("syscall", comentario="Ejecutar print")
+
+        self._emitir("la", "$a0", "newline_char", comentario="Cargar dirección de newline")
+        self._emitir("li", "$v0", "4", comentario="Syscall para imprimir string (newline)")
+        self._emitir("syscall", comentario="Ejecutar print de newline")
+        self._comentario("Fin Print")
+
+    # --- Expresiones: cada visitor devuelve (registro, tipo) o (None, None) si falla ---
+
+    _GENERADOR_OPERADOR = {
+        'OR': '_generar_or', 'AND': '_generar_and',
+        'EQ': '_generar_relacional', 'NE': '_generar_relacional', 'LT': '_generar_relacional',
+        'GT': '_generar_relacional', 'LE': '_generar_relacional', 'GE': '_generar_relacional',
+        'PLUS': '_generar_aditiva', 'MINUS': '_generar_aditiva',
+        'TIMES': '_generar_multiplicativa', 'DIVIDE': '_generar_multiplicativa', 'MOD': '_generar_multiplicativa',
+    }
+
+    def _visitar_binop(self, nodo):
+        # Operadores asociativos a la izquierda: primero el operando más a la izquierda y luego,
+        # subiendo por la espina izquierda (sin recursión), el operando derecho de cada BinOp.
+        # Orden de Sethi–Ullman: si el operando derecho necesita más registros que todo lo que
+        # tiene a su izquierda, se evalúa antes (bajando por la espina) y su resultado espera
+        # en un registro; así el pico de temporales vivos es la necesidad del árbol y no crece
+        # con cada paréntesis anidado a la derecha. Los operandos no cambian de lado.
+        hoja, operaciones = espina_izquierda(nodo)
+        adelantados = [None] * len(operaciones)
+        for i in range(len(operaciones) - 1, -1, -1):
+            operacion = operaciones[i]
+            if self._evaluar_derecho_primero(self._necesidad(operaciones[i - 1] if i else hoja),
+                                             self._necesidad(operacion.der)):
+                adelantados[i] = self._visitar(operacion.der)
+                if adelantados[i][0] is None: return None, None
+        reg_lhs, tipo_lhs = self._visitar(hoja)
+        for operacion, adelantado in zip(operaciones, adelantados):
+            if reg_lhs is None: return None, None
+            reg_rhs, tipo_rhs = adelantado or self._visitar(operacion.der)
             if reg_rhs is None:
-                self._liberar_registro_temporal(reg_lhs)
-                return None, None
-            if tipo_lhs == 'bool' and tipo_rhs == 'bool':
-                self.codigo_text.append(f"  # Operación AND: {reg_lhs} = {reg_lhs} and {reg_rhs}")
-                self.codigo_text.append(f"  and {reg_lhs}, {reg_lhs}, {reg_rhs}")
-                self._liberar_registro_temporal(reg_rhs)
-                return self._visitar_c_rest(nodo_c_rest.children[2], reg_lhs, 'bool')
-            else:
-                print(f"Error de tipo en AND: {tipo_lhs} con {tipo_rhs}")
-                self._liberar_registro_temporal(reg_lhs)
-                self._liberar_registro_temporal(reg_rhs)
                 return None, None
+            generar = getattr(self, self._GENERADOR_OPERADOR[operacion.op])
+            reg_lhs, tipo_lhs = generar(operacion.op, reg_lhs, tipo_lhs, reg_rhs, tipo_rhs)
         return reg_lhs, tipo_lhs
 
-
-    def _visitar_r(self, nodo_r):
-        # ... (sin cambios)
-        if len(nodo_r.children) == 2:
-            reg_t, tipo_t = self._visitar(nodo_r.children[0])
-            if reg_t is None: return None, None
-            return self._visitar_r_rest(nodo_r.children[1], reg_t, tipo_t)
+    def _evaluar_derecho_primero(self, izquierdo, derecho):
+        # (necesidad, sin llamadas) de cada lado. Con una llamada en cualquiera de los dos se
+        # respeta el orden izquierda a derecha del fuente: la llamada puede tener efectos
+        return derecho[0] > izquierdo[0] and izquierdo[1] and derecho[1]
+
+    def _necesidad(self, exp):
+        """Número de Sethi–Ullman de exp (registros para evaluarla sin derramar) y si está
+        libre de llamadas. Se calcula una vez por BinOp; las hojas necesitan un registro."""
+        if type(exp) is not BinOp:
+            return 1, type(exp) is not Call
+        necesidad = self._necesidades.get(exp)
+        if necesidad is not None:
+            return necesidad
+        hoja, operaciones = espina_izquierda(exp)
+        izquierda, puro = self._necesidad(hoja)
+        for operacion in operaciones:
+            if operacion in self._necesidades: # Ya calculada desde la raíz de otra espina
+                izquierda, puro = self._necesidades[operacion]
+                continue
+            derecha, puro_derecha = self._necesidad(operacion.der)
+            izquierda = max(izquierda, derecha) if izquierda != derecha else izquierda + 1
+            puro = puro and puro_derecha
+            self._necesidades[operacion] = (izquierda, puro)
+        return izquierda, puro
+
+    def _generar_or(self, op, reg_lhs, tipo_lhs, reg_rhs, tipo_rhs):
+        if tipo_lhs == 'bool' and tipo_rhs == 'bool':
+            self._emitir("or", reg_lhs, reg_lhs, reg_rhs, comentario=f"Operación OR: {reg_lhs} = {reg_lhs} or {reg_rhs}")
+            return reg_lhs, 'bool'
+        _log.error("Error de tipo en OR: %s con %s", tipo_lhs, tipo_rhs)
         return None, None
 
-    def _visitar_r_rest(self, nodo_r_rest, reg_lhs, tipo_lhs):
-        # ... (revisar liberación de reg_rhs, comentarios para comparaciones)
-        if nodo_r_rest.children and nodo_r_rest.children[0].value != 'ε':
-            op_nodo = nodo_r_rest.children[0]
-            op_nombre = op_nodo.value
-            reg_rhs, tipo_rhs = self._visitar(nodo_r_rest.children[1])
-            if reg_rhs is None:
-                self._liberar_registro_temporal(reg_lhs)
-                return None, None
-
-            self.codigo_text.append(f"  # Comparación {op_nombre}: {reg_lhs} vs {reg_rhs}")
-            # TODO: Comparaciones flotantes (c.eq.s, c.lt.s, etc. y luego bc1t/bc1f)
-            if tipo_lhs == 'float' or tipo_rhs == 'float':
-                print(f"Advertencia: Comparación de/con flotantes ({op_nombre}) no completamente implementada.")
-                # Aquí se necesitarían instrucciones c.xx.s y bc1t/f
-
-            if op_nombre == 'EQ':   self.codigo_text.append(f"  seq {reg_lhs}, {reg_lhs}, {reg_rhs}")
-            elif op_nombre == 'NE': self.codigo_text.append(f"  sne {reg_lhs}, {reg_lhs}, {reg_rhs}")
-            elif op_nombre == 'LT': self.codigo_text.append(f"  slt {reg_lhs}, {reg_lhs}, {reg_rhs}")
-            elif op_nombre == 'GT': self.codigo_text.append(f"  sgt {reg_lhs}, {reg_lhs}, {reg_rhs}")
-            elif op_nombre == 'LE': self.codigo_text.append(f"  sle {reg_lhs}, {reg_lhs}, {reg_rhs}")
-            elif op_nombre == 'GE': self.codigo_text.append(f"  sge {reg_lhs}, {reg_lhs}, {reg_rhs}")
-            else: print(f"Operador relacional '{op_nombre}' no manejado.")
-
-            self._liberar_registro_temporal(reg_rhs) # RHS siempre se puede liberar después de la comparación
-            return self._visitar_r_rest(nodo_r_rest.children[2], reg_lhs, 'bool') # Resultado es booleano
-        return reg_lhs, tipo_lhs
-
-
-    def _visitar_t(self, nodo_t):
-        # ... (sin cambios)
-        if len(nodo_t.children) == 2:
-            reg_f, tipo_f = self._visitar(nodo_t.children[0])
-            if reg_f is None: return None,None
-            return self._visitar_t_rest(nodo_t.children[1], reg_f, tipo_f)
+    def _generar_and(self, op, reg_lhs, tipo_lhs, reg_rhs, tipo_rhs):
+        if tipo_lhs == 'bool' and tipo_rhs == 'bool':
+            self._emitir("and", reg_lhs, reg_lhs, reg_rhs, comentario=f"Operación AND: {reg_lhs} = {reg_lhs} and {reg_rhs}")
+            return reg_lhs, 'bool'
+        _log.error("Error de tipo en AND: %s con %s", tipo_lhs, tipo_rhs)
         return None, None
 
-    def _visitar_t_rest(self, nodo_t_rest, reg_lhs, tipo_lhs):
-        if nodo_t_rest.children and nodo_t_rest.children[0].value != 'ε':
-            op_nodo = nodo_t_rest.children[0]
-            reg_rhs, tipo_rhs = self._visitar(nodo_t_rest.children[1])
-            if reg_rhs is None:
-                self._liberar_registro_temporal(reg_lhs)
-                return None, None
-
-            tipo_resultado = "unknown"
-            reg_final_lhs = reg_lhs # El registro que contendrá el resultado final
-
-            self.codigo_text.append(f"  # Operación {op_nodo.value} ({tipo_lhs} y {tipo_rhs})")
-
-            if tipo_lhs == 'int' and tipo_rhs == 'int':
-                tipo_resultado = 'int'
-                if op_nodo.value == 'PLUS':
-                    self.codigo_text.append(f"  add {reg_final_lhs}, {reg_lhs}, {reg_rhs}  # Suma int: {reg_final_lhs} = {reg_lhs} + {reg_rhs}")
-                elif op_nodo.value == 'MINUS':
-                    self.codigo_text.append(f"  sub {reg_final_lhs}, {reg_lhs}, {reg_rhs}  # Resta int: {reg_final_lhs} = {reg_lhs} - {reg_rhs}")
-                self._liberar_registro_temporal(reg_rhs)
-            elif tipo_lhs == 'float' and tipo_rhs == 'float':
-                tipo_resultado = 'float'
-                # Asegurarse que reg_final_lhs es un registro FPU si no lo era (aunque debería serlo si tipo_lhs es float)
-                if not reg_final_lhs.startswith("$f"): # Caso poco probable si la lógica es correcta
-                    self._liberar_registro_temporal(reg_final_lhs) # Liberar el $t si se reasigna
-                    reg_final_lhs = self._obtener_registro_flotante_temporal()
-
-                if op_nodo.value == 'PLUS':
-                    self.codigo_text.append(f"  add.s {reg_final_lhs}, {reg_lhs}, {reg_rhs}  # Suma float: {reg_final_lhs} = {reg_lhs} + {reg_rhs}")
-                elif op_nodo.value == 'MINUS':
-                    self.codigo_text.append(f"  sub.s {reg_final_lhs}, {reg_lhs}, {reg_rhs}  # Resta float: {reg_final_lhs} = {reg_lhs} - {reg_rhs}")
-                self._liberar_registro_temporal(reg_rhs)
-            elif (tipo_lhs == 'int' and tipo_rhs == 'float') or \
-                 (tipo_lhs == 'float' and tipo_rhs == 'int'):
-                tipo_resultado = 'float'
-                fpu_reg_lhs = reg_lhs
-                fpu_reg_rhs = reg_rhs
-
-                fpu_reg_lhs = reg_lhs
-                fpu_reg_rhs = reg_rhs
-
-                if tipo_lhs == 'int':
-                    fpu_reg_lhs = self._obtener_registro_flotante_temporal()
-                    self.codigo_text.append(f"  mtc1 {reg_lhs}, {fpu_reg_lhs}            # Mover int ({reg_lhs}) a FPU para op {op_nodo.value}")
-                    self.codigo_text.append(f"  cvt.s.w {fpu_reg_lhs}, {fpu_reg_lhs}      # Convertir a float")
-                    # No liberar reg_lhs aquí si es el mismo que reg_final_lhs y fpu_reg_lhs fue un nuevo temporal
-                    if reg_lhs != reg_final_lhs : self._liberar_registro_temporal(reg_lhs)
-                elif not fpu_reg_lhs.startswith("$f"): # LHS es float pero no está en reg FPU (error previo?)
-                    print(f"ADVERTENCIA: Operando LHS float {reg_lhs} no está en registro FPU para op {op_nodo.value}")
-                    # Intentar moverlo si es un $t que contiene un patrón de bits float
-                    # Esto es muy arriesgado, el tipo debería garantizar que ya está en FPU
-                    temp_f_lhs = self._obtener_registro_flotante_temporal()
-                    self.codigo_text.append(f"  mtc1 {reg_lhs}, {temp_f_lhs} # Moviendo supuestamente float de CPU a FPU")
-                    self._liberar_registro_temporal(reg_lhs)
-                    fpu_reg_lhs = temp_f_lhs
-
-                if tipo_rhs == 'int':
-                    temp_fpu_for_rhs_conv = self._obtener_registro_flotante_temporal()
-                    self.codigo_text.append(f"  mtc1 {reg_rhs}, {temp_fpu_for_rhs_conv} # Mover int ({reg_rhs}) a FPU para op {op_nodo.value}")
-                    self.codigo_text.append(f"  cvt.s.w {temp_fpu_for_rhs_conv}, {temp_fpu_for_rhs_conv} # Convertir a float")
-                    self._liberar_registro_temporal(reg_rhs)
-                    fpu_reg_rhs = temp_fpu_for_rhs_conv
-                elif not fpu_reg_rhs.startswith("$f"):
-                     print(f"ADVERTENCIA: Operando RHS float {reg_rhs} no está en registro FPU para op {op_nodo.value}")
-                     temp_f_rhs = self._obtener_registro_flotante_temporal()
-                     self.codigo_text.append(f"  mtc1 {reg_rhs}, {temp_f_rhs} # Moviendo supuestamente float de CPU a FPU")
-                     self._liberar_registro_temporal(reg_rhs)
-                     fpu_reg_rhs = temp_f_rhs
-
-                # El resultado debe estar en un registro FPU. Si fpu_reg_lhs era originalmente un $tX,
-                # entonces reg_final_lhs (que es fpu_reg_lhs) ya es el nuevo FPU temporal.
-                # Si fpu_reg_lhs era ya un FPU, se reutiliza.
-                reg_final_lhs = fpu_reg_lhs
-
-                if op_nodo.value == 'PLUS': self.codigo_text.append(f"  add.s {reg_final_lhs}, {fpu_reg_lhs}, {fpu_reg_rhs}  # Suma float (mixto)")
-                elif op_nodo.value == 'MINUS': self.codigo_text.append(f"  sub.s {reg_final_lhs}, {fpu_reg_lhs}, {fpu_reg_rhs}  # Resta float (mixto)")
-
-                if fpu_reg_rhs != reg_final_lhs:
-                     self._liberar_registro_temporal(fpu_reg_rhs) # Libera el FPU temporal de RHS si se creó uno diferente al destino
-
-            elif tipo_lhs == 'string' and tipo_rhs == 'string' and op_nodo.value == 'PLUS':
-                self.codigo_text.append(f"  # TODO: Concatenación de strings: {reg_lhs} + {reg_rhs}")
-                print("TODO: Concatenación de strings no implementada en _visitar_t_rest.")
-                tipo_resultado = 'string'
-                # Aquí, reg_lhs y reg_rhs contienen direcciones. Necesitaríamos una rutina.
-                # Por ahora, simplemente pasamos el LHS y liberamos el RHS. Esto es incorrecto.
-                self._liberar_registro_temporal(reg_rhs)
-            else:
-                print(f"Error: Tipos incompatibles para {op_nodo.value}: {tipo_lhs} y {tipo_rhs}")
-                self._liberar_registro_temporal(reg_lhs) # Liberar ambos si son temporales y hay error
-                self._liberar_registro_temporal(reg_rhs)
-                return None, None
-
-            # No liberar reg_rhs si ya se liberó específicamente (ej. conversión int a float)
-            # if reg_rhs.startswith("$t") and not (tipo_resultado == 'float' and tipo_rhs == 'int') : self._liberar_registro_temporal(reg_rhs)
-
-            return self._visitar_t_rest(nodo_t_rest.children[2], reg_final_lhs, tipo_resultado)
-        return reg_lhs, tipo_lhs
-
-
-    def _visitar_f(self, nodo_f):
-        # ... (sin cambios)
-        if len(nodo_f.children) == 2:
-            reg_a, tipo_a = self._visitar(nodo_f.children[0])
-            if reg_a is None: return None,None
-            return self._visitar_f_rest(nodo_f.children[1], reg_a, tipo_a)
-        return None,None
+    def _generar_relacional(self, op, reg_lhs, tipo_lhs, reg_rhs, tipo_rhs):
+        op_nombre = op
+        self._comentario(f"Comparación {op_nombre}: {reg_lhs} vs {reg_rhs}")
+        # TODO: Comparaciones flotantes (c.eq.s, c.lt.s, etc. y luego bc1t/bc1f)
+        if tipo_lhs == 'float' or tipo_rhs == 'float':
+            _log.warning("Advertencia: Comparación de/con flotantes (%s) no completamente implementada.", op_nombre)
+            # Aquí se necesitarían instrucciones c.xx.s y bc1t/f
+
+        if op_nombre == 'EQ':   self._emitir("seq", reg_lhs, reg_lhs, reg_rhs)
+        elif op_nombre == 'NE': self._emitir("sne", reg_lhs, reg_lhs, reg_rhs)
+        elif op_nombre == 'LT': self._emitir("slt", reg_lhs, reg_lhs, reg_rhs)
+        elif op_nombre == 'GT': self._emitir("sgt", reg_lhs, reg_lhs, reg_rhs)
+        elif op_nombre == 'LE': self._emitir("sle", reg_lhs, reg_lhs, reg_rhs)
+        elif op_nombre == 'GE': self._emitir("sge", reg_lhs, reg_lhs, reg_rhs)
+        else: _log.error("Operador relacional '%s' no manejado.", op_nombre)
+
+        return reg_lhs, 'bool' # Resultado es booleano
+
+    def _generar_aditiva(self, op, reg_lhs, tipo_lhs, reg_rhs, tipo_rhs):
+        tipo_resultado = "unknown"
+        reg_final_lhs = reg_lhs # El registro que contendrá el resultado final
+
+        self._comentario(f"Operación {op} ({tipo_lhs} y {tipo_rhs})")
+
+        if tipo_lhs == 'int' and tipo_rhs == 'int':
+            tipo_resultado = 'int'
+            if op == 'PLUS':
+                self._emitir("add", reg_final_lhs, reg_lhs, reg_rhs, comentario=f"Suma int: {reg_final_lhs} = {reg_lhs} + {reg_rhs}")
+            elif op == 'MINUS':
+                self._emitir("sub", reg_final_lhs, reg_lhs, reg_rhs, comentario=f"Resta int: {reg_final_lhs} = {reg_lhs} - {reg_rhs}")
+        elif tipo_lhs == 'float' and tipo_rhs == 'float':
+            tipo_resultado = 'float'
+            # Asegurarse que reg_final_lhs es un registro FPU si no lo era (aunque debería serlo si tipo_lhs es float)
+            if not _en_fpu(reg_final_lhs): # Caso poco probable si la lógica es correcta
+                reg_final_lhs = self._obtener_registro_flotante_temporal()
+
+            if op == 'PLUS':
+                self._emitir("add.s", reg_final_lhs, reg_lhs, reg_rhs, comentario=f"Suma float: {reg_final_lhs} = {reg_lhs} + {reg_rhs}")
+            elif op == 'MINUS':
+                self._emitir("sub.s", reg_final_lhs, reg_lhs, reg_rhs, comentario=f"Resta float: {reg_final_lhs} = {reg_lhs} - {reg_rhs}")
+        elif (tipo_lhs == 'int' and tipo_rhs == 'float') or \
+             (tipo_lhs == 'float' and tipo_rhs == 'int'):
+            tipo_resultado = 'float'
+            fpu_reg_lhs = reg_lhs
+            fpu_reg_rhs = reg_rhs
+
+            fpu_reg_lhs = reg_lhs
+            fpu_reg_rhs = reg_rhs
+
+            if tipo_lhs == 'int':
+                fpu_reg_lhs = self._obtener_registro_flotante_temporal()
+                self._emitir("mtc1", reg_lhs, fpu_reg_lhs, comentario=f"Mover int ({reg_lhs}) a FPU para op {op}")
+                self._emitir("cvt.s.w", fpu_reg_lhs, fpu_reg_lhs, comentario="Convertir a float")
+            elif not _en_fpu(fpu_reg_lhs): # LHS es float pero no está en reg FPU (error previo?)
+                _log.warning("ADVERTENCIA: Operando LHS float %s no está en registro FPU para op %s", reg_lhs, op)
+                # Intentar moverlo si es un $t que contiene un patrón de bits float
+                # Esto es muy arriesgado, el tipo debería garantizar que ya está en FPU
+                temp_f_lhs = self._obtener_registro_flotante_temporal()
+                self._emitir("mtc1", reg_lhs, temp_f_lhs, comentario="Moviendo supuestamente float de CPU a FPU")
+                fpu_reg_lhs = temp_f_lhs
+
+            if tipo_rhs == 'int':
+                temp_fpu_for_rhs_conv = self._obtener_registro_flotante_temporal()
+                self._emitir("mtc1", reg_rhs, temp_fpu_for_rhs_conv, comentario=f"Mover int ({reg_rhs}) a FPU para op {op}")
+                self._emitir("cvt.s.w", temp_fpu_for_rhs_conv, temp_fpu_for_rhs_conv, comentario="Convertir a float")
+                fpu_reg_rhs = temp_fpu_for_rhs_conv
+            elif not _en_fpu(fpu_reg_rhs):
+                 _log.warning("ADVERTENCIA: Operando RHS float %s no está en registro FPU para op %s", reg_rhs, op)
+                 temp_f_rhs = self._obtener_registro_flotante_temporal()
+                 self._emitir("mtc1", reg_rhs, temp_f_rhs, comentario="Moviendo supuestamente float de CPU a FPU")
+                 fpu_reg_rhs = temp_f_rhs
+
+            # El resultado debe estar en un registro FPU. Si fpu_reg_lhs era originalmente un $tX,
+            # entonces reg_final_lhs (que es fpu_reg_lhs) ya es el nuevo FPU temporal.
+            # Si fpu_reg_lhs era ya un FPU, se reutiliza.
+            reg_final_lhs = fpu_reg_lhs
+
+            if op == 'PLUS': self._emitir("add.s", reg_final_lhs, fpu_reg_lhs, fpu_reg_rhs, comentario="Suma float (mixto)")
+            elif op == 'MINUS': self._emitir("sub.s", reg_final_lhs, fpu_reg_lhs, fpu_reg_rhs, comentario="Resta float (mixto)")
+
+        elif tipo_lhs == 'string' and tipo_rhs == 'string' and op == 'PLUS':
+            self._comentario(f"TODO: Concatenación de strings: {reg_lhs} + {reg_rhs}")
+            _log.warning("TODO: Concatenación de strings no implementada en _visitar_t_rest.")
+            tipo_resultado = 'string'
+            # Aquí, reg_lhs y reg_rhs contienen direcciones. Necesitaríamos una rutina.
+            # Por ahora, simplemente pasamos el LHS y liberamos el RHS. Esto es incorrecto.
+        else:
+            _log.error("Error: Tipos incompatibles para %s: %s y %s", op, tipo_lhs, tipo_rhs)
+            return None, None
 
-    def _visitar_f_rest(self, nodo_f_rest, reg_lhs, tipo_lhs):
-        # ... (similar a _visitar_t_rest, aplicar misma lógica de tipos y liberación)
-        if nodo_f_rest.children and nodo_f_rest.children[0].value != 'ε':
-            op_nodo = nodo_f_rest.children[0]
-            reg_rhs, tipo_rhs = self._visitar(nodo_f_rest.children[1])
-            if reg_rhs is None:
-                self._liberar_registro_temporal(reg_lhs)
-                return None,None
-
-            tipo_resultado = "unknown"
-            reg_final_lhs = reg_lhs
-            self.codigo_text.append(f"  # Operación {op_nodo.value} ({tipo_lhs} y {tipo_rhs})")
-
-            if tipo_lhs == 'int' and tipo_rhs == 'int':
-                tipo_resultado = 'int'
-                if op_nodo.value == 'TIMES':
-                    self.codigo_text.append(f"  mult {reg_lhs}, {reg_rhs}     # Mult int: {reg_lhs} * {reg_rhs}")
-                    self.codigo_text.append(f"  mflo {reg_final_lhs}            # Resultado en {reg_final_lhs}")
-                elif op_nodo.value == 'DIVIDE':
-                    self.codigo_text.append(f"  # División entera: {reg_lhs} / {reg_rhs}")
-                    self.codigo_text.append(f"  div {reg_lhs}, {reg_rhs}       # $LO = cociente, $HI = residuo")
-                    self.codigo_text.append(f"  mflo {reg_final_lhs}            # Cociente en {reg_final_lhs}")
-                elif op_nodo.value == 'MOD':
-                    self.codigo_text.append(f"  # Módulo: {reg_lhs} % {reg_rhs}")
-                    self.codigo_text.append(f"  div {reg_lhs}, {reg_rhs}       # $LO = cociente, $HI = residuo")
-                    self.codigo_text.append(f"  mfhi {reg_final_lhs}            # Residuo en {reg_final_lhs}")
-                self._liberar_registro_temporal(reg_rhs)
-            elif tipo_lhs == 'float' and tipo_rhs == 'float':
-                tipo_resultado = 'float'
-                # Asegurar que reg_final_lhs es FPU
-                if not reg_final_lhs.startswith("$f"):
-                    self._liberar_registro_temporal(reg_final_lhs)
-                    reg_final_lhs = self._obtener_registro_flotante_temporal()
-
-                if op_nodo.value == 'TIMES':
-                    self.codigo_text.append(f"  mul.s {reg_final_lhs}, {reg_lhs}, {reg_rhs} # Mult float: {reg_final_lhs} = {reg_lhs} * {reg_rhs}")
-                elif op_nodo.value == 'DIVIDE':
-                    self.codigo_text.append(f"  div.s {reg_final_lhs}, {reg_lhs}, {reg_rhs} # Div float: {reg_final_lhs} = {reg_lhs} / {reg_rhs}")
-                elif op_nodo.value == 'MOD':
-                    print(f"Error: Operador MOD no aplica a floats ({tipo_lhs} % {tipo_rhs})")
-                    self._liberar_registro_temporal(reg_lhs)
-                    self._liberar_registro_temporal(reg_rhs)
-                    return None, None
-                self._liberar_registro_temporal(reg_rhs)
-            elif (tipo_lhs == 'int' and tipo_rhs == 'float') or \
-                 (tipo_lhs == 'float' and tipo_rhs == 'int'):
-                tipo_resultado = 'float'
-                fpu_reg_lhs = reg_lhs
-                fpu_reg_rhs = reg_rhs
-                if tipo_lhs == 'int':
-                    fpu_reg_lhs = self._obtener_registro_flotante_temporal()
-                    self.codigo_text.append(f"  mtc1 {reg_lhs}, {fpu_reg_lhs}            # Mover int ({reg_lhs}) a FPU para op {op_nodo.value}")
-                    self.codigo_text.append(f"  cvt.s.w {fpu_reg_lhs}, {fpu_reg_lhs}      # Convertir a float")
-                    self._liberar_registro_temporal(reg_lhs)
-                if tipo_rhs == 'int':
-                    temp_fpu_for_rhs_conv = self._obtener_registro_flotante_temporal()
-                    self.codigo_text.append(f"  mtc1 {reg_rhs}, {temp_fpu_for_rhs_conv} # Mover int ({reg_rhs}) a FPU para op {op_nodo.value}")
-                    self.codigo_text.append(f"  cvt.s.w {temp_fpu_for_rhs_conv}, {temp_fpu_for_rhs_conv} # Convertir a float")
-                    self._liberar_registro_temporal(reg_rhs)
-                    fpu_reg_rhs = temp_fpu_for_rhs_conv
-
-                reg_final_lhs = fpu_reg_lhs
-                if op_nodo.value == 'TIMES':
-                    self.codigo_text.append(f"  mul.s {reg_final_lhs}, {fpu_reg_lhs}, {fpu_reg_rhs} # Mult float (mixto): {reg_final_lhs} = {fpu_reg_lhs} * {fpu_reg_rhs}")
-                elif op_nodo.value == 'DIVIDE':
-                    self.codigo_text.append(f"  div.s {reg_final_lhs}, {fpu_reg_lhs}, {fpu_reg_rhs} # Div float (mixto): {reg_final_lhs} = {fpu_reg_lhs} / {fpu_reg_rhs}")
-                elif op_nodo.value == 'MOD':
-                     print(f"Error: Operador MOD no aplica a floats ({tipo_lhs} % {tipo_rhs})")
-                     self._liberar_registro_temporal(reg_final_lhs)
-                     self._liberar_registro_temporal(fpu_reg_rhs)
-                     return None,None
-                if fpu_reg_rhs != reg_final_lhs : self._liberar_registro_temporal(fpu_reg_rhs)
-            else:
-                print(f"Error: Tipos incompatibles para {op_nodo.value}: {tipo_lhs} y {tipo_rhs}")
-                self._liberar_registro_temporal(reg_lhs)
-                self._liberar_registro_temporal(reg_rhs)
+        return reg_final_lhs, tipo_resultado
+
+    def _generar_multiplicativa(self, op, reg_lhs, tipo_lhs, reg_rhs, tipo_rhs):
+        tipo_resultado = "unknown"
+        reg_final_lhs = reg_lhs
+        self._comentario(f"Operación {op} ({tipo_lhs} y {tipo_rhs})")
+
+        if tipo_lhs == 'int' and tipo_rhs == 'int':
+            tipo_resultado = 'int'
+            if op == 'TIMES':
+                self._emitir("mult", reg_lhs, reg_rhs, comentario=f"Mult int: {reg_lhs} * {reg_rhs}")
+                self._emitir("mflo", reg_final_lhs, comentario=f"Resultado en {reg_final_lhs}")
+            elif op == 'DIVIDE':
+                self._comentario(f"División entera: {reg_lhs} / {reg_rhs}")
+                self._emitir("div", reg_lhs, reg_rhs, comentario="$LO = cociente, $HI = residuo")
+                self._emitir("mflo", reg_final_lhs, comentario=f"Cociente en {reg_final_lhs}")
+            elif op == 'MOD':
+                self._comentario(f"Módulo: {reg_lhs} % {reg_rhs}")
+                self._emitir("div", reg_lhs, reg_rhs, comentario="$LO = cociente, $HI = residuo")
+                self._emitir("mfhi", reg_final_lhs, comentario=f"Residuo en {reg_final_lhs}")
+        elif tipo_lhs == 'float' and tipo_rhs == 'float':
+            tipo_resultado = 'float'
+            # Asegurar que reg_final_lhs es FPU
+            if not _en_fpu(reg_final_lhs):
+                reg_final_lhs = self._obtener_registro_flotante_temporal()
+
+            if op == 'TIMES':
+                self._emitir("mul.s", reg_final_lhs, reg_lhs, reg_rhs, comentario=f"Mult float: {reg_final_lhs} = {reg_lhs} * {reg_rhs}")
+            elif op == 'DIVIDE':
+                self._emitir("div.s", reg_final_lhs, reg_lhs, reg_rhs, comentario=f"Div float: {reg_final_lhs} = {reg_lhs} / {reg_rhs}")
+            elif op == 'MOD':
+                _log.error("Error: Operador MOD no aplica a floats (%s %% %s)", tipo_lhs, tipo_rhs)
                 return None, None
+        elif (tipo_lhs == 'int' and tipo_rhs == 'float') or \
+             (tipo_lhs == 'float' and tipo_rhs == 'int'):
+            tipo_resultado = 'float'
+            fpu_reg_lhs = reg_lhs
+            fpu_reg_rhs = reg_rhs
+            if tipo_lhs == 'int':
+                fpu_reg_lhs = self._obtener_registro_flotante_temporal()
+                self._emitir("mtc1", reg_lhs, fpu_reg_lhs, comentario=f"Mover int ({reg_lhs}) a FPU para op {op}")
+                self._emitir("cvt.s.w", fpu_reg_lhs, fpu_reg_lhs, comentario="Convertir a float")
+            if tipo_rhs == 'int':
+                temp_fpu_for_rhs_conv = self._obtener_registro_flotante_temporal()
+                self._emitir("mtc1", reg_rhs, temp_fpu_for_rhs_conv, comentario=f"Mover int ({reg_rhs}) a FPU para op {op}")
+                self._emitir("cvt.s.w", temp_fpu_for_rhs_conv, temp_fpu_for_rhs_conv, comentario="Convertir a float")
+                fpu_reg_rhs = temp_fpu_for_rhs_conv
+
+            reg_final_lhs = fpu_reg_lhs
+            if op == 'TIMES':
+                self._emitir("mul.s", reg_final_lhs, fpu_reg_lhs, fpu_reg_rhs, comentario=f"Mult float (mixto): {reg_final_lhs} = {fpu_reg_lhs} * {fpu_reg_rhs}")
+            elif op == 'DIVIDE':
+                self._emitir("div.s", reg_final_lhs, fpu_reg_lhs, fpu_reg_rhs, comentario=f"Div float (mixto): {reg_final_lhs} = {fpu_reg_lhs} / {fpu_reg_rhs}")
+            elif op == 'MOD':
+                 _log.error("Error: Operador MOD no aplica a floats (%s %% %s)", tipo_lhs, tipo_rhs)
+                 return None,None
+        else:
+            _log.error("Error: Tipos incompatibles para %s: %s y %s", op, tipo_lhs, tipo_rhs)
+            return None, None
 
-            # No liberar reg_rhs si ya se liberó específicamente (ej. conversión int a float)
-            # if reg_rhs.startswith("$t") and not (tipo_resultado == 'float' and tipo_rhs == 'int'): self._liberar_registro_temporal(reg_rhs)
-            return self._visitar_f_rest(nodo_f_rest.children[2], reg_final_lhs, tipo_resultado)
-        return reg_lhs, tipo_lhs
-
-    def _visitar_a(self, nodo_a):
-        # ... (resto del método _visitar_a sin cambios desde la última versión)
-        # A -> ID | INT_NUM | FLOAT_NUM | STRING_LITERAL | TRUE | FALSE | LPAREN exp RPAREN | ID llamada_func
-        # Devuelve (registro_con_valor, tipo_string_del_valor)
-        primer_hijo_de_a = nodo_a.children[0]
-        valor_primer_hijo = primer_hijo_de_a.value
+        return reg_final_lhs, tipo_resultado
 
-        # Caso 1: Literal INT_NUM
-        if isinstance(valor_primer_hijo, int):
+    def _visitar_literal(self, nodo):
+        valor = nodo.valor
+        # Literal INT_NUM
+        if nodo.tipo == 'int':
             reg_dest = self._obtener_registro_temporal()
-            self.codigo_text.append(f"  li {reg_dest}, {valor_primer_hijo}  # Cargar entero literal {valor_primer_hijo}")
+            self._emitir("li", reg_dest, str(valor), comentario=f"Cargar entero literal {valor}")
             return reg_dest, "int"
 
-        # Caso 2: Literal FLOAT_NUM
-        if isinstance(valor_primer_hijo, float):
+        # Literal FLOAT_NUM
+        if nodo.tipo == 'float':
             etiqueta_float = self._nueva_etiqueta("L_float_lit_")
-            self.codigo_data.append(f"  {etiqueta_float}: .float {float(valor_primer_hijo):.6f}  # Literal float {valor_primer_hijo}")
+            self.codigo_data.append(f"  {etiqueta_float}: .float {_texto_float(valor)}  # Literal float {valor}")
             reg_f_dest = self._obtener_registro_flotante_temporal()
-            self.codigo_text.append(f"  l.s {reg_f_dest}, {etiqueta_float} # Cargar float literal a {reg_f_dest}")
+            self._emitir("l.s", reg_f_dest, etiqueta_float, comentario=f"Cargar float literal a {reg_f_dest}")
             return reg_f_dest, "float"
 
-        # Caso 3: Literales TRUE / FALSE
-        if valor_primer_hijo == "true":
+        # Literales TRUE / FALSE
+        if nodo.tipo == 'bool':
             reg_dest = self._obtener_registro_temporal()
-            self.codigo_text.append(f"  li {reg_dest}, 1  # Cargar literal true (1)")
-            return reg_dest, "bool"
-        if valor_primer_hijo == "false":
-            reg_dest = self._obtener_registro_temporal()
-            self.codigo_text.append(f"  li {reg_dest}, 0  # Cargar literal false (0)")
+            if valor:
+                self._emitir("li", reg_dest, "1", comentario="Cargar literal true (1)")
+            else:
+                self._emitir("li", reg_dest, "0", comentario="Cargar literal false (0)")
             return reg_dest, "bool"
 
-        # Caso 4: Literal STRING_LITERAL
-        simbolo_info_lookup = self.tabla_simbolos.lookup_symbol(str(valor_primer_hijo), self.funcion_actual_nombre)
-        if isinstance(valor_primer_hijo, str) and \
-           valor_primer_hijo not in ["true", "false", "LPAREN"] and \
-           simbolo_info_lookup is None:
-            contenido_str = valor_primer_hijo
-            if contenido_str.startswith('"') and contenido_str.endswith('"'):
-                contenido_str = contenido_str[1:-1]
-            etiqueta_str = self._nueva_etiqueta("L_str_")
-            self.codigo_data.append(f"  {etiqueta_str}: .asciiz \"{contenido_str}\" # Literal string")
-            reg_dest = self._obtener_registro_temporal()
-            self.codigo_text.append(f"  la {reg_dest}, {etiqueta_str}  # Cargar dirección de string literal")
-            return reg_dest, "string"
-
-        # Caso 5: Paréntesis LPAREN exp RPAREN
-        if valor_primer_hijo == 'LPAREN':
-            if len(nodo_a.children) == 3 and nodo_a.children[1].value == 'exp':
-                self.codigo_text.append(f"  # Inicio expresión entre paréntesis")
-                reg_exp, tipo_exp = self._visitar(nodo_a.children[1])
-                self.codigo_text.append(f"  # Fin expresión entre paréntesis, resultado en {reg_exp}")
-                return reg_exp, tipo_exp
-            else:
-                print("Error: Estructura de paréntesis (A -> LPAREN exp RPAREN) mal formada.")
-                return None, None
+        # Literal STRING_LITERAL (el lexer ya quitó las comillas)
+        etiqueta_str = self._nueva_etiqueta("L_str_")
+        self.codigo_data.append(f"  {etiqueta_str}: .asciiz \"{valor}\" # Literal string")
+        reg_dest = self._obtener_registro_temporal()
+        self._emitir("la", reg_dest, etiqueta_str, comentario="Cargar dirección de string literal")
+        return reg_dest, "string"
 
-        # Caso 6: Identificador (variable) o Llamada a función
-        nombre_id_o_func = str(valor_primer_hijo)
-        simbolo_info = self.tabla_simbolos.lookup_symbol(nombre_id_o_func, self.funcion_actual_nombre)
+    def _visitar_var(self, nodo):
+        # Símbolo y tipo ya resueltos por el análisis semántico: no se consulta la tabla
+        nombre_id = nodo.nombre
+        simbolo_info = nodo.simbolo
 
         if not simbolo_info:
-            print(f"Error CRÍTICO de generación: Símbolo '{nombre_id_o_func}' no encontrado en _visitar_a.")
+            _log.error("Error CRÍTICO de generación: Símbolo '%s' no encontrado en _visitar_var.", nombre_id)
             return None, None
 
-        tipo_simbolo = simbolo_info['type']
-
-        is_syntactic_call = False
-        if len(nodo_a.children) > 1 and nodo_a.children[1].value == 'llamada_func':
-            # Es una estructura A -> ID llamada_func.
-            # Ahora, hay que verificar si llamada_func es una llamada real o la producción epsilon.
-            # Una llamada_func real no tendrá 'ε' como su (único) hijo.
-            # Típicamente, tendrá LPAREN, lista_args, RPAREN.
-            # Si llamada_func -> ε, entonces nodo_a.children[1].children[0].value == 'ε'.
-            llamada_func_node_candidate = nodo_a.children[1]
-            if not (len(llamada_func_node_candidate.children) == 1 and llamada_func_node_candidate.children[0].value == 'ε'):
-                is_syntactic_call = True
-
-        if is_syntactic_call:
-            # Ahora estamos seguros de que es una llamada a función real.
-            if not tipo_simbolo.startswith("FUNCTION"):
-                # Esto sería un error grave si la tabla de símbolos y el AST están desincronizados
-                # o si un no-función tiene una estructura de llamada no-epsilon.
-                print(f"Error CRÍTICO: '{nombre_id_o_func}' (tipo: {tipo_simbolo}) tiene estructura de llamada pero no es FUNCTION.")
-                return None, None
+        if simbolo_info.is_function:
+            _log.error("Error SEMÁNTICO (debería ser del analizador): Func. '%s' usada como variable.", nombre_id)
+            return None, None
+
+        reg_dest = None
+        tipo_var_lower = nodo.tipo
+        offset = self._obtener_offset_variable(nombre_id)
+        load_instr = "lw"
+        comment_suffix = f"variable '{nombre_id}'"
 
-            # primer_hijo_de_a es el nodo ID de la función.
-            # nodo_a.children[1] es el nodo 'llamada_func' directamente.
-            llamada_func_node = nodo_a.children[1]
-            tipo_retorno_str = tipo_simbolo.split(' -> ')[-1].lower()
-            self.codigo_text.append(f"  # Inicio llamada a función '{nombre_id_o_func}'")
-            reg_retorno = self._visitar_llamada_func_como_expresion(primer_hijo_de_a, llamada_func_node)
-            self.codigo_text.append(f"  # Fin llamada a función '{nombre_id_o_func}', retorno en {reg_retorno}")
-            return reg_retorno, tipo_retorno_str
+        if tipo_var_lower == 'float':
+            load_instr = "l.s"
+            reg_dest = self._obtener_registro_flotante_temporal()
         else:
-            # Esto se ejecuta si no es una llamada sintáctica (es una variable, o un ID de función sin '()')
-            # O si el ID es un parámetro/variable que casualmente tiene un nodo 'llamada_func' con epsilon debajo (caso de 'x' en el AST)
-            a_prime_node_for_var_check = nodo_a.children[1] if len(nodo_a.children) > 1 else None
-            is_actually_var_despite_a_prime = True
-            if a_prime_node_for_var_check and a_prime_node_for_var_check.value == 'llamada_func':
-                # Si a_prime es llamada_func, pero sus hijos son epsilon (ej. para variable 'x'), entonces no es una llamada real.
-                if not (len(a_prime_node_for_var_check.children) == 1 and a_prime_node_for_var_check.children[0].value == 'ε'):
-                    # Esto sería una llamada_func con argumentos no vacíos, lo que contradiría is_syntactic_call = False
-                    # Es un caso que no debería ocurrir si la lógica de is_syntactic_call es correcta.
-                     print(f"ADVERTENCIA: Confusión en _visitar_a para {nombre_id_o_func}. Tratando como variable.")
-
-
-            if tipo_simbolo.startswith("FUNCTION") and is_actually_var_despite_a_prime:
-                 # Solo imprimir error si es una FUNCION y no se identificó como llamada sintáctica
-                 # Y además, si a_prime no es una llamada_func vacía (que es normal para variables)
-                 if not (a_prime_node_for_var_check and \
-                         a_prime_node_for_var_check.value == 'llamada_func' and \
-                         len(a_prime_node_for_var_check.children) == 1 and \
-                         a_prime_node_for_var_check.children[0].value == 'ε'):
-                    print(f"Error SEMÁNTICO (debería ser del analizador): Func. '{nombre_id_o_func}' usada como variable.")
-                    return None, None
-
-            reg_dest = None
-            tipo_var_lower = tipo_simbolo.lower()
-            offset = self._obtener_offset_variable(nombre_id_o_func)
-            load_instr = "lw"
-            comment_suffix = f"variable '{nombre_id_o_func}'"
-
-            if tipo_var_lower == 'float':
-                load_instr = "l.s"
-                reg_dest = self._obtener_registro_flotante_temporal()
-            else:
-                reg_dest = self._obtener_registro_temporal()
+            reg_dest = self._obtener_registro_temporal()
 
-            if offset is not None:
-                self.codigo_text.append(f"  {load_instr} {reg_dest}, {offset}($fp)  # Cargar local/param {comment_suffix}")
-            elif simbolo_info['scope_attr'] == 'global':
-                if tipo_var_lower == 'string':
-                     self.codigo_text.append(f"  la {reg_dest}, {nombre_id_o_func}  # Cargar dirección de string global {comment_suffix}")
-                else:
-                    self.codigo_text.append(f"  {load_instr} {reg_dest}, {nombre_id_o_func}   # Cargar global {comment_suffix}")
+        if offset is not None:
+            self._emitir(load_instr, reg_dest, f"{offset}($fp)", comentario=f"Cargar local/param {comment_suffix}")
+        elif simbolo_info.scope_attr == 'global':
+            if tipo_var_lower == 'string':
+                 self._emitir("la", reg_dest, nombre_id, comentario=f"Cargar dirección de string global {comment_suffix}")
             else:
-                print(f"Error CRÍTICO: Variable '{nombre_id_o_func}' sin ubicación de carga en _visitar_a.")
-                if reg_dest: self._liberar_registro_temporal(reg_dest)
-                return None, None
+                self._emitir(load_instr, reg_dest, nombre_id, comentario=f"Cargar global {comment_suffix}")
+        else:
+            _log.error("Error CRÍTICO: Variable '%s' sin ubicación de carga en _visitar_var.", nombre_id)
+            return None, None
 
-            return reg_dest, tipo_var_lower
+        return reg_dest, tipo_var_lower
 
-        print(f"Advertencia: Nodo A con hijo '{valor_primer_hijo}' no manejado (final de _visitar_a).")
-        return None, None
+    def _visitar_call(self, nodo):
+        nombre_funcion = nodo.nombre
+        simbolo_info = nodo.simbolo
+        if not simbolo_info:
+            _log.error("Error CRÍTICO de generación: Símbolo '%s' no encontrado en _visitar_call.", nombre_funcion)
+            return None, None
+        if not simbolo_info.is_function:
+            _log.error("Error CRÍTICO: '%s' (tipo: %s) tiene estructura de llamada pero no es FUNCTION.", nombre_funcion, simbolo_info.type)
+            return None, None
+
+        tipo_retorno_str = nodo.tipo
+        self._comentario(f"Inicio llamada a función '{nombre_funcion}'")
+        reg_retorno = self._generar_llamada(nodo)
+        self._comentario(f"Fin llamada a función '{nombre_funcion}'")
+        return reg_retorno, tipo_retorno_str
 
-    def _visitar_llamada_func_como_expresion(self, id_func_node, llamada_func_node):
-        # ... (lógica de llamada a función con mejoras en comentarios y liberación de registros de args)
-        nombre_funcion = id_func_node.value
-        info_funcion_ts = self.tabla_simbolos.lookup_symbol(nombre_funcion, "global")
+    def _generar_llamada(self, nodo_call):
+        nombre_funcion = nodo_call.nombre
+        info_funcion_ts = nodo_call.simbolo
 
-        if not info_funcion_ts or not info_funcion_ts['type'].startswith("FUNCTION"):
-            print(f"Error CRÍTICO: Llamando a '{nombre_funcion}' que no es función.")
+        if not info_funcion_ts or not info_funcion_ts.is_function:
+            _log.error("Error CRÍTICO: Llamando a '%s' que no es función.", nombre_funcion)
             return None
 
-        tipo_retorno_func = info_funcion_ts['type'].split(' -> ')[-1].lower()
+        tipo_retorno_func = nodo_call.tipo
 
-        lista_args_node = llamada_func_node.children[1]
         registros_args_info = []
-
-        current_arg_list_part = lista_args_node
-        arg_num = 0
-        while current_arg_list_part and current_arg_list_part.children and current_arg_list_part.children[0].value != 'ε':
-            arg_num +=1
-            exp_arg_node = None
-            next_arg_list_part = None
-            if current_arg_list_part.value == 'lista_args':
-                exp_arg_node = current_arg_list_part.children[0]
-                next_arg_list_part = current_arg_list_part.children[1]
-            elif current_arg_list_part.value == 'lista_args_rest':
-                exp_arg_node = current_arg_list_part.children[1]
-                next_arg_list_part = current_arg_list_part.children[2]
-            else: break
-
-            if exp_arg_node:
-                self.codigo_text.append(f"    # Evaluando argumento {arg_num} para '{nombre_funcion}'")
-                reg_arg, tipo_arg = self._visitar(exp_arg_node)
-                if reg_arg:
-                    registros_args_info.append({'reg': reg_arg, 'type': tipo_arg, 'num': arg_num})
-                else:
-                    print(f"Error: No se pudo evaluar argumento {arg_num} para {nombre_funcion}")
-                    for arg_info_err in registros_args_info: # Liberar los ya evaluados
-                        self._liberar_registro_temporal(arg_info_err['reg'])
-                    return None
-            current_arg_list_part = next_arg_list_part
-
-        # Pasar argumentos a registros $aX o $fX
-        cpu_arg_idx = 0
-        fpu_arg_idx = 0
-        self.codigo_text.append(f"    # Pasando argumentos a '{nombre_funcion}'")
-        for arg_info in registros_args_info:
-            reg_arg_val = arg_info['reg']
-            tipo_arg_val = arg_info['type']
-            arg_n = arg_info['num']
-            if tipo_arg_val == 'float':
-                if fpu_arg_idx == 0:
-                    self.codigo_text.append(f"  mov.s $f12, {reg_arg_val}  # Pasar arg float {arg_n} ({reg_arg_val}) a $f12")
-                    fpu_arg_idx +=1
-                else: print(f"Advertencia: Pasar más de 1 arg float por registro no implementado para '{nombre_funcion}'.")
+        for arg_num, exp_arg_node in enumerate(nodo_call.args, start=1):
+            self._comentario(f"Evaluando argumento {arg_num} para '{nombre_funcion}'")
+            reg_arg, tipo_arg = self._visitar(exp_arg_node)
+            if reg_arg:
+                registros_args_info.append({'reg': reg_arg, 'type': tipo_arg, 'num': arg_num})
             else:
-                if cpu_arg_idx < 4:
-                    self.codigo_text.append(f"  move $a{cpu_arg_idx}, {reg_arg_val}  # Pasar arg {arg_n} ({reg_arg_val}) a $a{cpu_arg_idx}")
-                    cpu_arg_idx += 1
-                else: print(f"Advertencia: Pasar más de 4 args CPU por registro no implementado para '{nombre_funcion}'.")
-
-        # Liberar registros temporales de argumentos DESPUÉS de pasarlos
-        for arg_info in registros_args_info:
-            self._liberar_registro_temporal(arg_info['reg'])
-
-        self.codigo_text.append(f"  jal {nombre_funcion}      # Llamar a la función '{nombre_funcion}'")
+                _log.error("Error: No se pudo evaluar argumento %s para %s", arg_num, nombre_funcion)
+                return None
+
+        # Los argumentos van en la pila, en el orden de los parámetros: la función llamada
+        # los lee en 8($fp), 12($fp), ... (ver _calcular_offsets_funcion_actual)
+        tipos_params = info_funcion_ts.param_types or ()
+        if registros_args_info:
+            bytes_args = 4 * len(registros_args_info)
+            self._comentario(f"Pasando argumentos a '{nombre_funcion}' por la pila")
+            self._emitir("addiu", "$sp", "$sp", f"-{bytes_args}", comentario="Espacio para los argumentos")
+            for indice, arg_info in enumerate(registros_args_info):
+                tipo_param = tipos_params[indice] if indice < len(tipos_params) else arg_info['type']
+                reg_arg = self._convertir(arg_info['reg'], tipo_param)
+                guardar = "s.s" if tipo_param == 'float' else "sw"
+                self._emitir(guardar, reg_arg, f"{4 * indice}($sp)", comentario=f"Pasar arg {arg_info['num']} ({tipo_param})")
+
+        self._emitir("jal", nombre_funcion, comentario=f"Llamar a la función '{nombre_funcion}'")
+        if registros_args_info:
+            self._emitir("addiu", "$sp", "$sp", str(bytes_args), comentario="Liberar los argumentos")
 
         reg_final_retorno = None
         if tipo_retorno_func != "void":
             if tipo_retorno_func == "float": # Resultado en $f0
                 reg_final_retorno = self._obtener_registro_flotante_temporal()
-                self.codigo_text.append(f"  mov.s {reg_final_retorno}, $f0 # Mover resultado float de '{nombre_funcion}' desde $f0")
+                self._emitir("mov.s", reg_final_retorno, "$f0", comentario=f"Mover resultado float de '{nombre_funcion}' desde $f0")
             else: # Resultado en $v0
                 reg_final_retorno = self._obtener_registro_temporal()
-                self.codigo_text.append(f"  move {reg_final_retorno}, $v0 # Mover resultado de '{nombre_funcion}' desde $v0")
+                self._emitir("move", reg_final_retorno, "$v0", comentario=f"Mover resultado de '{nombre_funcion}' desde $v0")
 
         return reg_final_retorno
 
     # --- Visitors para Estructuras de Control ---
 
     def _visitar_if(self, nodo_if):
-        # Estructura esperada del AST para If:
-        # nodo_if.value == 'If'
-        # nodo_if.children[0] == IF_KW
-        # nodo_if.children[1] == LPAREN
-        # nodo_if.children[2] == exp (condición)
-        # nodo_if.children[3] == RPAREN
-        # nodo_if.children[4] == LBRACE
-        # nodo_if.children[5] == bloque (rama then)
-        # nodo_if.children[6] == RBRACE
-        # nodo_if.children[7] == Else (nodo Else)
-
-        self.codigo_text.append(f"\n  # Inicio IF en línea {nodo_if.lineno}")
-
-        cond_exp_node = nodo_if.children[2]
-        reg_cond, tipo_cond = self._visitar(cond_exp_node)
+        self._comentario(f"Inicio IF en línea {nodo_if.lineno}", separado=True)
+
+        reg_cond, tipo_cond = self._visitar(nodo_if.cond)
 
         if reg_cond is None or tipo_cond != 'bool':
-            print(f"Error: La condición del IF en línea {nodo_if.lineno} no evaluó a un booleano o falló.")
-            # Podríamos intentar recuperar o simplemente generar código potencialmente incorrecto/incompleto.
+            _log.error("Error: La condición del IF en línea %s no evaluó a un booleano o falló.", nodo_if.lineno)
             # Por ahora, si la condición falla, no generamos el cuerpo del if/else.
-            self._liberar_registro_temporal(reg_cond) # Liberar si se obtuvo algo
-            self.codigo_text.append(f"  # ERROR: Condición de IF fallida en línea {nodo_if.lineno}")
+            self._comentario(f"ERROR: Condición de IF fallida en línea {nodo_if.lineno}")
             return
 
         etiqueta_else = self._nueva_etiqueta("L_else_")
         etiqueta_endif = self._nueva_etiqueta("L_endif_")
 
         # Si la condición (en reg_cond) es 0 (false), saltar a la etiqueta_else.
-        # Si no hay bloque else, etiqueta_else será la misma que etiqueta_endif.
-
-        nodo_else_interno = nodo_if.children[7] # Este es el nodo 'Else'
-        tiene_rama_else = nodo_else_interno.children and nodo_else_interno.children[0].value != 'ε'
-
+        # Si no hay bloque else, se salta directamente a etiqueta_endif.
+        tiene_rama_else = nodo_if.sino is not None
         etiqueta_salto_condicion_falsa = etiqueta_else if tiene_rama_else else etiqueta_endif
 
-        self.codigo_text.append(f"  beq {reg_cond}, $zero, {etiqueta_salto_condicion_falsa}  # Salta si la condición es falsa (0)")
-        self._liberar_registro_temporal(reg_cond) # El registro de condición ya no se necesita
+        self._emitir("beq", reg_cond, "$zero", etiqueta_salto_condicion_falsa, comentario="Salta si la condición es falsa (0)")
 
         # Rama THEN (bloque del if)
-        self.codigo_text.append(f"  # Rama THEN del IF en línea {nodo_if.lineno}")
-        bloque_then_node = nodo_if.children[5]
-        self._visitar(bloque_then_node)
+        self._comentario(f"Rama THEN del IF en línea {nodo_if.lineno}")
+        self._visitar_bloque(nodo_if.entonces)
 
         if tiene_rama_else:
-            self.codigo_text.append(f"  j {etiqueta_endif}          # Salto incondicional al final del IF desde la rama THEN")
-            self.codigo_text.append(f"{etiqueta_else}:  # Etiqueta para la rama ELSE")
-            # El nodo Else tiene hijos: [ELSE_KW, LBRACE, bloque_else, RBRACE]
-            # El bloque del else está en nodo_else_interno.children[2]
-            bloque_else_node = nodo_else_interno.children[2]
-            self.codigo_text.append(f"  # Rama ELSE del IF en línea {nodo_if.lineno}")
-            self._visitar(bloque_else_node)
-        # Si no tiene rama else, la etiqueta_else no se usa o es la misma que endif,
-        # y el beq saltó directamente a endif.
-
-        self.codigo_text.append(f"{etiqueta_endif}:  # Etiqueta final del IF-ELSE")
-        self.codigo_text.append(f"  # Fin IF en línea {nodo_if.lineno}")
-
-    # _visitar_else no es estrictamente necesario como un visitor de nodo separado si _visitar_if
-    # maneja la lógica de visitar el bloque del else directamente.
-    # El nodo 'Else' en sí mismo es más una construcción gramatical.
-    # Lo mantenemos por si se necesita una lógica más compleja para 'Else' en el futuro.
-    def _visitar_else(self, nodo_else_rule):
-        # Este método sería llamado si el AST tuviera un nodo 'Else' que necesitara ser visitado
-        # independientemente. Pero _visitar_if ya maneja la visita a su bloque interno.
-        # Si se llama, es probable que sea a través de un _visitar_generico si no se maneja
-        # explícitamente en el padre (como _visitar_if lo hace).
-        # Por ahora, si se visita un nodo 'Else' directamente, solo visitamos a sus hijos.
-        # self.codigo_text.append(f"  # Visitando nodo Else (inesperado directamente)")
-        # self._visitar_generico(nodo_else_rule)
-        pass # La lógica está en _visitar_if
+            self._emitir("j", etiqueta_endif, comentario="Salto incondicional al final del IF desde la rama THEN")
+            self._etiqueta(etiqueta_else, comentario="Etiqueta para la rama ELSE")
+            self._comentario(f"Rama ELSE del IF en línea {nodo_if.lineno}")
+            self._visitar_bloque(nodo_if.sino)
+
+        self._etiqueta(etiqueta_endif, comentario="Etiqueta final del IF-ELSE")
+        self._comentario(f"Fin IF en línea {nodo_if.lineno}")
 
     def _visitar_while(self, nodo_while):
-        # Estructura esperada del AST para While:
-        # nodo_while.value == 'While'
-        # nodo_while.children[0] == WHILE_KW
-        # nodo_while.children[1] == LPAREN
-        # nodo_while.children[2] == exp (condición)
-        # nodo_while.children[3] == RPAREN
-        # nodo_while.children[4] == LBRACE
-        # nodo_while.children[5] == bloque (cuerpo del bucle)
-        # nodo_while.children[6] == RBRACE
-
-        self.codigo_text.append(f"\n  # Inicio WHILE en línea {nodo_while.lineno}")
+        self._comentario(f"Inicio WHILE en línea {nodo_while.lineno}", separado=True)
 
         etiqueta_loop_start = self._nueva_etiqueta("L_loop_start_")
         etiqueta_loop_end = self._nueva_etiqueta("L_loop_end_")
 
-        self.codigo_text.append(f"{etiqueta_loop_start}:  # Etiqueta de inicio/condición del while")
+        self._etiqueta(etiqueta_loop_start, comentario="Etiqueta de inicio/condición del while")
 
         # Evaluar la condición
-        cond_exp_node = nodo_while.children[2]
-        self.codigo_text.append(f"  # Evaluando condición del WHILE en línea {cond_exp_node.lineno}")
+        cond_exp_node = nodo_while.cond
+        self._comentario(f"Evaluando condición del WHILE en línea {cond_exp_node.lineno}")
         reg_cond, tipo_cond = self._visitar(cond_exp_node)
 
         if reg_cond is None or tipo_cond != 'bool':
-            print(f"Error: La condición del WHILE en línea {nodo_while.lineno} no evaluó a un booleano o falló.")
-            self._liberar_registro_temporal(reg_cond)
-            self.codigo_text.append(f"  # ERROR: Condición de WHILE fallida, posible bucle infinito o no ejecución.")
+            _log.error("Error: La condición del WHILE en línea %s no evaluó a un booleano o falló.", nodo_while.lineno)
+            self._comentario("ERROR: Condición de WHILE fallida, posible bucle infinito o no ejecución.")
             # Para evitar un bucle infinito si la condición falla, podríamos saltar a loop_end
-            self.codigo_text.append(f"  j {etiqueta_loop_end} # Salto de emergencia por condición fallida")
+            self._emitir("j", etiqueta_loop_end, comentario="Salto de emergencia por condición fallida")
         else:
-            self.codigo_text.append(f"  beq {reg_cond}, $zero, {etiqueta_loop_end}  # Salta a loop_end si la condición es falsa (0)")
-            self._liberar_registro_temporal(reg_cond) # El registro de condición ya no se necesita para esta iteración
+            self._emitir("beq", reg_cond, "$zero", etiqueta_loop_end, comentario="Salta a loop_end si la condición es falsa (0)")
 
         # Cuerpo del bucle
-        self.codigo_text.append(f"  # Cuerpo del WHILE en línea {nodo_while.lineno}")
-        bloque_cuerpo_node = nodo_while.children[5]
-        self._visitar(bloque_cuerpo_node)
+        self._comentario(f"Cuerpo del WHILE en línea {nodo_while.lineno}")
+        self._visitar_bloque(nodo_while.cuerpo)
+
+        self._emitir("j", etiqueta_loop_start, comentario="Volver al inicio del bucle para re-evaluar condición")
+        self._etiqueta(etiqueta_loop_end, comentario="Etiqueta final del WHILE")
+        self._comentario(f"Fin WHILE en línea {nodo_while.lineno}")
 
-        self.codigo_text.append(f"  j {etiqueta_loop_start}      # Volver al inicio del bucle para re-evaluar condición")
-        self.codigo_text.append(f"{etiqueta_loop_end}:  # Etiqueta final del WHILE")
-        self.codigo_text.append(f"  # Fin WHILE en línea {nodo_while.lineno}")
+    def _visitar_for(self, nodo_for):
+        self._comentario(f"Inicio FOR en línea {nodo_for.lineno}", separado=True)
 
+        etiqueta_loop_start = self._nueva_etiqueta("L_for_start_")
+        etiqueta_loop_end = self._nueva_etiqueta("L_for_end_")
+
+        self._visitar_assign(nodo_for.init)
+        self._etiqueta(etiqueta_loop_start, comentario="Etiqueta de inicio/condición del for")
+
+        self._comentario(f"Evaluando condición del FOR en línea {nodo_for.cond.lineno}")
+        reg_cond, tipo_cond = self._visitar(nodo_for.cond)
+
+        if reg_cond is None or tipo_cond != 'bool':
+            _log.error("Error: La condición del FOR en línea %s no evaluó a un booleano o falló.", nodo_for.lineno)
+            self._comentario("ERROR: Condición de FOR fallida, posible bucle infinito o no ejecución.")
+            self._emitir("j", etiqueta_loop_end, comentario="Salto de emergencia por condición fallida")
+        else:
+            self._emitir("beq", reg_cond, "$zero", etiqueta_loop_end, comentario="Salta a loop_end si la condición es falsa (0)")
+
+        self._comentario(f"Cuerpo del FOR en línea {nodo_for.lineno}")
+        self._visitar_bloque(nodo_for.cuerpo)
+
+        self._visitar_assign(nodo_for.paso)
+        self._emitir("j", etiqueta_loop_start, comentario="Volver al inicio del for para re-evaluar condición")
+        self._etiqueta(etiqueta_loop_end, comentario="Etiqueta final del FOR")
+        self._comentario(f"Fin FOR en línea {nodo_for.lineno}")
+
+    def _convertir(self, registro, tipo_destino):
+        # Lleva un valor al banco de tipo_destino: int -> float con mtc1/cvt.s.w y float -> int
+        # con cvt.w.s/mfc1. Si ya está en el banco correcto se devuelve el mismo registro
+        if tipo_destino == 'float' and not _en_fpu(registro):
+            reg_f = self._obtener_registro_flotante_temporal()
+            self._emitir("mtc1", registro, reg_f, comentario=f"Mover int ({registro}) a FPU")
+            self._emitir("cvt.s.w", reg_f, reg_f, comentario="Convertir a float")
+            return reg_f
+        if tipo_destino != 'float' and _en_fpu(registro):
+            reg_f = self._obtener_registro_flotante_temporal()
+            self._emitir("cvt.w.s", reg_f, registro, comentario="Convertir float a entero")
+            reg_entero = self._obtener_registro_temporal()
+            self._emitir("mfc1", reg_entero, reg_f, comentario=f"Mover entero ({reg_f}) a la CPU")
+            return reg_entero
+        return registro
+
+    def _visitar_return(self, nodo_return):
+        # El valor va en $v0 (o $f0 si la función es float), como lo lee _generar_llamada,
+        # y se salta al epílogo de la función
+        if self.etiqueta_retorno is None:
+            self.etiqueta_retorno = self._nueva_etiqueta(f"epilogo_{self.funcion_actual_nombre}")
+        if nodo_return.valor is not None:
+            reg_valor, tipo_valor = self._visitar(nodo_return.valor)
+            if reg_valor is None:
+                _log.error("Error: No se obtuvo valor para el return en línea %s.", nodo_return.lineno)
+            elif self.funcion_actual_return_type == 'float':
+                self._emitir("mov.s", "$f0", self._convertir(reg_valor, 'float'), comentario="Valor de retorno float en $f0")
+            else:
+                self._emitir("move", "$v0", self._convertir(reg_valor, self.funcion_actual_return_type),
+                             comentario="Valor de retorno en $v0")
+        self._emitir("j", self.etiqueta_retorno, comentario=f"Return en línea {nodo_return.lineno}")
 
+GeneradorSPIM._despacho = tabla_despacho(GeneradorSPIM, '_visitar_', GeneradorSPIM._visitar_generico)
@@ -0,0 +1,59 @@
+# === Instrucciones MIPS estructuradas ===
+# El generador ya no arma las líneas de .text como texto: emite Instruccion con el código de
+# operación y los operandos por separado, así las pasadas posteriores (asignación de
+# registros) pueden ver qué registros lee y escribe cada instrucción sin volver a parsear
+# el ensamblador. El texto final se arma una sola vez con renderizar().
+
+COMENTARIO = '#' # Línea con solo un comentario (o en blanco si no tiene texto)
+ETIQUETA = ':'   # operandos = (nombre,)
+
+# Instrucciones cuyo primer operando no se escribe (todos sus registros se leen)
+_SIN_DESTINO = frozenset(('sw', 's.s', 'mult', 'div', 'beq', 'bne', 'j', 'jal', 'jr', 'syscall'))
+
+
+class Virtual(int):
+    """Registro virtual: un id entero, el bit 0 indica el banco (0: $t, 1: $f). Los ids son
+    densos por función, así el asignador indexa listas con ellos en vez de diccionarios de
+    nombres. Solo se formatea como texto ('%t3', '%f3') en los comentarios."""
+    __slots__ = ()
+
+    def __str__(self):
+        return f"%{'tf'[self & 1]}{self >> 1}"
+
+    __repr__ = __str__
+
+
+class Instruccion:
+    __slots__ = ('op', 'operandos', 'comentario')
+
+    def __init__(self, op, operandos=(), comentario=None):
+        self.op = op
+        self.operandos = operandos # Tupla de Virtual o str: registros, inmediatos, 'desp($reg)', etiquetas
+        self.comentario = comentario
+
+    def __repr__(self):
+        return f"Instruccion({self.op!r}, {self.operandos!r}, {self.comentario!r})"
+
+
+def destinos(instruccion):
+    """Posiciones de los operandos que la instrucción escribe; los demás registros se leen."""
+    op = instruccion.op
+    if op == COMENTARIO or op == ETIQUETA or op in _SIN_DESTINO:
+        return ()
+    if op == 'mtc1': # mtc1 rt, fs: lee el registro de la CPU y escribe el de la FPU
+        return (1,)
+    return (0,)
+
+
+def renderizar(instruccion):
+    op = instruccion.op
+    comentario = instruccion.comentario
+    if op == COMENTARIO:
+        return f"  # {comentario}" if comentario is not None else ""
+    if op == ETIQUETA:
+        linea = f"{instruccion.operandos[0]}:"
+    elif instruccion.operandos:
+        linea = f"  {op} {', '.join(instruccion.operandos)}"
+    else:
+        linea = f"  {op}"
+    return f"{linea}  # {comentario}" if comentario else linea
@@ -0,0 +1,189 @@
+import re
+
+from AsignadorRegistros import AUXILIARES, REGISTROS
+from InstruccionesMIPS import COMENTARIO, ETIQUETA, Instruccion, destinos
+
+# === Optimización de mirilla (peephole) ===
+# Se aplica sobre la lista de Instruccion ya con registros físicos, antes de renderizar el
+# texto. Cada regla mira una ventana de instrucciones consecutivas (las líneas de solo
+# comentario no cuentan ni cortan la ventana) y puede reescribirlas o eliminar algunas.
+# Las pasadas se repiten hasta que ninguna regla cambie nada.
+# Para saber si un registro queda muerto, una regla solo mira hacia adelante dentro de la
+# ventana: si no lo ve escrito antes de leerlo, no aplica. La excepción son los
+# temporales ($t, $f del asignador): no sobreviven a la instrucción fuente que los creó,
+# así que en una etiqueta, un salto o un syscall ya están muertos (los syscall solo los
+# emiten print, con el valor ya en $a0/$f12, y el final de main).
+
+VENTANA = 8
+
+_TEMPORALES = frozenset(REGISTROS[0] + REGISTROS[1] + AUXILIARES[0] + AUXILIARES[1])
+_FIN_TEMPORALES = frozenset(('j', 'jal', 'jr', 'beq', 'bne', 'syscall'))
+_LECTURAS_IMPLICITAS = {'syscall': ('$v0', '$a0', '$f12')}
+_MOVE = {'move': 0, 'mov.s': 1}        # move del banco de enteros / flotantes
+_GUARDADO_CARGA = {'sw': 'lw', 's.s': 'l.s'}
+_CARGAS = frozenset(('lw', 'l.s'))
+
+
+def _lee(instruccion, registro):
+    escritos = destinos(instruccion)
+    base = f"({registro})"
+    for posicion, operando in enumerate(instruccion.operandos):
+        if operando == registro and posicion not in escritos or operando.endswith(base):
+            return True
+    return registro in _LECTURAS_IMPLICITAS.get(instruccion.op, ())
+
+
+def _muerto_despues(ventana, desde, registro):
+    # True si 'registro' se escribe (o termina el bloque, para un temporal) antes de leerse
+    for instruccion in ventana[desde:]:
+        if instruccion.op == ETIQUETA:
+            return registro in _TEMPORALES
+        if _lee(instruccion, registro):
+            return False
+        if any(instruccion.operandos[p] == registro for p in destinos(instruccion)):
+            return True
+        if instruccion.op in _FIN_TEMPORALES:
+            return registro in _TEMPORALES
+    return False # La ventana no alcanza para decidir
+
+
+def move_redundante(ventana):
+    """X R, ... ; move D, R  ->  X D, ...  si R no se vuelve a leer (li + move, lw + move...)."""
+    produce, mueve = ventana[0], ventana[1]
+    if produce.op == ETIQUETA or destinos(produce) != (0,):
+        return None
+    destino, registro = mueve.operandos
+    if produce.operandos[0] != registro or destino == registro or not _muerto_despues(ventana, 2, registro):
+        return None
+    comentario = produce.comentario
+    if comentario is not None and registro in comentario:
+        # Los comentarios nombran primero el destino: "Suma int: $t0 = $t0 + $t1"
+        comentario = re.sub(re.escape(registro) + r"\b", lambda _: destino, comentario, count=1)
+    return 2, [Instruccion(produce.op, (destino,) + produce.operandos[1:], comentario)]
+
+
+def guardar_cargar(ventana):
+    """sw R, A ; lw S, A  ->  sw R, A (y move S, R si S no es R)."""
+    guarda, carga = ventana[0], ventana[1]
+    if _GUARDADO_CARGA[guarda.op] != carga.op or guarda.operandos[1] != carga.operandos[1]:
+        return None
+    registro, destino = guarda.operandos[0], carga.operandos[0]
+    if destino == registro:
+        return 2, [guarda]
+    return 2, [guarda, Instruccion('move' if carga.op == 'lw' else 'mov.s', (destino, registro), carga.comentario)]
+
+
+def salto_al_siguiente(ventana):
+    """j L (o beq/bne a L) seguido directamente de la etiqueta L: el salto sobra."""
+    objetivo = ventana[0].operandos[-1]
+    for instruccion in ventana[1:]:
+        if instruccion.op != ETIQUETA:
+            return None
+        if instruccion.operandos[0] == objetivo:
+            return 1, []
+    return None
+
+
+def epilogo_sp_fp(ventana):
+    """move $sp, $fp ; lw r, d($sp) ... ; addiu $sp, $sp, K  ->  lw r, d($fp) ... ;
+    addiu $sp, $fp, K ; lw $fp, d($fp). La carga de $fp, si hay, pasa al final: las demás
+    todavía usan el $fp viejo como base."""
+    if ventana[0].operandos != ('$sp', '$fp'):
+        return None
+    cargas, carga_fp = [], None
+    for consumidas, instruccion in enumerate(ventana[1:], start=2):
+        if instruccion.op == 'addiu' and instruccion.operandos[:2] == ('$sp', '$sp'):
+            break
+        if instruccion.op not in _CARGAS or not instruccion.operandos[1].endswith("($sp)") or \
+           instruccion.operandos[0] == '$sp':
+            return None # Solo cargas desde la pila
+        carga = Instruccion(instruccion.op, (instruccion.operandos[0], instruccion.operandos[1][:-5] + "($fp)"),
+                            instruccion.comentario)
+        if instruccion.operandos[0] == '$fp':
+            if carga_fp is not None:
+                return None
+            carga_fp = carga
+        else:
+            cargas.append(carga)
+    else:
+        return None
+    ajuste = Instruccion('addiu', ('$sp', '$fp', instruccion.operandos[2]), instruccion.comentario)
+    return consumidas, cargas + [ajuste] + ([carga_fp] if carga_fp else [])
+
+
+class Regla:
+    """aplicar(ventana) devuelve None o (n, reemplazo): las primeras n instrucciones de la
+    ventana se cambian por la lista reemplazo. Solo se prueba donde la instrucción
+    'posicion' (0 o 1) de la ventana tiene un código de operación de 'disparadores' y la
+    ventana tiene al menos 'minimo' instrucciones."""
+    __slots__ = ('nombre', 'aplicar', 'posicion', 'disparadores', 'minimo')
+
+    def __init__(self, nombre, aplicar, posicion, disparadores, minimo=2):
+        self.nombre = nombre
+        self.aplicar = aplicar
+        self.posicion = posicion
+        self.disparadores = frozenset(disparadores)
+        self.minimo = minimo
+
+
+REGLAS = {regla.nombre: regla for regla in (
+    Regla('move_redundante', move_redundante, 1, _MOVE),
+    Regla('guardar_cargar', guardar_cargar, 0, _GUARDADO_CARGA),
+    Regla('salto_al_siguiente', salto_al_siguiente, 0, ('j', 'beq', 'bne')),
+    Regla('epilogo_sp_fp', epilogo_sp_fp, 0, ('move',), minimo=3),
+)}
+
+
+def optimizar(instrucciones, ventana=VENTANA, reglas=None):
+    """Aplica las reglas (nombres de REGLAS u objetos Regla; todas si es None) hasta que
+    ninguna cambie nada, mirando 'ventana' instrucciones a la vez. Devuelve (instrucciones,
+    {nombre de regla: instrucciones eliminadas}). Con una ventana más chica que el mínimo de
+    una regla, esa regla no se aplica."""
+    if ventana < 1:
+        raise ValueError(f"La ventana de mirilla debe tener al menos 1 instrucción (se pidió {ventana})")
+    if reglas is None:
+        activas = list(REGLAS.values())
+    else:
+        desconocidas = [r for r in reglas if isinstance(r, str) and r not in REGLAS]
+        if desconocidas:
+            raise ValueError(f"Reglas de mirilla desconocidas: {', '.join(desconocidas)} "
+                             f"(disponibles: {', '.join(REGLAS)})")
+        activas = [REGLAS[r] if isinstance(r, str) else r for r in reglas]
+    eliminadas = {regla.nombre: 0 for regla in activas}
+    # (código de la 1.ª instrucción, código de la 2.ª) -> reglas a probar, en el orden de
+    # 'activas'; una regla con posicion 1 se prueba aunque otra coincida en la posición 0
+    por_par = {}
+    cambio = bool(activas)
+    while cambio:
+        cambio = False
+        reales = [i for i, instruccion in enumerate(instrucciones) if instruccion.op != COMENTARIO]
+        ops = [instrucciones[i].op for i in reales] + [None]
+        k = 0
+        while k < len(reales):
+            par = (ops[k], ops[k + 1])
+            candidatas = por_par.get(par)
+            if candidatas is None:
+                candidatas = por_par[par] = tuple(regla for regla in activas
+                                                  if par[regla.posicion] in regla.disparadores)
+            if not candidatas:
+                k += 1
+                continue
+            indices = reales[k:k + ventana]
+            vista = [instrucciones[i] for i in indices]
+            for regla in candidatas:
+                if len(vista) >= regla.minimo:
+                    resultado = regla.aplicar(vista)
+                    if resultado is not None:
+                        break
+            else:
+                k += 1
+                continue
+            consumidas, reemplazo = resultado
+            for i, nueva in zip(indices[:consumidas], reemplazo + [None] * (consumidas - len(reemplazo))):
+                instrucciones[i] = nueva
+            eliminadas[regla.nombre] += consumidas - len(reemplazo)
+            cambio = True
+            k += consumidas
+        if cambio:
+            instrucciones = [instruccion for instruccion in instrucciones if instruccion is not None]
+    return instrucciones, eliminadas
@@ -0,0 +1,171 @@
+import struct
+
+from ArbolAbstracto import (Assign, BinOp, Call, ExprStmt, For, FuncDef, If, Literal, Print, Return, VarDecl,
+                            While, espina_izquierda, recorrer, recorrer_instrucciones)
+from TablaSimbolos import SymbolType
+
+# === Plegado de constantes y simplificación algebraica ===
+# Pasada sobre el AST ya anotado por el análisis semántico (usa el 'tipo' de cada BinOp),
+# antes de generar código. Reemplaza en el lugar los BinOp con dos literales por el
+# literal resultante y aplica identidades como x*1, x+0, true && x. Los valores se
+# calculan como en la máquina: enteros de 32 bits (la división trunca hacia cero y el
+# residuo lleva el signo del dividendo, como div), flotantes de precisión simple y los
+# int mezclados con float convertidos como cvt.s.w. No se pliega la división por cero
+# (queda para tiempo de ejecución) ni nada con strings.
+# Las identidades que descartan un operando (x*0, false && x) solo se aplican si ese
+# operando no tiene llamadas ni divisiones (que pueden ser por cero): el código generado
+# evalúa siempre los dos lados.
+
+_COMPARACIONES = {
+    'EQ': lambda a, b: a == b, 'NE': lambda a, b: a != b,
+    'LT': lambda a, b: a < b, 'GT': lambda a, b: a > b,
+    'LE': lambda a, b: a <= b, 'GE': lambda a, b: a >= b,
+}
+_ARITMETICAS = {
+    'PLUS': lambda a, b: a + b, 'MINUS': lambda a, b: a - b, 'TIMES': lambda a, b: a * b,
+}
+# Expresiones de cada instrucción (For.init y For.paso son Assign: se pliegan aparte)
+_CAMPOS_EXPRESION = {
+    VarDecl: 'init', Assign: 'valor', ExprStmt: 'valor', Print: 'valor', If: 'cond',
+    While: 'cond', For: 'cond', Return: 'valor',
+}
+
+
+def a_32_bits(valor):
+    return (valor + 0x80000000) % 0x100000000 - 0x80000000
+
+
+def a_precision_simple(valor):
+    """El float de precisión simple más cercano (OverflowError si no es representable)."""
+    return struct.unpack('f', struct.pack('f', valor))[0]
+
+
+def _dividir(a, b):
+    # Cociente y residuo de div: trunca hacia cero
+    cociente = abs(a) // abs(b)
+    if (a < 0) != (b < 0):
+        cociente = -cociente
+    return cociente, a - cociente * b
+
+
+def _evaluar(op, izq, der, tipo):
+    # Valor del BinOp con dos literales, o None si no se pliega
+    if izq.tipo == SymbolType.STRING or der.tipo == SymbolType.STRING:
+        return None
+    a, b = izq.valor, der.valor
+    if izq.tipo == SymbolType.FLOAT or der.tipo == SymbolType.FLOAT:
+        a, b = a_precision_simple(float(a)), a_precision_simple(float(b))
+    if op in _COMPARACIONES:
+        return _COMPARACIONES[op](a, b)
+    if op == 'AND':
+        return bool(a and b)
+    if op == 'OR':
+        return bool(a or b)
+    if (op == 'DIVIDE' or op == 'MOD') and b == 0:
+        return None
+    if tipo == SymbolType.FLOAT:
+        valor = a / b if op == 'DIVIDE' else _ARITMETICAS[op](a, b)
+        try:
+            return a_precision_simple(valor)
+        except OverflowError:
+            return None
+    if op == 'DIVIDE' or op == 'MOD':
+        cociente, residuo = _dividir(a, b)
+        return a_32_bits(cociente if op == 'DIVIDE' else residuo)
+    return a_32_bits(_ARITMETICAS[op](a, b))
+
+
+def _es_literal(nodo, valor):
+    return type(nodo) is Literal and nodo.tipo != SymbolType.STRING and nodo.valor == valor
+
+
+def _sin_efectos(exp):
+    for nodo in recorrer([exp]):
+        if type(nodo) is Call or (type(nodo) is BinOp and (nodo.op == 'DIVIDE' or nodo.op == 'MOD')):
+            return False
+    return True
+
+
+def _simplificar(operacion):
+    # Identidades algebraicas con un solo literal. Devuelve el nodo que reemplaza al BinOp,
+    # o None. Un operando se devuelve tal cual solo si ya tiene el tipo del resultado.
+    op, izq, der, tipo = operacion.op, operacion.izq, operacion.der, operacion.tipo
+    if op == 'AND' or op == 'OR':
+        neutro = op == 'AND' # true && x == x ; false || x == x
+        if _es_literal(izq, neutro): return der
+        if _es_literal(der, neutro): return izq
+        if _es_literal(izq, not neutro) and _sin_efectos(der): return izq
+        if _es_literal(der, not neutro) and _sin_efectos(izq): return der
+        return None
+    if op == 'PLUS' and tipo == SymbolType.INT: # En float, -0.0 + 0 no es -0.0
+        if _es_literal(der, 0): return izq
+        if _es_literal(izq, 0): return der
+    elif op == 'MINUS' or op == 'DIVIDE':
+        if _es_literal(der, 0 if op == 'MINUS' else 1) and izq.tipo == tipo: return izq
+    elif op == 'TIMES':
+        if _es_literal(der, 1) and izq.tipo == tipo: return izq
+        if _es_literal(izq, 1) and der.tipo == tipo: return der
+        if tipo == SymbolType.INT:
+            if _es_literal(der, 0) and _sin_efectos(izq): return Literal(0, tipo, operacion.lineno)
+            if _es_literal(izq, 0) and _sin_efectos(der): return Literal(0, tipo, operacion.lineno)
+    elif op == 'MOD':
+        if _es_literal(der, 1) and _sin_efectos(izq): return Literal(0, tipo, operacion.lineno)
+    return None
+
+
+class _Plegador:
+    __slots__ = ('eliminados',)
+
+    def __init__(self):
+        self.eliminados = 0 # BinOp reemplazados
+
+    def expresion(self, exp):
+        if type(exp) is Call:
+            exp.args = [self.expresion(arg) for arg in exp.args]
+            return exp
+        if type(exp) is not BinOp:
+            return exp
+        # Por la espina izquierda sin recursión, como el resto de las pasadas sobre expresiones
+        hoja, operaciones = espina_izquierda(exp)
+        resultado = self.expresion(hoja)
+        for operacion in operaciones:
+            operacion.izq = resultado
+            operacion.der = self.expresion(operacion.der)
+            resultado = self._binop(operacion)
+        return resultado
+
+    def _binop(self, operacion):
+        izq, der = operacion.izq, operacion.der
+        if type(izq) is Literal and type(der) is Literal:
+            valor = _evaluar(operacion.op, izq, der, operacion.tipo)
+            reemplazo = None if valor is None else Literal(valor, operacion.tipo, operacion.lineno)
+        else:
+            reemplazo = _simplificar(operacion)
+        if reemplazo is None:
+            return operacion
+        self.eliminados += 1
+        return reemplazo
+
+    def instruccion(self, instruccion):
+        campo = _CAMPOS_EXPRESION.get(type(instruccion))
+        if campo is not None:
+            exp = getattr(instruccion, campo)
+            if exp is not None:
+                setattr(instruccion, campo, self.expresion(exp))
+        if type(instruccion) is For:
+            for asignacion in (instruccion.init, instruccion.paso):
+                if asignacion is not None:
+                    self.instruccion(asignacion)
+
+
+def plegar_constantes(programa):
+    """Pliega en el lugar las expresiones de todo el programa (inicializadores globales
+    incluidos). Devuelve cuántos BinOp se reemplazaron."""
+    plegador = _Plegador()
+    for decl in programa.decls:
+        if isinstance(decl, FuncDef):
+            for instruccion in recorrer_instrucciones(decl.cuerpo):
+                plegador.instruccion(instruccion)
+        else:
+            plegador.instruccion(decl)
+    return plegador.eliminados
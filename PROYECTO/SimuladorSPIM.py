@@ -0,0 +1,250 @@
+import math
+import struct
+
+# === Simulador del subconjunto de SPIM que emite GeneradorSPIM ===
+# No reemplaza a SPIM/QtSpim: ejecuta el .asm generado para comparar salidas entre versiones
+# del generador y contar instrucciones ejecutadas (métrica de los benchmarks). Cada
+# instrucción del listado cuenta como una, también las pseudoinstrucciones (li, la, sgt, ...)
+# que SPIM expande en varias.
+# Los registros guardan valores de Python: enteros con aritmética de 32 bits y flotantes
+# redondeados a precisión simple. mtc1/mfc1 copian el valor y cvt.s.w/cvt.w.s lo convierten,
+# que es lo que hacen esos pares con el patrón de bits en la máquina real (cvt.w.s redondea
+# al par más cercano, el modo por defecto de la FPU).
+
+DIRECCION_DATOS = 0x10010000
+PILA_INICIAL = 0x7FFFEFFC
+_ESCAPES = {'n': '\n', 't': '\t', '"': '"', '\\': '\\', '0': '\0'}
+
+
+def _a32(valor):
+    return (valor + 0x80000000) % 0x100000000 - 0x80000000
+
+
+def _f32(valor):
+    return struct.unpack('f', struct.pack('f', valor))[0]
+
+
+def _division(a, b):
+    # MIPS trunca el cociente hacia cero; el residuo tiene el signo del dividendo
+    if b == 0:
+        raise ZeroDivisionError("División entera por cero")
+    cociente = abs(a) // abs(b)
+    if (a < 0) != (b < 0):
+        cociente = -cociente
+    return _a32(cociente), _a32(a - cociente * b)
+
+
+def _division_flotante(a, b):
+    # IEEE 754: sin excepción, ±inf o NaN
+    if b == 0:
+        return math.nan if a == 0 or a != a else math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def _cadena(literal):
+    # Contenido de un .asciiz "..." con sus escapes
+    texto = []
+    i = 0
+    while i < len(literal):
+        c = literal[i]
+        if c == '\\' and i + 1 < len(literal):
+            i += 1
+            c = _ESCAPES.get(literal[i], literal[i])
+        texto.append(c)
+        i += 1
+    return ''.join(texto)
+
+
+def _sin_comentario(linea):
+    # Quita el comentario '#', respetando los '#' dentro de una cadena
+    en_cadena = False
+    for i, c in enumerate(linea):
+        if c == '"' and (i == 0 or linea[i - 1] != '\\'):
+            en_cadena = not en_cadena
+        elif c == '#' and not en_cadena:
+            return linea[:i]
+    return linea
+
+
+class ProgramaSPIM:
+    """Un .asm ya ensamblado: instrucciones (op, operandos), etiquetas de código y datos."""
+    __slots__ = ('instrucciones', 'etiquetas', 'memoria', 'cadenas', 'direcciones')
+
+    def __init__(self, asm):
+        self.instrucciones = []
+        self.etiquetas = {}   # etiqueta de código -> índice de instrucción
+        self.direcciones = {} # etiqueta de datos -> dirección
+        self.memoria = {}     # dirección -> palabra (int o float)
+        self.cadenas = {}     # dirección -> texto de un .asciiz
+        seccion = None
+        siguiente = DIRECCION_DATOS
+        for linea in asm.splitlines():
+            linea = _sin_comentario(linea).strip()
+            if not linea:
+                continue
+            if linea in ('.data', '.text'):
+                seccion = linea
+                continue
+            if linea.startswith('.globl'):
+                continue
+            etiqueta = None
+            if ':' in linea and not linea.startswith('"'):
+                posible, resto = linea.split(':', 1)
+                if posible.replace('_', '').isalnum():
+                    etiqueta, linea = posible, resto.strip()
+            if seccion == '.data':
+                if etiqueta is not None:
+                    self.direcciones[etiqueta] = siguiente
+                if linea:
+                    siguiente = self._dato(linea, siguiente)
+                continue
+            if etiqueta is not None:
+                self.etiquetas[etiqueta] = len(self.instrucciones)
+            if linea:
+                op, _, operandos = linea.partition(' ')
+                operandos = tuple(o.strip() for o in operandos.split(',')) if operandos else ()
+                self.instrucciones.append((op, operandos))
+
+    def _dato(self, linea, direccion):
+        directiva, _, valor = linea.partition(' ')
+        valor = valor.strip()
+        if directiva == '.word':
+            self.memoria[direccion] = int(valor)
+            return direccion + 4
+        if directiva == '.float':
+            self.memoria[direccion] = _f32(float(valor))
+            return direccion + 4
+        if directiva == '.asciiz':
+            texto = _cadena(valor[1:-1])
+            self.cadenas[direccion] = texto
+            return direccion + (len(texto) + 4) // 4 * 4 # Alineado a palabra
+        raise ValueError(f"Directiva de datos no soportada: {directiva}")
+
+
+class Simulador:
+    """Ejecuta un ProgramaSPIM desde 'main' hasta la syscall 10."""
+
+    def __init__(self, programa, max_pasos=50_000_000):
+        self.programa = programa
+        self.max_pasos = max_pasos
+        self.registros = {'$zero': 0, '$sp': PILA_INICIAL, '$fp': 0, '$ra': -1}
+        self.memoria = dict(programa.memoria)
+        self.hi = self.lo = 0
+        self.salida = []
+        self.pasos = 0 # Instrucciones ejecutadas
+
+    def _leer(self, registro):
+        return self.registros.get(registro, 0)
+
+    def _escribir(self, registro, valor):
+        if registro != '$zero':
+            self.registros[registro] = valor
+
+    def _direccion(self, operando):
+        # 'desplazamiento($registro)' o una etiqueta de datos
+        if operando.endswith(')'):
+            desplazamiento, registro = operando[:-1].split('(')
+            return self._leer(registro) + int(desplazamiento or 0)
+        return self.programa.direcciones[operando]
+
+    def _valor(self, operando):
+        if operando.startswith('$'):
+            return self._leer(operando)
+        return int(operando)
+
+    def ejecutar(self):
+        instrucciones = self.programa.instrucciones
+        etiquetas = self.programa.etiquetas
+        leer = self._leer
+        escribir = self._escribir
+        valor = self._valor
+        pc = etiquetas['main']
+        while 0 <= pc < len(instrucciones):
+            self.pasos += 1
+            if self.pasos > self.max_pasos:
+                raise RuntimeError(f"Se superaron {self.max_pasos} instrucciones ejecutadas")
+            op, a = instrucciones[pc]
+            pc += 1
+            if op == 'li':
+                escribir(a[0], _a32(int(a[1])))
+            elif op == 'la':
+                escribir(a[0], self.programa.direcciones[a[1]])
+            elif op == 'lw' or op == 'l.s':
+                escribir(a[0], self.memoria.get(self._direccion(a[1]), 0))
+            elif op == 'sw' or op == 's.s':
+                self.memoria[self._direccion(a[1])] = leer(a[0])
+            elif op == 'move' or op == 'mov.s' or op == 'mtc1' or op == 'mfc1':
+                escribir(a[1] if op == 'mtc1' else a[0], leer(a[0] if op == 'mtc1' else a[1]))
+            elif op == 'addiu' or op == 'addi':
+                escribir(a[0], _a32(leer(a[1]) + int(a[2])))
+            elif op in _ENTERAS:
+                escribir(a[0], _ENTERAS[op](leer(a[1]), valor(a[2])))
+            elif op in _FLOTANTES:
+                escribir(a[0], _f32(_FLOTANTES[op](leer(a[1]), leer(a[2]))))
+            elif op == 'cvt.s.w':
+                escribir(a[0], _f32(float(leer(a[1]))))
+            elif op == 'cvt.w.s':
+                escribir(a[0], _a32(round(leer(a[1]))))
+            elif op == 'mult':
+                producto = leer(a[0]) * leer(a[1])
+                self.lo, self.hi = _a32(producto), _a32(producto >> 32)
+            elif op == 'div':
+                self.lo, self.hi = _division(leer(a[0]), leer(a[1]))
+            elif op == 'mflo':
+                escribir(a[0], self.lo)
+            elif op == 'mfhi':
+                escribir(a[0], self.hi)
+            elif op == 'beq':
+                if leer(a[0]) == valor(a[1]):
+                    pc = etiquetas[a[2]]
+            elif op == 'bne':
+                if leer(a[0]) != valor(a[1]):
+                    pc = etiquetas[a[2]]
+            elif op == 'j':
+                pc = etiquetas[a[0]]
+            elif op == 'jal':
+                escribir('$ra', pc)
+                pc = etiquetas[a[0]]
+            elif op == 'jr':
+                pc = leer(a[0])
+            elif op == 'syscall':
+                if not self._syscall():
+                    break
+            else:
+                raise ValueError(f"Instrucción no soportada por el simulador: {op}")
+        return ''.join(self.salida)
+
+    def _syscall(self):
+        servicio = self._leer('$v0')
+        if servicio == 1:
+            self.salida.append(str(self._leer('$a0')))
+        elif servicio == 2:
+            self.salida.append(f"{self._leer('$f12'):.8g}")
+        elif servicio == 4:
+            self.salida.append(self.programa.cadenas.get(self._leer('$a0'), ''))
+        elif servicio == 10:
+            return False
+        else:
+            raise ValueError(f"Syscall no soportada por el simulador: {servicio}")
+        return True
+
+
+_ENTERAS = {
+    'add': lambda a, b: _a32(a + b), 'addu': lambda a, b: _a32(a + b),
+    'sub': lambda a, b: _a32(a - b), 'subu': lambda a, b: _a32(a - b),
+    'and': lambda a, b: a & b, 'or': lambda a, b: a | b,
+    'seq': lambda a, b: int(a == b), 'sne': lambda a, b: int(a != b),
+    'slt': lambda a, b: int(a < b), 'sgt': lambda a, b: int(a > b),
+    'sle': lambda a, b: int(a <= b), 'sge': lambda a, b: int(a >= b),
+}
+_FLOTANTES = {
+    'add.s': lambda a, b: a + b, 'sub.s': lambda a, b: a - b,
+    'mul.s': lambda a, b: a * b, 'div.s': _division_flotante,
+}
+
+
+def ejecutar(asm, max_pasos=50_000_000):
+    """Ejecuta un .asm generado y devuelve (salida impresa, instrucciones ejecutadas)."""
+    simulador = Simulador(ProgramaSPIM(asm), max_pasos)
+    salida = simulador.ejecutar()
+    return salida, simulador.pasos
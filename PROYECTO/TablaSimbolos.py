@@ -1,61 +1,135 @@
+import json
+from enum import Enum
+
+_UNRESOLVED = object() # Marker for "not in the resolution cache" (None is a valid cached result)
+
+
+class SymbolType(str, Enum):
+    # str subclass: SymbolType.INT == 'int', hashes like 'int' and prints as 'int'
+    INT = 'int'
+    FLOAT = 'float'
+    BOOL = 'bool'
+    STRING = 'string'
+    VOID = 'void'
+
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+
+class SymbolKind(str, Enum):
+    VARIABLE = 'variable'
+    PARAMETER = 'parameter'
+    FUNCTION = 'function'
+
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+
+class Symbol:
+    # For functions 'type' is the return type. 'offset' is the $fp offset of a local or
+    # parameter; the code generator fills it in when it lays out the frame (None for globals).
+    __slots__ = ('name', 'kind', 'type', 'line', 'scope_attr', 'scope_id', 'param_types', 'param_names', 'offset')
+
+    def __init__(self, name, kind, type_val, line, scope_attr, scope_id, param_types=(), param_names=()):
+        self.name = name
+        self.kind = kind
+        self.type = type_val
+        self.line = line
+        self.scope_attr = scope_attr # Scope name shown in the table ('global' or the function)
+        self.scope_id = scope_id     # Index of the scope in all_created_scopes_data
+        self.param_types = tuple(param_types)
+        self.param_names = tuple(param_names)
+        self.offset = None
+
+    @property
+    def is_function(self):
+        return self.kind is SymbolKind.FUNCTION
+
+    def type_description(self):
+        # Format used in the printed table: 'int' or 'FUNCTION (INT, FLOAT) -> VOID'
+        if self.is_function:
+            params = ", ".join(self.param_types).upper()
+            return f"FUNCTION ({params}) -> {self.type.upper()}"
+        return self.type
+
+    def __repr__(self):
+        return f"Symbol({self.name!r}, {self.kind}, '{self.type_description()}', line={self.line})"
+
+
 class SymbolTable:
     def __init__(self):
-        self.scope_stack = [{'name': 'global', 'symbols': {}}] 
+        self.scope_stack = [{'name': 'global', 'id': 0, 'symbols': {}}] 
         self.all_created_scopes_data = [self.scope_stack[0]] 
         self.errors = []
+        # Indexes so that lookups don't scan the scopes:
+        # scopes_by_name: scope name -> scope data (the first scope created with that name)
+        # _visible: symbol name -> entries declared in the open scopes, innermost last
+        # _resolution_cache: (scope name, symbol name) -> resolved entry; cleared when the table changes
+        self.scopes_by_name = {'global': self.scope_stack[0]}
+        self._visible = {}
+        self._resolution_cache = {}
 
     def enter_scope(self, scope_context_name):
         if not scope_context_name:
             scope_context_name = f"scope_{len(self.scope_stack)}" 
 
         new_scope_symbols_dict = {}
-        new_scope_data_for_stack = {'name': scope_context_name, 'symbols': new_scope_symbols_dict}
+        new_scope_data_for_stack = {'name': scope_context_name, 'id': len(self.all_created_scopes_data), 'symbols': new_scope_symbols_dict}
 
         self.scope_stack.append(new_scope_data_for_stack)
         self.all_created_scopes_data.append(new_scope_data_for_stack)
+        self.scopes_by_name.setdefault(scope_context_name, new_scope_data_for_stack)
+        self._resolution_cache.clear()
 
     def exit_scope(self):
         if len(self.scope_stack) > 1: # Cannot pop the global scope
-            return self.scope_stack.pop()
+            scope_data = self.scope_stack.pop()
+            for name in scope_data['symbols']:
+                entries = self._visible[name]
+                entries.pop()
+                if not entries:
+                    del self._visible[name]
+            self._resolution_cache.clear()
+            return scope_data
         else:
             self.add_error("System Error: Attempted to exit global scope.")
             return None
 
-    def add_symbol(self, name, type_val, lineno, declared_in_scope_name_attr, param_types=None, param_names_ordered=None):
+    def add_symbol(self, name, kind, type_val, lineno, declared_in_scope_name_attr, param_types=(), param_names=()):
         current_scope_data_on_stack = self.scope_stack[-1]
         current_symbols_dict = current_scope_data_on_stack['symbols']
         
         if name in current_symbols_dict:
             existing_symbol = current_symbols_dict[name]
             self.add_error(
-                f"Error semántico [línea {lineno}]: El símbolo '{name}' ya ha sido declarado en el ámbito '{declared_in_scope_name_attr}' en la línea {existing_symbol['line']}."
+                f"Error semántico [línea {lineno}]: El símbolo '{name}' ya ha sido declarado en el ámbito '{declared_in_scope_name_attr}' en la línea {existing_symbol.line}."
             )
+            return None
         else:
-            symbol_entry = {
-                'type': type_val,
-                'line': lineno,
-                'scope_attr': declared_in_scope_name_attr
-            }
-            if param_types is not None: # It's a function
-                symbol_entry['param_types'] = param_types
-            if param_names_ordered is not None: # Also a function
-                symbol_entry['param_names_ordered'] = param_names_ordered
-
+            symbol_entry = Symbol(name, kind, type_val, lineno, declared_in_scope_name_attr,
+                                  current_scope_data_on_stack['id'], param_types, param_names)
             current_symbols_dict[name] = symbol_entry
-
+            self._visible.setdefault(name, []).append(symbol_entry)
+            self._resolution_cache.clear()
+            return symbol_entry # The new entry, or None if the name was already declared
 
     def lookup_symbol(self, name, current_scope_name_for_locals_then_global=None):
-        if current_scope_name_for_locals_then_global:
-            for scope_data in self.all_created_scopes_data: # Check all_created_scopes for specific named scope
-                if scope_data['name'] == current_scope_name_for_locals_then_global:
-                    if name in scope_data['symbols']:
-                        return scope_data['symbols'][name]
-                    break # Found the scope, but not the symbol
-
-        for scope_data in reversed(self.scope_stack):
-            if name in scope_data['symbols']:
-                return scope_data['symbols'][name] # Returns the attribute dictionary
-        return None
+        key = (current_scope_name_for_locals_then_global, name)
+        symbol = self._resolution_cache.get(key, _UNRESOLVED)
+        if symbol is _UNRESOLVED:
+            symbol = self._resolve(name, current_scope_name_for_locals_then_global)
+            self._resolution_cache[key] = symbol
+        return symbol
+
+    def _resolve(self, name, scope_name):
+        # First the named scope (if any), then the open scopes from innermost to global
+        if scope_name:
+            scope_data = self.scopes_by_name.get(scope_name)
+            if scope_data is not None and name in scope_data['symbols']:
+                return scope_data['symbols'][name]
+
+        entries = self._visible.get(name)
+        return entries[-1] if entries else None # Returns the Symbol
     
     def add_error(self, message):
         self.errors.append(message)
@@ -79,12 +153,41 @@ class SymbolTable:
                 # Example: output_lines.append("| (sin símbolos en este ámbito) |      |              |       |")
                 pass # No symbols, just print the header for this scope
             else:
-                for name, attrs in symbols_in_scope.items():
-                    ambito_display = attrs.get('scope_attr', scope_context_name) # Fallback to scope_context_name if scope_attr missing
-                    output_lines.append(f"| {name:<6} | {attrs.get('type', 'N/A'):<4} | {ambito_display:<12} | {str(attrs.get('line', -1)):<5} |")
+                for name, symbol in symbols_in_scope.items():
+                    output_lines.append(f"| {name:<6} | {symbol.type_description():<4} | {symbol.scope_attr:<12} | {str(symbol.line):<5} |")
 
         return "\n".join(output_lines)
 
+    def serialize(self):
+        """Compact JSON form of the table: one list per scope [name, symbols], each symbol as
+        [name, kind, type, line, scope_attr, param_types, param_names, offset]."""
+        scopes = []
+        for scope_data in self.all_created_scopes_data:
+            symbols = [[sym.name, sym.kind.value, sym.type.value, sym.line, sym.scope_attr,
+                        [t.value for t in sym.param_types], list(sym.param_names), sym.offset]
+                       for sym in scope_data['symbols'].values()]
+            scopes.append([scope_data['name'], symbols])
+        return json.dumps({'scopes': scopes, 'errors': self.errors}, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def deserialize(cls, text):
+        """Rebuilds a table written by serialize(). All scopes end up closed (only 'global' open)."""
+        data = json.loads(text)
+        table = cls()
+        for scope_id, (scope_name, symbols) in enumerate(data['scopes']):
+            if scope_id > 0:
+                table.enter_scope(scope_name)
+            for name, kind, type_val, line, scope_attr, param_types, param_names, offset in symbols:
+                if name in table.scope_stack[-1]['symbols']:
+                    raise ValueError(f"Tabla serializada inválida: '{name}' aparece dos veces en el ámbito '{scope_name}'")
+                symbol = table.add_symbol(name, SymbolKind(kind), SymbolType(type_val), line, scope_attr,
+                                          [SymbolType(t) for t in param_types], param_names)
+                symbol.offset = offset
+            if scope_id > 0:
+                table.exit_scope()
+        table.errors = list(data['errors'])
+        return table
+
     def get_formatted_errors(self):
         output_lines = ["=== Errores Semánticos ==="]
         if not self.errors:
@@ -0,0 +1,870 @@
+"""Benchmarks de rendimiento del compilador.
+
+Uso (desde el directorio PROYECTO):
+    python benchmarks.py parser [--tamanos 1000 10000 100000 1000000]
+    python benchmarks.py tabla [--repeticiones 20]
+    python benchmarks.py gramatica [--copias 1 10 50 100] [--sin-referencia]
+    python benchmarks.py memoria [--tamanos 1000 100000]
+    python benchmarks.py visitas [--instrucciones 20000] [--repeticiones 5]
+    python benchmarks.py profundidad [--instrucciones 100000] [--terminos 100000]
+    python benchmarks.py simbolos [--funciones 500 2000 5000]
+    python benchmarks.py lexer [--instrucciones 1000 100000]
+    python benchmarks.py flujo [--instrucciones 1000 100000]
+    python benchmarks.py arranque [--repeticiones 20]
+    python benchmarks.py lote [--archivos 50] [--jobs 1 2 4] [--instrucciones N]
+    python benchmarks.py diagnosticos [--funciones 20000]
+    python benchmarks.py registros [--profundidades 4 8 16 32 64] [--iteraciones 100]
+    python benchmarks.py plegado
+    python benchmarks.py mirilla [--ventanas 1 2 4 8 16]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+import AnalizadorLexico
+import AnalizadorLexicoRapido
+import ArbolAbstracto
+import ArbolSintactico
+import crearTabla
+import Diagnosticos
+import SimuladorSPIM
+from ArbolAbstracto import (Assign, BinOp, Call, FuncDef, If, Literal, Param, Print, Program, Return,
+                            Var, VarDecl, While)
+from AnalizadorSintactico import SemanticAnalyzer
+from GeneradorSPIM import GeneradorSPIM
+from InstruccionesMIPS import COMENTARIO, ETIQUETA, Instruccion
+from OptimizadorMirilla import REGLAS as REGLAS_MIRILLA, optimizar as optimizar_mirilla
+from TablaSimbolos import SymbolTable
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TABLA_CSV = os.path.join(BASE_DIR, "tabla_sintactica.csv")
+GRAMATICA = os.path.join(BASE_DIR, "gramatica.txt")
+CODIGO = os.path.join(BASE_DIR, "codigo.txt")
+
+
+# === Generadores de entradas sintéticas ===
+def _token(tipo, valor, lineno, lexpos=0):
+    return {'type': tipo, 'value': valor, 'lineno': lineno, 'lexpos': lexpos}
+
+
+def generar_tokens_main(n_tokens):
+    """Tokens de un main() con asignaciones 'x = 1 + 2;' hasta ~n_tokens."""
+    tokens = [_token('MAIN', 'main', 1), _token('LPAREN', '(', 1),
+              _token('RPAREN', ')', 1), _token('LBRACE', '{', 1)]
+    linea = 2
+    while len(tokens) < n_tokens - 1:
+        tokens.extend((
+            _token('ID', 'x', linea), _token('EQUALS', '=', linea),
+            _token('INT_NUM', 1, linea), _token('PLUS', '+', linea),
+            _token('INT_NUM', 2, linea), _token('SEMI', ';', linea),
+        ))
+        linea += 1
+    tokens.append(_token('RBRACE', '}', linea))
+    return tokens
+
+
+def generar_tokens_cuerpo(n_instrucciones, n_terminos=2):
+    """Tokens de main() { int x = 0; x = x + 1 + ... ; ... } con n_instrucciones
+    asignaciones de n_terminos términos cada una."""
+    tokens = [_token('MAIN', 'main', 1), _token('LPAREN', '(', 1), _token('RPAREN', ')', 1),
+              _token('LBRACE', '{', 1), _token('INT', 'int', 2), _token('ID', 'x', 2),
+              _token('EQUALS', '=', 2), _token('INT_NUM', 0, 2), _token('SEMI', ';', 2)]
+    for linea in range(3, n_instrucciones + 3):
+        tokens.extend((_token('ID', 'x', linea), _token('EQUALS', '=', linea), _token('ID', 'x', linea)))
+        for _ in range(n_terminos - 1):
+            tokens.extend((_token('PLUS', '+', linea), _token('INT_NUM', 1, linea)))
+        tokens.append(_token('SEMI', ';', linea))
+    tokens.append(_token('RBRACE', '}', n_instrucciones + 3))
+    return tokens
+
+
+def _medir(funcion, *args, **kwargs):
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return time.perf_counter() - inicio, resultado
+
+
+# === Benchmark: driver LL(1) ===
+def bench_parser(tamanos):
+    tabla = ArbolSintactico.cargar_tabla_compilada(TABLA_CSV)
+    terminales = tabla.terminales
+    print(f"{'tokens':>10} | {'tiempo (s)':>10} | {'us/token':>9}")
+    print(f"{'-' * 10}-+-{'-' * 10}-+-{'-' * 9}")
+    for n in tamanos:
+        tokens = generar_tokens_main(n)
+        segundos, resultado = _medir(ArbolSintactico.analizar_cadena,
+                                     tabla, tokens, terminales, "")
+        if not resultado[0]:
+            print(f"Error: la entrada sintética de {n} tokens no fue aceptada: {resultado[1]}")
+            return
+        print(f"{len(tokens):>10} | {segundos:>10.3f} | {segundos / len(tokens) * 1e6:>9.2f}")
+        del resultado, tokens
+
+
+# === Benchmark: memoria del árbol sintáctico ===
+def bench_memoria(tamanos):
+    tabla = ArbolSintactico.cargar_tabla_compilada(TABLA_CSV)
+    print(f"{'tokens':>10} | {'nodos':>10} | {'KiB / 1k tokens':>15} | {'pico KiB / 1k':>13}")
+    for n in tamanos:
+        tokens = generar_tokens_main(n)
+        gc.collect()
+        tracemalloc.start()
+        _, _, arbol = ArbolSintactico.analizar_cadena(tabla, tokens, tabla.terminales, "")
+        actual, pico = tracemalloc.get_traced_memory() # 'actual' es lo que retiene el árbol
+        tracemalloc.stop()
+        miles = len(tokens) / 1000
+        print(f"{len(tokens):>10} | {ArbolAbstracto.contar_nodos(arbol):>10} | {actual / 1024 / miles:>15.1f} | {pico / 1024 / miles:>13.1f}")
+        del arbol, tokens
+
+
+# === Benchmark: despacho de los visitantes del AST ===
+def generar_ast_main(n_instrucciones):
+    """AST de un main() con 'int x = 0;' y n_instrucciones que mezclan asignaciones,
+    if, while y print sobre x (todas válidas para el análisis semántico)."""
+    def _suma(linea):
+        return BinOp('PLUS', Var('x', linea), Literal(1, 'int', linea), linea, linea)
+
+    cuerpo = [VarDecl('x', 'int', Literal(0, 'int', 1), 1)]
+    for i in range(n_instrucciones):
+        linea = i + 2
+        tipo = i % 4
+        if tipo == 0:
+            cuerpo.append(Assign('x', _suma(linea), linea))
+        elif tipo == 1:
+            cond = BinOp('LT', Var('x', linea), Literal(10, 'int', linea), linea, linea)
+            cuerpo.append(If(cond, [Assign('x', _suma(linea), linea)], [Print(Var('x', linea), linea)], linea))
+        elif tipo == 2:
+            cond = BinOp('GT', Var('x', linea), Literal(0, 'int', linea), linea, linea)
+            cuerpo.append(While(cond, [Assign('x', BinOp('MINUS', Var('x', linea), Literal(1, 'int', linea), linea, linea), linea)], linea))
+        else:
+            cuerpo.append(Print(_suma(linea), linea))
+    return Program([FuncDef('main', 'void', [], cuerpo, 1, es_main=True)])
+
+
+class _SemanticoGetattr(SemanticAnalyzer):
+    # Despacho anterior (referencia): nombre del método armado y buscado en cada visita
+    def _visit(self, node):
+        if not node:
+            return 'TypeError'
+        return getattr(self, f'_visit_{type(node).__name__.lower()}', self._generic_visit)(node)
+
+
+class _GeneradorGetattr(GeneradorSPIM):
+    def _visitar(self, nodo):
+        if nodo is None: return
+        return getattr(self, f'_visitar_{type(nodo).__name__.lower()}', self._visitar_generico)(nodo)
+
+
+def bench_visitas(n_instrucciones, repeticiones):
+    ast = generar_ast_main(n_instrucciones)
+    nodos = ArbolAbstracto.contar_nodos(ast)
+
+    def _semantico(clase):
+        analizador = clase(ast)
+        analizador.analyze()
+        return analizador
+
+    def _codigo(clase, tabla):
+        return clase().generar(ast, tabla)
+
+    def _mejor(funcion, *args):
+        mejor = float("inf")
+        for _ in range(repeticiones):
+            with contextlib.redirect_stdout(io.StringIO()): # Silenciar los prints de depuración
+                segundos, resultado = _medir(funcion, *args)
+            mejor = min(mejor, segundos)
+        return mejor, resultado
+
+    t_sem, analizador = _mejor(_semantico, SemanticAnalyzer)
+    if analizador.symbol_table.errors:
+        print(f"Error: el AST sintético tiene errores semánticos: {analizador.symbol_table.errors[:3]}")
+        return
+    t_sem_ref, _ = _mejor(_semantico, _SemanticoGetattr)
+    t_gen, codigo = _mejor(_codigo, GeneradorSPIM, analizador.symbol_table)
+    t_gen_ref, codigo_ref = _mejor(_codigo, _GeneradorGetattr, analizador.symbol_table)
+    if codigo != codigo_ref:
+        print("Error: el despacho por tabla genera un código distinto al de referencia")
+        return
+
+    print(f"AST sintético: {n_instrucciones} instrucciones, {nodos} nodos")
+    print(f"{'fase':<10} | {'tabla (visitas/s)':>17} | {'getattr (visitas/s)':>19} | {'mejora':>6}")
+    for fase, t, t_ref in (("semántica", t_sem, t_sem_ref), ("código", t_gen, t_gen_ref)):
+        print(f"{fase:<10} | {nodos / t:>17,.0f} | {nodos / t_ref:>19,.0f} | {t_ref / t:>5.2f}x")
+
+
+# === Benchmark: lexer PLY vs. lexer rápido ===
+def generar_fuente_main(n_instrucciones):
+    """Código fuente de un main() con 'int x = 0;' y n_instrucciones asignaciones."""
+    lineas = ["main() {", "    int x = 0;"]
+    lineas.extend("    x = x + 1 * (2 - 3); // comentario" for _ in range(n_instrucciones))
+    lineas.append("}")
+    return "\n".join(lineas) + "\n"
+
+
+def _tokens_ply(contenido):
+    return ArbolSintactico.ejecutar_lexer(contenido)
+
+
+def bench_lexer(tamanos):
+    # Que los dos lexers den los mismos tokens lo prueba tests/test_lexer.py
+    tabla = ArbolSintactico.cargar_tabla_compilada(TABLA_CSV)
+    print(f"{'instrucciones':>13} | {'tokens':>8} | {'PLY (s)':>8} | {'rápido (s)':>10} | {'mejora':>6} | "
+          f"{'lexer+parser PLY (s)':>20} | {'lexer+parser rápido (s)':>23}")
+    for n in tamanos:
+        contenido = generar_fuente_main(n)
+        t_ply, tokens = _medir(_tokens_ply, contenido)
+        t_rapido, _ = _medir(AnalizadorLexicoRapido.tokenizar, contenido)
+        completo = {}
+        for motor, lexer in (("ply", _tokens_ply), ("rapido", AnalizadorLexicoRapido.tokenizar)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                completo[motor], resultado = _medir(lambda: ArbolSintactico.analizar_cadena(
+                    tabla, lexer(contenido), tabla.terminales, contenido))
+            if not resultado[0]:
+                print(f"Error: la entrada de {n} instrucciones no fue aceptada con el lexer {motor}")
+                return
+            del resultado
+        print(f"{n:>13} | {len(tokens):>8} | {t_ply:>8.3f} | {t_rapido:>10.3f} | {t_ply / t_rapido:>5.1f}x | "
+              f"{completo['ply']:>20.3f} | {completo['rapido']:>23.3f}")
+
+
+# === Benchmark: tokens en lista vs. flujo a demanda ===
+def bench_flujo(tamanos):
+    # 'transitorio' = pico - lo que queda retenido al final (el árbol): es la memoria de
+    # la entrada. Con la lista crece con el archivo; con FlujoTokens debe quedar casi fija.
+    tabla = ArbolSintactico.cargar_tabla_compilada(TABLA_CSV)
+    formas = (("lista", ArbolSintactico.ejecutar_lexer), ("flujo", ArbolSintactico.FlujoTokens))
+    print(f"{'instrucciones':>13} | {'entrada':>7} | {'tiempo (s)':>10} | {'transitorio KiB':>15} | {'árbol KiB':>10}")
+    for n in tamanos:
+        contenido = generar_fuente_main(n)
+        for nombre, fuente in formas:
+            t, resultado = _medir(lambda: ArbolSintactico.analizar_cadena(
+                tabla, fuente(contenido), tabla.terminales, contenido))
+            if not resultado[0]:
+                print(f"Error: la entrada de {n} instrucciones no fue aceptada ({nombre})")
+                return
+            del resultado
+            gc.collect()
+            tracemalloc.start()
+            arbol = ArbolSintactico.analizar_cadena(tabla, fuente(contenido), tabla.terminales, contenido)[2]
+            actual, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del arbol
+            print(f"{n:>13} | {nombre:>7} | {t:>10.3f} | {(pico - actual) / 1024:>15.1f} | {actual / 1024:>10.1f}")
+
+
+# === Benchmark: arranque del lexer (import + primer token) ===
+# Cada medición es un proceso nuevo: mide dentro del hijo el import de AnalizadorLexico
+# (que construye el lexer) y el primer token, y desde fuera el tiempo total del proceso.
+_CODIGO_ARRANQUE = """
+import time
+inicio = time.perf_counter()
+import AnalizadorLexico
+construido = time.perf_counter()
+AnalizadorLexico.nuevo_lexer("main() {}").token()
+fin = time.perf_counter()
+print(construido - inicio, fin - inicio, AnalizadorLexico.lexer.lexoptimize)
+"""
+
+def _borrar_lextabs():
+    if not os.path.isdir(AnalizadorLexico.DIR_CACHE):
+        return
+    for archivo in os.listdir(AnalizadorLexico.DIR_CACHE):
+        if archivo.startswith(AnalizadorLexico.PREFIJO_LEXTAB) and archivo.endswith(".py"):
+            os.remove(os.path.join(AnalizadorLexico.DIR_CACHE, archivo))
+
+
+def _arranque(sin_cache):
+    if sin_cache:
+        _borrar_lextabs()
+    inicio = time.perf_counter()
+    salida = subprocess.run([sys.executable, "-c", _CODIGO_ARRANQUE], cwd=BASE_DIR,
+                            capture_output=True, text=True, check=True).stdout.split()
+    total = time.perf_counter() - inicio
+    return float(salida[0]), float(salida[1]), total, salida[2] == "True"
+
+
+def bench_arranque(repeticiones):
+    print(f"{'lextab':<24} | {'import (ms)':>11} | {'+ 1er token (ms)':>16} | {'proceso (ms)':>12}")
+    for nombre, sin_cache in (("sin caché (se construye)", True), ("desde .cache/", False)):
+        medidas = [_arranque(sin_cache) for _ in range(repeticiones)]
+        if not sin_cache and not all(optimizado for *_, optimizado in medidas):
+            print("Error: el lexer no se cargó desde el lextab en caché")
+            return
+        construccion, primer_token, total = (min(columna) for columna in list(zip(*medidas))[:3])
+        print(f"{nombre:<24} | {construccion * 1e3:>11.2f} | {primer_token * 1e3:>16.2f} | {total * 1e3:>12.1f}")
+
+
+# === Benchmark: modo lote vs. un proceso por archivo ===
+def _main_py(*argumentos):
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable, os.path.join(BASE_DIR, "main.py"), *argumentos],
+                             capture_output=True, text=True)
+    return time.perf_counter() - inicio, proceso.returncode
+
+
+def bench_lote(n_archivos, jobs, n_instrucciones=None):
+    # Sin n_instrucciones cada archivo es una copia de codigo.txt; con n_instrucciones, un
+    # main() sintético de ese tamaño (archivos más pesados, donde los procesos rinden más).
+    if n_instrucciones:
+        codigo = generar_fuente_main(n_instrucciones)
+        descripcion = f"mains de {n_instrucciones} instrucciones"
+    else:
+        with open(CODIGO, encoding="utf-8") as f:
+            codigo = f.read()
+        descripcion = "copias de codigo.txt"
+    with tempfile.TemporaryDirectory() as directorio:
+        entradas = os.path.join(directorio, "entradas")
+        os.makedirs(entradas)
+        for i in range(n_archivos):
+            with open(os.path.join(entradas, f"f{i:04d}.txt"), "w", encoding="utf-8") as f:
+                f.write(codigo)
+        archivos = sorted(os.path.join(entradas, nombre) for nombre in os.listdir(entradas))
+
+        t_separados = 0.0
+        for ruta in archivos:
+            segundos, codigo_salida = _main_py(ruta, "--salida", os.path.join(directorio, "separados"))
+            if codigo_salida != 0:
+                print(f"Error: main.py falló con {ruta}")
+                return
+            t_separados += segundos
+        tiempos = [("un proceso por archivo", t_separados)]
+        for n in jobs:
+            salida = os.path.join(directorio, f"lote_{n}")
+            segundos, codigo_salida = _main_py(entradas, "--salida", salida, "--jobs", str(n))
+            if codigo_salida != 0:
+                print(f"Error: el modo lote falló con --jobs {n}")
+                return
+            for ruta in archivos:
+                nombre = os.path.splitext(os.path.basename(ruta))[0] + ".asm"
+                with open(os.path.join(directorio, "separados", nombre), encoding="utf-8") as a, \
+                     open(os.path.join(salida, nombre), encoding="utf-8") as b:
+                    if a.read() != b.read():
+                        print(f"Error: {nombre} difiere entre el modo lote (--jobs {n}) y la compilación separada")
+                        return
+            tiempos.append((f"lote --jobs {n}", segundos))
+
+    print(f"{n_archivos} {descripcion} (mismo .asm en todos los modos; {os.cpu_count()} núcleos)")
+    print(f"{'modo':<22} | {'total (s)':>9} | {'ms / archivo':>12} | {'mejora':>6}")
+    for nombre, segundos in tiempos:
+        print(f"{nombre:<22} | {segundos:>9.3f} | {segundos / n_archivos * 1e3:>12.2f} | {t_separados / segundos:>5.1f}x")
+
+
+# === Benchmark: costo de los diagnósticos por nivel ===
+def generar_fuente_funciones(n_funciones):
+    """Código fuente con n_funciones 'int f_i(int a, int b)' y un main que llama a la última."""
+    lineas = [f"int f{i}(int a, int b) {{ int c = a + b; print(c); return c; }}" for i in range(n_funciones)]
+    lineas.append(f"main() {{ int x = f{n_funciones - 1}(1, 2); print(x); }}")
+    return "\n".join(lineas) + "\n"
+
+
+def bench_diagnosticos(n_funciones):
+    # compilar_fuente completo con stdout a os.devnull (la escritura real cuenta) en cada nivel
+    import main as compilador
+    tabla = ArbolSintactico.cargar_tabla_compilada(TABLA_CSV)
+    contenido = generar_fuente_funciones(n_funciones)
+    niveles = (("depuracion", Diagnosticos.DEPURACION), ("info", Diagnosticos.INFO),
+               ("silencioso", Diagnosticos.ADVERTENCIA))
+    nivel_anterior = Diagnosticos.nivel()
+    print(f"{n_funciones} funciones")
+    print(f"{'nivel':<10} | {'tiempo (s)':>10} | {'bytes escritos':>14}")
+    try:
+        for nombre, nivel in niveles:
+            Diagnosticos.configurar(nivel)
+            escritos = io.StringIO()
+            with contextlib.redirect_stdout(escritos):
+                compilador.compilar_fuente(contenido, tabla, compilador.ResultadoCompilacion("bench"))
+            with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+                resultado = compilador.ResultadoCompilacion("bench")
+                segundos, codigo = _medir(compilador.compilar_fuente, contenido, tabla, resultado)
+            if codigo is None:
+                print(f"Error: la entrada no compiló ({resultado.estado}): {resultado.errores[:3]}")
+                return
+            print(f"{nombre:<10} | {segundos:>10.3f} | {len(escritos.getvalue().encode()):>14}")
+    finally:
+        Diagnosticos.configurar(nivel_anterior)
+
+
+# === Benchmark: presión de registros (instrucciones ejecutadas en el simulador) ===
+def generar_fuente_presion(profundidad, tipo="int", iteraciones=100):
+    """main() con 'profundidad' variables y un while que acumula 'iteraciones' veces la
+    expresión anidada a la derecha v1 - (v2 - (... - vN)): evaluada de izquierda a derecha
+    deja un temporal vivo por nivel."""
+    valores = [i if tipo == "int" else i + 0.5 for i in range(1, profundidad + 1)]
+    lineas = ["main() {", "  int i = 0;", f"  {tipo} s = 0;"]
+    lineas.extend(f"  {tipo} v{i} = {valor};" for i, valor in enumerate(valores, start=1))
+    expresion = "".join(f"v{i} - (" for i in range(1, profundidad)) + f"v{profundidad}" + ")" * (profundidad - 1)
+    lineas.append(f"  while (i < {iteraciones}) {{ s = s + {expresion}; i = i + 1; }}")
+    lineas.extend(("  print(s);", "}"))
+    esperado = 0
+    for valor in reversed(valores):
+        esperado = valor - esperado
+    return "\n".join(lineas) + "\n", esperado * iteraciones
+
+
+class _GeneradorIzquierdaDerecha(GeneradorSPIM):
+    # Orden anterior a Sethi–Ullman: siempre el operando izquierdo primero
+    def _evaluar_derecho_primero(self, izquierdo, derecho):
+        return False
+
+
+ORDENES = (("izq-der", _GeneradorIzquierdaDerecha), ("S-U", GeneradorSPIM))
+
+
+def _compilar_spim(contenido, tabla, clase_generador=GeneradorSPIM, **opciones):
+    tokens = ArbolSintactico.ejecutar_lexer(contenido)
+    aceptado, error, arbol = ArbolSintactico.analizar_cadena(tabla, tokens, tabla.terminales, "")
+    if not aceptado:
+        raise ValueError(f"Entrada no aceptada: {error}")
+    ast = ArbolAbstracto.construir_ast(arbol)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analizador = SemanticAnalyzer(ast)
+        analizador.analyze()
+        if analizador.symbol_table.errors:
+            raise ValueError(f"Errores semánticos: {analizador.symbol_table.errors[:3]}")
+        generador = clase_generador(**opciones)
+        codigo = generador.generar(ast, analizador.symbol_table)
+    return generador, codigo
+
+
+def bench_registros(profundidades, iteraciones):
+    # Sin SPIM en el entorno: el .asm se ejecuta en SimuladorSPIM, que cuenta instrucciones.
+    # En orden izquierda a derecha la expresión deja un temporal vivo por nivel y fuerza spills
+    tabla = ArbolSintactico.cargar_tabla_compilada(TABLA_CSV)
+    print(f"while de {iteraciones} iteraciones con s = s + v1 - (v2 - (... - vN))")
+    print(f"{'tipo':<5} | {'N':>3} | {'orden':<7} | {'derramados':>10} | {'instr. asm':>10} | {'spill asm':>9} | "
+          f"{'ejecutadas':>10} | resultado")
+    for tipo in ("int", "float"):
+        for profundidad in profundidades:
+            contenido, esperado = generar_fuente_presion(profundidad, tipo, iteraciones)
+            for orden, clase in ORDENES:
+                generador, codigo = _compilar_spim(contenido, tabla, clase)
+                salida, ejecutadas = SimuladorSPIM.ejecutar(codigo)
+                obtenido = float(salida.split()[0])
+                correcto = abs(obtenido - esperado) <= 1e-4 * max(1.0, abs(esperado))
+                instrucciones = [i for i in generador.codigo_text if i.op not in (COMENTARIO, ETIQUETA)]
+                spill = sum(1 for i in instrucciones if (i.comentario or "").startswith("Spill"))
+                print(f"{tipo:<5} | {profundidad:>3} | {orden:<7} | {generador.temporales_derramados:>10} | "
+                      f"{len(instrucciones):>10} | {spill:>9} | {ejecutadas:>10} | "
+                      f"{'OK' if correcto else f'INCORRECTO ({obtenido} != {esperado})'}")
+
+
+# === Benchmark: plegado de constantes ===
+class _GeneradorSinPlegado(GeneradorSPIM):
+    def _plegar_constantes(self, ast_root):
+        pass
+
+
+FUENTE_PLEGADO = """main() {
+  int segundos = 60 * 60 * 24;
+  float cuarto = 1.0 / 4;
+  int i = 0;
+  int s = 0;
+  float x = 0.0;
+  bool b = false;
+  while (i < 100) {
+    s = s + segundos / (2 + 2) - i * 1 + 0;
+    x = x + 1.5 * 2.0 - cuarto * (3 - 2);
+    b = b || (3 > 2 && i * 0 == 0);
+    i = i + (10 - 9);
+  }
+  print(s);
+  print(x);
+  print(b);
+}
+"""
+
+def bench_plegado():
+    # La prueba diferencial y la de los inicializadores globales están en tests/test_plegado.py
+    tabla = ArbolSintactico.cargar_tabla_compilada(TABLA_CSV)
+    print(f"{'generador':<12} | {'instr. asm':>10} | {'ejecutadas':>10} | salida")
+    for nombre, clase in (("sin plegado", _GeneradorSinPlegado), ("con plegado", GeneradorSPIM)):
+        generador, codigo = _compilar_spim(FUENTE_PLEGADO, tabla, clase)
+        salida, ejecutadas = SimuladorSPIM.ejecutar(codigo)
+        instrucciones = sum(1 for i in generador.codigo_text if i.op not in (COMENTARIO, ETIQUETA))
+        print(f"{nombre:<12} | {instrucciones:>10} | {ejecutadas:>10} | {' '.join(salida.split())}")
+
+
+# === Benchmark: optimización de mirilla ===
+FUENTE_MIRILLA = """main() {
+  int i = 0;
+  int pares = 0;
+  float x = 0.5;
+  while (i < 50) {
+    x = x + 0.25;
+    if (i % 2 == 0) { pares = pares + 1; } else { }
+    if (i == 3) { print(x); }
+    i = i + 1;
+  }
+  print(pares);
+  print(x);
+}
+"""
+
+
+def bench_mirilla(ventanas):
+    # Que la salida no cambie con ninguna ventana lo prueba tests/test_mirilla.py
+    tabla = ArbolSintactico.cargar_tabla_compilada(TABLA_CSV)
+    with open(CODIGO, encoding="utf-8") as archivo:
+        programas = [("codigo.txt", archivo.read()), ("FUENTE_MIRILLA", FUENTE_MIRILLA),
+                     ("FUENTE_PLEGADO", FUENTE_PLEGADO)]
+    programas.extend((f"presión {tipo} 16", generar_fuente_presion(16, tipo)[0]) for tipo in ("int", "float"))
+    abreviaturas = {nombre: "".join(p[0] for p in nombre.split("_")) for nombre in REGLAS_MIRILLA}
+    print("Reglas: " + ", ".join(f"{abreviatura} = {nombre}" for nombre, abreviatura in abreviaturas.items()))
+    print(f"{'programa':<16} | {'ventana':>7} | {'eliminadas por regla':<26} | {'instr. asm':>10} | "
+          f"{'ejecutadas':>10}")
+    for nombre, contenido in programas:
+        generador, codigo = _compilar_spim(contenido, tabla, reglas_mirilla=())
+        base = sum(1 for i in generador.codigo_text if i.op not in (COMENTARIO, ETIQUETA))
+        ejecutadas = SimuladorSPIM.ejecutar(codigo)[1]
+        print(f"{nombre:<16} | {'-':>7} | {'sin mirilla':<26} | {base:>10} | {ejecutadas:>10}")
+        for ventana in ventanas:
+            generador, codigo = _compilar_spim(contenido, tabla, ventana_mirilla=ventana)
+            ejecutadas = SimuladorSPIM.ejecutar(codigo)[1]
+            instrucciones = sum(1 for i in generador.codigo_text if i.op not in (COMENTARIO, ETIQUETA))
+            eliminadas = " ".join(f"{abreviaturas[r]}={n}" for r, n in generador.eliminadas_mirilla.items())
+            print(f"{'':<16} | {ventana:>7} | {eliminadas:<26} | {instrucciones:>10} | {ejecutadas:>10}")
+    # Costo de la pasada sobre un cuerpo grande, ya con registros asignados
+    generador, _ = _compilar_spim(generar_fuente_main(20000), tabla, reglas_mirilla=())
+    for ventana in ventanas:
+        copia = [Instruccion(i.op, i.operandos, i.comentario) for i in generador.codigo_text]
+        segundos, (_, eliminadas) = _medir(optimizar_mirilla, copia, ventana)
+        print(f"main de 20000 instrucciones, ventana {ventana}: {len(copia)} líneas, "
+              f"{sum(eliminadas.values())} eliminadas en {segundos * 1000:.1f} ms")
+
+
+# === Benchmark: búsqueda en la tabla de símbolos ===
+def generar_ast_funciones(n_funciones):
+    """AST con n_funciones 'int f_i(int a, int b)', cada una con una global propia, y un main
+    que llama a la última. Cada función usa sus parámetros, un local, su global y llama a f_{i-1}."""
+    decls = []
+    for i in range(n_funciones):
+        linea = i * 2 + 1
+        decls.append(VarDecl(f"g{i}", 'int', Literal(i, 'int', linea), linea))
+        linea += 1
+        cuerpo = [VarDecl('c', 'int', BinOp('PLUS', Var('a', linea), Var('b', linea), linea, linea), linea),
+                  Assign('c', BinOp('PLUS', Var('c', linea), Var(f"g{i}", linea), linea, linea), linea)]
+        if i > 0:
+            cuerpo.append(Assign('c', Call(f"f{i - 1}", [Var('c', linea), Var('a', linea)], linea), linea))
+        cuerpo.extend((Print(Var('c', linea), linea), Return(Var('c', linea), linea)))
+        decls.append(FuncDef(f"f{i}", 'int', [Param('a', 'int', linea), Param('b', 'int', linea)], cuerpo, linea))
+    linea = n_funciones * 2 + 1
+    decls.append(FuncDef('main', 'void', [], [
+        VarDecl('x', 'int', Call(f"f{n_funciones - 1}", [Literal(1, 'int', linea), Literal(2, 'int', linea)], linea), linea),
+        Print(Var('x', linea), linea)], linea, es_main=True))
+    return Program(decls)
+
+
+class _TablaLineal(SymbolTable):
+    # Búsqueda anterior (referencia): recorre la lista de ámbitos y luego la pila
+    def lookup_symbol(self, name, current_scope_name_for_locals_then_global=None):
+        if current_scope_name_for_locals_then_global:
+            for scope_data in self.all_created_scopes_data:
+                if scope_data['name'] == current_scope_name_for_locals_then_global:
+                    if name in scope_data['symbols']:
+                        return scope_data['symbols'][name]
+                    break
+        for scope_data in reversed(self.scope_stack):
+            if name in scope_data['symbols']:
+                return scope_data['symbols'][name]
+        return None
+
+
+def bench_simbolos(funciones_lista):
+    def _compilar(ast, clase_tabla):
+        with contextlib.redirect_stdout(io.StringIO()):
+            analizador = SemanticAnalyzer(ast)
+            tabla = analizador.symbol_table = clase_tabla()
+            t0 = time.perf_counter()
+            analizador.analyze()
+            t1 = time.perf_counter()
+            consultas = []
+            buscar = tabla.lookup_symbol
+            tabla.lookup_symbol = lambda *args: consultas.append(args) or buscar(*args)
+            codigo = GeneradorSPIM().generar(ast, tabla)
+            t2 = time.perf_counter()
+        if tabla.errors:
+            raise ValueError(tabla.errors[0])
+        return t1 - t0, t2 - t1, len(consultas), codigo, tabla
+
+    print(f"{'funciones':>9} | {'semántica (ms)':>14} | {'semántica, búsqueda lineal (ms)':>31} | "
+          f"{'código (ms)':>11} | {'consultas del generador':>23}")
+    tamanos_ser = []
+    for n in funciones_lista:
+        ast = generar_ast_funciones(n)
+        gc.collect()
+        t_sem, t_gen, consultas, codigo, tabla = _compilar(ast, SymbolTable)
+        gc.collect()
+        t_sem_ref, _, _, codigo_ref, _ = _compilar(ast, _TablaLineal)
+        if codigo != codigo_ref:
+            print("Error: la búsqueda indexada genera un código distinto al de referencia")
+            return
+        t_ser, serializada = _medir(tabla.serialize)
+        tamanos_ser.append((n, len(serializada.encode("utf-8")), t_ser))
+        print(f"{n:>9} | {t_sem * 1e3:>14.1f} | {t_sem_ref * 1e3:>31.1f} | {t_gen * 1e3:>11.1f} | {consultas:>23}")
+    print()
+    for n, tamano, t_ser in tamanos_ser:
+        print(f"Tabla serializada con {n} funciones: {tamano / 1024:.1f} KiB en {t_ser * 1e3:.1f} ms")
+
+
+# === Prueba de estrés: profundidad de los recorridos ===
+def bench_profundidad(n_instrucciones, n_terminos):
+    """Mide (sin escribir archivos) la compilación de un cuerpo de n_instrucciones y de una
+    expresión de n_terminos con el límite de recursión por defecto. La prueba de que
+    ninguna fase recurre está en tests/test_profundidad.py."""
+    from graphviz import Digraph
+
+    tabla = ArbolSintactico.cargar_tabla_compilada(TABLA_CSV)
+    print(f"Límite de recursión: {sys.getrecursionlimit()}")
+    casos = ((f"{n_instrucciones} instrucciones", generar_tokens_cuerpo(n_instrucciones)),
+             (f"expresión de {n_terminos} términos", generar_tokens_cuerpo(1, n_terminos)))
+    for nombre, tokens in casos:
+        fase = "sintáctica"
+        try:
+            t0 = time.perf_counter()
+            aceptado, error, arbol = ArbolSintactico.analizar_cadena(tabla, tokens, tabla.terminales, "")
+            if not aceptado:
+                print(f"{nombre:<32} ERROR: entrada no aceptada: {error}")
+                continue
+            fase = "dot"
+            arbol.to_dot(Digraph(), tabla.terminales)
+            fase = "AST"
+            ast = ArbolAbstracto.construir_ast(arbol)
+            fase = "semántica"
+            with contextlib.redirect_stdout(io.StringIO()):
+                analizador = SemanticAnalyzer(ast)
+                analizador.analyze()
+            if analizador.symbol_table.errors:
+                print(f"{nombre:<32} ERROR: {analizador.symbol_table.errors[0]}")
+                continue
+            fase = "código"
+            with contextlib.redirect_stdout(io.StringIO()):
+                codigo = GeneradorSPIM().generar(ast, analizador.symbol_table)
+            fase = "liberación"
+            del arbol, ast
+            print(f"{nombre:<32} OK  {time.perf_counter() - t0:7.2f} s  ({codigo.count(chr(10)) + 1} líneas de asm)")
+        except RecursionError:
+            print(f"{nombre:<32} RecursionError en la fase {fase}")
+
+
+# === Benchmark: FIRST/FOLLOW/PREDICT sobre gramáticas agrandadas ===
+def agrandar_gramatica(producciones, copias):
+    """Replica la gramática 'copias' veces renombrando los no terminales (X -> X__k) y
+    enlaza cada copia con la siguiente para que los conjuntos se propaguen entre ellas.
+    Las copias se emiten en orden inverso, el peor caso para un recorrido de punto fijo."""
+    no_terminales = {lhs for lhs, _ in producciones}
+    inicio = producciones[0][0]
+    resultado = [("inicio", [f"{inicio}__0"])]
+    for k in reversed(range(copias)):
+        for lhs, cuerpo in producciones:
+            resultado.append((f"{lhs}__{k}", [f"{s}__{k}" if s in no_terminales else s for s in cuerpo]))
+        if k + 1 < copias:
+            resultado.append((f"exp_opt__{k}", [f"{inicio}__{k + 1}"]))
+    return resultado
+
+
+def _first_punto_fijo(producciones, no_terminales):
+    # Algoritmo anterior de crearTabla (referencia): recorre todas las producciones hasta que nada cambie
+    first = defaultdict(set)
+    cambio = True
+    while cambio:
+        cambio = False
+        for nt, cuerpo in producciones:
+            antes = len(first[nt])
+            elementos = cuerpo[:]
+            while elementos:
+                simbolo = elementos.pop(0)
+                if simbolo not in no_terminales:
+                    first[nt].add(simbolo)
+                    break
+                else:
+                    first[nt] |= first[simbolo]
+                    if 'ε' not in first[simbolo]:
+                        break
+                    if not elementos:
+                        first[nt].add('ε')
+            if len(first[nt]) > antes:
+                cambio = True
+    return first
+
+
+def _follow_punto_fijo(producciones, no_terminales, first):
+    # Algoritmo anterior de crearTabla (referencia)
+    follow = defaultdict(set)
+    follow[producciones[0][0]].add('$')
+    cambio = True
+    while cambio:
+        cambio = False
+        for lhs, cuerpo in producciones:
+            for i in range(len(cuerpo)):
+                simbolo = cuerpo[i]
+                if simbolo in no_terminales:
+                    siguientes = cuerpo[i+1:]
+                    temp_set = set()
+                    if siguientes:
+                        j = 0
+                        while j < len(siguientes):
+                            sig_simbolo = siguientes[j]
+                            if sig_simbolo in no_terminales:
+                                temp_set.update(first[sig_simbolo] - {'ε'})
+                            else:
+                                temp_set.add(sig_simbolo)
+                                break
+                            if 'ε' not in first[sig_simbolo]:
+                                break
+                            j += 1
+                        if j == len(siguientes):
+                            temp_set.update(follow[lhs])
+                    else:
+                        temp_set.update(follow[lhs])
+                    antes = len(follow[simbolo])
+                    follow[simbolo].update(temp_set)
+                    if len(follow[simbolo]) > antes:
+                        cambio = True
+    return follow
+
+
+def bench_gramatica(copias_lista, con_referencia):
+    base = crearTabla.leer_gramatica(GRAMATICA)
+    encabezado = f"{'copias':>7} | {'producciones':>12} | {'FIRST+FOLLOW (ms)':>17} | {'PREDICT+tabla (ms)':>18}"
+    if con_referencia:
+        encabezado += f" | {'punto fijo (ms)':>15}"
+    print(encabezado)
+    for copias in copias_lista:
+        producciones = agrandar_gramatica(base, copias)
+        no_terminales, terminales = crearTabla.clasificar_simbolos(producciones)
+        t_conjuntos, (first, follow) = _medir(lambda: (
+            lambda f: (f, crearTabla.calcular_follow(producciones, no_terminales, f))
+        )(crearTabla.calcular_first(producciones, no_terminales)))
+        t_tabla, _ = _medir(lambda: crearTabla.construir_tabla(
+            producciones, crearTabla.calcular_predict(producciones, first, follow), no_terminales, terminales))
+        fila = f"{copias:>7} | {len(producciones):>12} | {t_conjuntos * 1e3:>17.2f} | {t_tabla * 1e3:>18.2f}"
+        if con_referencia:
+            nts = set(no_terminales)
+            t_ref, _ = _medir(lambda: _follow_punto_fijo(producciones, nts, _first_punto_fijo(producciones, nts)))
+            fila += f" | {t_ref * 1e3:>15.2f}"
+        print(fila)
+
+
+# === Benchmark: carga de la tabla sintáctica ===
+def bench_tabla(repeticiones):
+    def _mejor(funcion):
+        mejor = float("inf")
+        for _ in range(repeticiones):
+            ArbolSintactico._tablas_compiladas.clear() # Forzar la carga, sin la memo del proceso
+            segundos, _ = _medir(funcion)
+            mejor = min(mejor, segundos)
+        return mejor
+
+    with open(CODIGO, encoding="utf-8") as f:
+        contenido = f.read()
+    with tempfile.TemporaryDirectory() as dir_cache:
+        ArbolSintactico.cargar_tabla_compilada(TABLA_CSV, GRAMATICA, dir_cache) # Llenar la caché
+        tiempos = [
+            ("CSV + compilar", _mejor(lambda: ArbolSintactico.cargar_tabla_compilada(TABLA_CSV))),
+            ("caché en disco", _mejor(lambda: ArbolSintactico.cargar_tabla_compilada(TABLA_CSV, GRAMATICA, dir_cache))),
+            ("lexer codigo.txt", _mejor(lambda: ArbolSintactico.ejecutar_lexer(contenido))),
+        ]
+    for nombre, segundos in tiempos:
+        print(f"{nombre:<18} {segundos * 1e3:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del compilador")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    p_parser = sub.add_parser("parser", help="Escalamiento del driver LL(1)")
+    p_parser.add_argument("--tamanos", type=int, nargs="+",
+                          default=[1000, 10000, 100000, 1000000])
+
+    p_tabla = sub.add_parser("tabla", help="Carga de la tabla: CSV vs caché en disco")
+    p_tabla.add_argument("--repeticiones", type=int, default=20)
+
+    p_gram = sub.add_parser("gramatica", help="FIRST/FOLLOW/PREDICT sobre gramáticas agrandadas")
+    p_gram.add_argument("--copias", type=int, nargs="+", default=[1, 10, 50, 100])
+    p_gram.add_argument("--sin-referencia", action="store_true",
+                        help="No medir el algoritmo anterior de punto fijo")
+
+    p_mem = sub.add_parser("memoria", help="Memoria retenida por el árbol sintáctico")
+    p_mem.add_argument("--tamanos", type=int, nargs="+", default=[1000, 100000])
+
+    p_vis = sub.add_parser("visitas", help="Visitas por segundo de los visitantes del AST")
+    p_vis.add_argument("--instrucciones", type=int, default=20000)
+    p_vis.add_argument("--repeticiones", type=int, default=5)
+
+    p_prof = sub.add_parser("profundidad", help="Prueba de estrés: cuerpos y expresiones muy largos")
+    p_prof.add_argument("--instrucciones", type=int, default=100000)
+    p_prof.add_argument("--terminos", type=int, default=100000)
+
+    p_sim = sub.add_parser("simbolos", help="Búsqueda en la tabla de símbolos con miles de funciones")
+    p_sim.add_argument("--funciones", type=int, nargs="+", default=[500, 2000, 5000])
+
+    p_lex = sub.add_parser("lexer", help="Lexer PLY vs. lexer rápido: prueba diferencial y tiempos")
+    p_lex.add_argument("--instrucciones", type=int, nargs="+", default=[1000, 100000])
+
+    p_flujo = sub.add_parser("flujo", help="Memoria de la entrada: lista de tokens vs. FlujoTokens")
+    p_flujo.add_argument("--instrucciones", type=int, nargs="+", default=[1000, 100000])
+
+    p_arr = sub.add_parser("arranque", help="Import del lexer + primer token, con y sin lextab en caché")
+    p_arr.add_argument("--repeticiones", type=int, default=20)
+
+    p_lote = sub.add_parser("lote", help="main.py en modo lote vs. un proceso por archivo")
+    p_lote.add_argument("--archivos", type=int, default=50)
+    p_lote.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4])
+    p_lote.add_argument("--instrucciones", type=int, help="Archivos sintéticos de N instrucciones en vez de codigo.txt")
+
+    p_diag = sub.add_parser("diagnosticos", help="Compilación completa con cada nivel de diagnósticos")
+    p_diag.add_argument("--funciones", type=int, default=20000)
+
+    p_reg = sub.add_parser("registros", help="Presión de registros: spills e instrucciones ejecutadas")
+    p_reg.add_argument("--profundidades", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    p_reg.add_argument("--iteraciones", type=int, default=100)
+
+    sub.add_parser("plegado", help="Plegado de constantes: instrucciones del .asm y ejecutadas")
+
+    p_mir = sub.add_parser("mirilla", help="Optimización de mirilla: eliminadas por regla y por ventana")
+    p_mir.add_argument("--ventanas", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+
+    args = parser.parse_args()
+    if args.benchmark == "parser":
+        bench_parser(args.tamanos)
+    elif args.benchmark == "tabla":
+        bench_tabla(args.repeticiones)
+    elif args.benchmark == "gramatica":
+        bench_gramatica(args.copias, not args.sin_referencia)
+    elif args.benchmark == "memoria":
+        bench_memoria(args.tamanos)
+    elif args.benchmark == "visitas":
+        bench_visitas(args.instrucciones, args.repeticiones)
+    elif args.benchmark == "profundidad":
+        bench_profundidad(args.instrucciones, args.terminos)
+    elif args.benchmark == "simbolos":
+        bench_simbolos(args.funciones)
+    elif args.benchmark == "lexer":
+        bench_lexer(args.instrucciones)
+    elif args.benchmark == "flujo":
+        bench_flujo(args.instrucciones)
+    elif args.benchmark == "arranque":
+        bench_arranque(args.repeticiones)
+    elif args.benchmark == "lote":
+        bench_lote(args.archivos, args.jobs, args.instrucciones)
+    elif args.benchmark == "diagnosticos":
+        bench_diagnosticos(args.funciones)
+    elif args.benchmark == "registros":
+        bench_registros(args.profundidades, args.iteraciones)
+    elif args.benchmark == "plegado":
+        bench_plegado()
+    elif args.benchmark == "mirilla":
+        bench_mirilla(args.ventanas)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
+import argparse
 import csv
-from collections import defaultdict
+import os
+import sys
+import time
+from collections import defaultdict, deque
 from AnalizadorLexico import tokens  # Importamos los tokens definidos en lexer.py
 
 # Función para leer la gramática desde un archivo
 def leer_gramatica(archivo):
     producciones = []
-    with open(archivo, 'r') as f:
+    with open(archivo, 'r', encoding='utf-8') as f:
         for linea in f:
             linea = linea.strip()
             if not linea:
@@ -19,106 +23,149 @@ def leer_gramatica(archivo):
                 producciones.append((lhs, cuerpo.split()))
     return producciones
 
-# Calcular First
+# Los conjuntos se calculan con listas de trabajo sobre grafos de dependencias: cada
+# no terminal se reprocesa solo cuando crece un conjunto del que depende, en lugar de
+# recorrer todas las producciones hasta que nada cambie.
+
+# Calcular no terminales anulables (derivan ε)
+def calcular_anulables(producciones, no_terminales):
+    no_terminales = set(no_terminales)
+    anulables = set()
+    pendientes = []            # símbolos aún no anulables de cada producción
+    usos = defaultdict(list)   # no terminal -> producciones donde aparece (una vez por ocurrencia)
+    trabajo = deque()
+    for i, (lhs, cuerpo) in enumerate(producciones):
+        simbolos = [s for s in cuerpo if s != 'ε']
+        if any(s not in no_terminales for s in simbolos):
+            pendientes.append(-1) # Tiene un terminal: nunca deriva ε
+            continue
+        pendientes.append(len(simbolos))
+        for s in simbolos:
+            usos[s].append(i)
+        if not simbolos:
+            trabajo.append(lhs)
+
+    while trabajo:
+        nt = trabajo.popleft()
+        if nt in anulables:
+            continue
+        anulables.add(nt)
+        for i in usos[nt]:
+            pendientes[i] -= 1
+            if pendientes[i] == 0:
+                trabajo.append(producciones[i][0])
+    return anulables
+
+# Propaga conjuntos por las aristas origen -> destino (destino ⊇ origen) hasta estabilizar
+def _propagar(conjuntos, aristas):
+    trabajo = deque(nt for nt in list(conjuntos) if conjuntos[nt] and aristas.get(nt))
+    en_trabajo = set(trabajo)
+    while trabajo:
+        origen = trabajo.popleft()
+        en_trabajo.discard(origen)
+        for destino in aristas[origen]:
+            nuevos = conjuntos[origen] - conjuntos[destino]
+            if nuevos:
+                conjuntos[destino] |= nuevos
+                if destino not in en_trabajo and aristas.get(destino):
+                    trabajo.append(destino)
+                    en_trabajo.add(destino)
+
+# Calcular First (incluye 'ε' para los no terminales anulables)
 def calcular_first(producciones, no_terminales):
+    no_terminales = set(no_terminales)
+    anulables = calcular_anulables(producciones, no_terminales)
     first = defaultdict(set)
+    aristas = defaultdict(set) # B -> A si First(A) ⊇ First(B)
 
-    cambio = True
-    while cambio:
-        cambio = False
-        for nt, cuerpo in producciones:
-            antes = len(first[nt])
-            elementos = cuerpo[:]
-            while elementos:
-                simbolo = elementos.pop(0)
-                if simbolo not in no_terminales:
-                    first[nt].add(simbolo)
-                    break
-                else:
-                    first[nt] |= first[simbolo]
-                    if 'ε' not in first[simbolo]:
-                        break
-                    if not elementos:  # Si todos pueden ser ε
-                        first[nt].add('ε')
-            if len(first[nt]) > antes:
-                cambio = True
+    for lhs, cuerpo in producciones:
+        first[lhs] # Todo no terminal con producciones tiene entrada
+        for simbolo in cuerpo:
+            if simbolo == 'ε':
+                continue
+            if simbolo not in no_terminales:
+                first[lhs].add(simbolo)
+                break
+            if simbolo != lhs:
+                aristas[simbolo].add(lhs)
+            if simbolo not in anulables:
+                break
+
+    _propagar(first, aristas)
+    for nt in anulables:
+        first[nt].add('ε')
     return first
 
+# First de una secuencia de símbolos: (terminales, si toda la secuencia puede ser ε)
+def first_de_secuencia(secuencia, first):
+    conjunto = set()
+    for simbolo in secuencia:
+        if simbolo == 'ε':
+            continue
+        if simbolo in first:
+            conjunto |= first[simbolo]
+            conjunto.discard('ε')
+            if 'ε' not in first[simbolo]:
+                return conjunto, False
+        else:
+            conjunto.add(simbolo)
+            return conjunto, False
+    return conjunto, True
+
 # Calcular Follow
 def calcular_follow(producciones, no_terminales, first):
+    no_terminales = set(no_terminales)
     follow = defaultdict(set)
     # Añadimos el símbolo de fin de cadena al primer no terminal
     follow[producciones[0][0]].add('$')
+    aristas = defaultdict(set) # A -> B si Follow(B) ⊇ Follow(A)
 
-    cambio = True
-    while cambio:
-        cambio = False
-        for lhs, cuerpo in producciones:
-            for i in range(len(cuerpo)):
-                simbolo = cuerpo[i]
-                if simbolo in no_terminales:
-                    siguientes = cuerpo[i+1:]
-                    temp_set = set()
-                    if siguientes:
-                        j = 0
-                        while j < len(siguientes):
-                            sig_simbolo = siguientes[j]
-                            if sig_simbolo in no_terminales:
-                                temp_set.update(first[sig_simbolo] - {'ε'})
-                            else:
-                                temp_set.add(sig_simbolo)
-                                break
-                            if 'ε' not in first[sig_simbolo]:
-                                break
-                            j += 1
-                        if j == len(siguientes):  # Todos pueden ser ε
-                            temp_set.update(follow[lhs])
-                    else:
-                        temp_set.update(follow[lhs])
-
-                    antes = len(follow[simbolo])
-                    follow[simbolo].update(temp_set)
-                    if len(follow[simbolo]) > antes:
-                        cambio = True
+    for lhs, cuerpo in producciones:
+        # Recorrido de derecha a izquierda acumulando First del sufijo
+        sufijo = set()
+        sufijo_anulable = True
+        for simbolo in reversed(cuerpo):
+            if simbolo == 'ε':
+                continue
+            if simbolo in no_terminales:
+                follow[simbolo] |= sufijo
+                if sufijo_anulable and simbolo != lhs:
+                    aristas[lhs].add(simbolo)
+                if 'ε' in first[simbolo]:
+                    sufijo = sufijo | (first[simbolo] - {'ε'})
+                else:
+                    sufijo = first[simbolo] - {'ε'}
+                    sufijo_anulable = False
+            else:
+                sufijo = {simbolo}
+                sufijo_anulable = False
+
+    _propagar(follow, aristas)
     return follow
 
-# Calcular Predict
-def calcular_predict(producciones, first):
+# Calcular Predict: First(cuerpo), más Follow(lhs) si el cuerpo puede derivar ε
+def calcular_predict(producciones, first, follow):
     predict = defaultdict(list)
     for lhs, cuerpo in producciones:
-        conjunto = set()
-        elementos = cuerpo[:]
-        while elementos:
-            simbolo = elementos.pop(0)
-            if simbolo in first:
-                conjunto.update(first[simbolo])
-                if 'ε' not in first[simbolo]:
-                    break
-            else:
-                conjunto.add(simbolo)
-                break
-        if not conjunto or (len(conjunto) == 1 and 'ε' in conjunto):
-            conjunto = set(follow[lhs])
+        conjunto, anulable = first_de_secuencia(cuerpo, first)
+        if anulable:
+            conjunto |= follow[lhs]
         for t in conjunto:
             predict[(lhs, t)].append((lhs, cuerpo))
     return predict
 
 # Construir tabla sintáctica LL(1)
+# Si una celda tiene varias producciones se reporta el conflicto y se conserva la
+# primera en el orden de la gramática (la tabla sigue siendo utilizable).
 def construir_tabla(producciones, predict, no_terminales, terminales):
     tabla = defaultdict(dict)
     conflictos = []
 
     for (nt, t), prods in predict.items():
         if len(prods) > 1:
-            conflictos.append(f"Conflicto en [{nt}, {t}]: múltiples producciones")
-        elif len(prods) == 1:
-            prod = prods[0]
-            cuerpo = " ".join(prod[1])
-            if t in tabla[nt]:
-                conflictos.append(f"Conflicto en [{nt}, {t}]: ya existe una producción")
-            tabla[nt][t] = cuerpo
-        else:
-            tabla[nt][t] = ""
+            alternativas = " | ".join(" ".join(cuerpo) for _, cuerpo in prods)
+            conflictos.append(f"Conflicto en [{nt}, {t}]: múltiples producciones ({alternativas})")
+        tabla[nt][t] = " ".join(prods[0][1])
     
     # Rellenar celdas vacías
     for nt in no_terminales:
@@ -146,7 +193,7 @@ def mostrar_tabla(tabla, terminales, no_terminales):
 # Guardar tabla en CSV
 def guardar_csv(tabla, terminales, no_terminales, archivo='tabla_sintactica.csv'):
     with open(archivo, mode='w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f, delimiter=';')  # <- Aquí se especifica el delimitador
+        writer = csv.writer(f, delimiter=';', lineterminator='\n')  # <- Aquí se especifica el delimitador
         writer.writerow([''] + terminales)
         for nt in no_terminales:
             fila = [nt]
@@ -156,44 +203,138 @@ def guardar_csv(tabla, terminales, no_terminales, archivo='tabla_sintactica.csv'
     print(f"[+] Tabla guardada en '{archivo}'")
 
 
-# Programa principal
-if __name__ == "__main__":
-    archivo_gramatica = "gramatica.txt" # Hardcoded path
-    print(f"Usando archivo de gramática: {archivo_gramatica}")
-    producciones = leer_gramatica(archivo_gramatica)
+# Clasificar símbolos de la gramática: no terminales son los que tienen producciones
+# (en orden de aparición); el resto, salvo ε, son terminales (ordenados, con '$').
+def clasificar_simbolos(producciones):
+    no_terminales = list(dict.fromkeys(lhs for lhs, _ in producciones))
+    conocidos = set(no_terminales)
+    terminales = {s for _, cuerpo in producciones for s in cuerpo if s != 'ε' and s not in conocidos}
+    return no_terminales, sorted(terminales | {'$'})
 
-    # Obtener no terminales y terminales
-    no_terminales = set()
-    terminales = set()
-    for lhs, cuerpo in producciones:
-        no_terminales.add(lhs)
-        for s in cuerpo:
-            if s == 'ε':
-                continue
-            elif s in tokens or s in ['+', '-', '*', '/', '(', ')', ';', '=', '<', '>']:
-                terminales.add(s)
-            elif s.isupper() or s in no_terminales:
-                no_terminales.add(s)
-            else:
-                terminales.add(s)
 
-    # Convertir a listas ordenadas
-    no_terminales = sorted(no_terminales)
-    terminales = sorted(set(terminales) | {'$'})
+class TablaGenerada:
+    """Resultado de generar_tabla: conjuntos, tabla LL(1), conflictos y tiempos por fase (s)."""
+    def __init__(self, producciones):
+        self.producciones = producciones
+        self.raiz = producciones[0][0] if producciones else None
+        self.no_terminales = []
+        self.terminales = []
+        self.first = {}
+        self.follow = {}
+        self.predict = {}
+        self.tabla = {}
+        self.conflictos = []
+        self.simbolos_no_definidos = [] # Terminales que el lexer no produce (posibles errores de escritura)
+        self.tiempos = {}
 
-    # Calcular conjuntos
-    first = calcular_first(producciones, no_terminales)
-    follow = calcular_follow(producciones, no_terminales, first)
-    predict = calcular_predict(producciones, first)
-    tabla, conflictos = construir_tabla(producciones, predict, no_terminales, terminales)
+    def es_ll1(self):
+        return not self.conflictos
 
-    # Mostrar resultados
-    mostrar_tabla(tabla, terminales, no_terminales)
-    guardar_csv(tabla, terminales, no_terminales)
+    def reporte(self):
+        lineas = []
+        if self.conflictos:
+            lineas.append("[!] La gramática NO es LL(1). Se encontraron conflictos:")
+            lineas.extend(f"   - {msg}" for msg in self.conflictos)
+        else:
+            lineas.append("[✓] La gramática es LL(1). No se encontraron conflictos.")
+        if self.simbolos_no_definidos:
+            lineas.append("[!] Símbolos sin producciones que el lexer no reconoce: " + ", ".join(self.simbolos_no_definidos))
+        return "\n".join(lineas)
+
+    def reporte_tiempos(self):
+        return ", ".join(f"{fase}={segundos * 1e3:.2f} ms" for fase, segundos in self.tiempos.items())
+
+    def guardar_csv(self, archivo='tabla_sintactica.csv'):
+        guardar_csv(self.tabla, self.terminales, sorted(self.no_terminales), archivo)
+
+
+# Generar la tabla completa sin efectos secundarios (no imprime ni escribe archivos).
+# 'gramatica' puede ser la ruta de gramatica.txt o una lista de producciones ya leída.
+def generar_tabla(gramatica):
+    tiempos = {}
+
+    def fase(nombre, funcion, *args):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        tiempos[nombre] = time.perf_counter() - inicio
+        return resultado
+
+    if isinstance(gramatica, (str, os.PathLike)):
+        producciones = fase("lectura", leer_gramatica, gramatica)
+    else:
+        producciones = list(gramatica)
+    if not producciones:
+        raise ValueError("La gramática no tiene producciones.")
+
+    resultado = TablaGenerada(producciones)
+    resultado.tiempos = tiempos
+    no_terminales, terminales = fase("clasificacion", clasificar_simbolos, producciones)
+    resultado.no_terminales = no_terminales
+    resultado.terminales = terminales
+    resultado.simbolos_no_definidos = [t for t in terminales if t != '$' and t not in tokens]
+
+    resultado.first = fase("first", calcular_first, producciones, no_terminales)
+    resultado.follow = fase("follow", calcular_follow, producciones, no_terminales, resultado.first)
+    resultado.predict = fase("predict", calcular_predict, producciones, resultado.first, resultado.follow)
+    resultado.tabla, resultado.conflictos = fase(
+        "tabla", construir_tabla, producciones, resultado.predict, no_terminales, terminales)
+    return resultado
 
-    if conflictos:
-        print("\n[!] La gramática NO es LL(1). Se encontraron conflictos:")
-        for msg in conflictos:
+# Construir la tabla en memoria, sin pasar por el CSV
+def construir_tabla_desde_gramatica(producciones):
+    generada = generar_tabla(producciones)
+    return generada.tabla, generada.terminales, generada.no_terminales, generada.conflictos
+
+
+# Comparar la tabla generada con un CSV existente (regresión de la gramática)
+def diferencias_con_csv(generada, ruta_csv):
+    diferencias = []
+    with open(ruta_csv, newline='', encoding='utf-8') as f:
+        lector = csv.reader(f, delimiter=';')
+        terminales_csv = next(lector)[1:]
+        tabla_csv = {fila[0]: dict(zip(terminales_csv, (c.strip() for c in fila[1:]))) for fila in lector if fila}
+
+    if terminales_csv != generada.terminales:
+        diferencias.append(f"Columnas distintas: CSV {terminales_csv} vs gramática {generada.terminales}")
+    for nt in sorted(set(tabla_csv) | set(generada.no_terminales)):
+        if nt not in tabla_csv or nt not in generada.tabla:
+            diferencias.append(f"No terminal '{nt}' solo en {'la gramática' if nt not in tabla_csv else 'el CSV'}")
+            continue
+        for t in generada.terminales:
+            esperado = generada.tabla[nt].get(t, "")
+            actual = tabla_csv[nt].get(t, "")
+            if esperado != actual:
+                diferencias.append(f"[{nt}, {t}]: CSV '{actual}' vs gramática '{esperado}'")
+    return diferencias
+
+
+# Programa principal
+if __name__ == "__main__":
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Genera la tabla sintáctica LL(1) desde la gramática")
+    parser.add_argument("gramatica", nargs="?", default=os.path.join(base_dir, "gramatica.txt"))
+    parser.add_argument("--csv", default=os.path.join(base_dir, "tabla_sintactica.csv"),
+                        help="CSV a escribir (o a comparar con --verificar)")
+    parser.add_argument("--verificar", action="store_true",
+                        help="No escribir: comparar con el CSV y terminar con error si difiere o hay conflictos")
+    parser.add_argument("--sin-mostrar", action="store_true", help="No imprimir la tabla en consola")
+    args = parser.parse_args()
+
+    print(f"Usando archivo de gramática: {args.gramatica}")
+    generada = generar_tabla(args.gramatica)
+
+    # Mostrar resultados
+    if not args.sin_mostrar:
+        mostrar_tabla(generada.tabla, generada.terminales, sorted(generada.no_terminales))
+    if args.verificar:
+        diferencias = diferencias_con_csv(generada, args.csv)
+        for msg in diferencias:
             print("   -", msg)
+        print(f"\n{'[!]' if diferencias else '[✓]'} {len(diferencias)} diferencias con '{args.csv}'")
     else:
-        print("\n[✓] La gramática es LL(1). No se encontraron conflictos.")
\ No newline at end of file
+        generada.guardar_csv(args.csv)
+
+    print("\n" + generada.reporte())
+    print(f"Tiempos: {generada.reporte_tiempos()}")
+    if args.verificar and (diferencias or not generada.es_ll1()):
+        sys.exit(1)
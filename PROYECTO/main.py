@@ -1,137 +1,391 @@
+import argparse
+import contextlib
+import io
+import itertools
 import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 import AnalizadorLexico
 import ArbolSintactico
+import ArbolAbstracto
+import Diagnosticos
 from AnalizadorSintactico import SemanticAnalyzer
 from GeneradorSPIM import GeneradorSPIM # Importar el generador
 
-def run_compiler():
+_log = Diagnosticos.obtener("main")
+
+def run_compiler(traza=False, traza_ultimos=None, tabla_desde_gramatica=False, lexer="ply"):
     base_dir = os.path.dirname(__file__)
     output_dir = os.path.join(base_dir, "salida")
     os.makedirs(output_dir, exist_ok=True) # Asegurar que el directorio de salida exista
 
     codigo_file = os.path.join(base_dir, "codigo.txt")
     tabla_sintactica_file = os.path.join(base_dir, "tabla_sintactica.csv")
+    gramatica_file = os.path.join(base_dir, "gramatica.txt")
+    cache_dir = os.path.join(base_dir, ".cache")
     ast_output_file = os.path.join(base_dir, "arbol_sintactico", "arbol_from_main_py")
 
-    print("--- 1. Iniciando Compilador ---")
+    _log.info("--- 1. Iniciando Compilador ---")
 
     # 1. Leer contenido del archivo de entrada
-    print(f"Leyendo código desde: {codigo_file}")
+    _log.info("Leyendo código desde: %s", codigo_file)
     try:
         with open(codigo_file, "r", encoding="utf-8") as f:
             contenido = f.read()
-        print("--- Código Fuente ---")
-        print(contenido)
-        print("--------------------")
+        _log.debug("--- Código Fuente ---\n%s\n--------------------", contenido)
     except FileNotFoundError:
-        print(f"Error: El archivo de código '{codigo_file}' no fue encontrado.")
+        _log.error("Error: El archivo de código '%s' no fue encontrado.", codigo_file)
         return
 
     # 2. Análisis Léxico - REVISAR Lexer.  . 
-    print("\n--- 2. Fase Léxica ---")
+    _log.info("\n--- 2. Fase Léxica ---")
 
-    tokens = ArbolSintactico.ejecutar_lexer(contenido)
+    # Sin traza, los tokens de PLY se generan a demanda mientras avanza el parser (FlujoTokens);
+    # la traza necesita la entrada restante en cada paso, así que ahí se generan todos antes.
+    if lexer == "ply" and not (traza or traza_ultimos):
+        tokens = ArbolSintactico.FlujoTokens(contenido)
+        if tokens.siguiente is None:
+            _log.error("Error: No se generaron tokens o el lexer falló.")
+            return
+        _log.info("Tokens: se generan a medida que avanza el análisis sintáctico.")
+    else:
+        tokens = ArbolSintactico.ejecutar_lexer(contenido, motor=lexer)
 
-    if not tokens:
-        print("Error: No se generaron tokens o el lexer falló.")
-        return
-    print(f"Tokens generados: {len(tokens)}")
-    print("--- Análisis léxico completado. ---")
+        if not tokens:
+            _log.error("Error: No se generaron tokens o el lexer falló.")
+            return
+        _log.info("Tokens generados: %s", len(tokens))
+        _log.info("--- Análisis léxico completado. ---")
 
     # 3. Análisis Sintáctico - REVISAR 
-    print("\n--- 3. Fase Sintáctica ---")
+    _log.info("\n--- 3. Fase Sintáctica ---")
     try:
-        tabla, terminales = ArbolSintactico.cargar_tabla_sintactica(tabla_sintactica_file)
-        
-    except FileNotFoundError:
-        print(f"Error: El archivo de tabla sintáctica '{tabla_sintactica_file}' no fue encontrado.")
+        if tabla_desde_gramatica:
+            tabla = ArbolSintactico.generar_tabla_compilada(gramatica_file, cache_dir)
+            for msg in tabla.conflictos:
+                _log.warning("Advertencia: %s", msg)
+            if not tabla.desde_cache:
+                tiempos = ", ".join(f"{fase}={seg * 1e3:.2f} ms" for fase, seg in tabla.tiempos_generacion.items())
+                _log.info("Tabla LL(1) generada desde la gramática (%s)", tiempos)
+        else:
+            tabla = ArbolSintactico.cargar_tabla_compilada(tabla_sintactica_file, gramatica_file, cache_dir)
+        terminales = tabla.terminales
+    except FileNotFoundError as e:
+        _log.error("Error: El archivo de tabla sintáctica '%s' no fue encontrado.", e.filename)
         return
     #AQUI SE USA ANALIZAR CADENA
-    historial_sintactico, aceptado, error_info, ast_root = ArbolSintactico.analizar_cadena(tabla, tokens, terminales, contenido)
-
-    # Guardar el análisis sintáctico paso a paso en un archivo
-    output_dir = os.path.join(base_dir, "salida")
-    os.makedirs(output_dir, exist_ok=True)
+    # Traza paso a paso: desactivada por defecto; con traza=True se escribe al archivo
+    # a medida que avanza el análisis y con traza_ultimos=N solo se guardan los últimos N pasos.
     analisis_sintactico = os.path.join(output_dir, "analisis_sintactico_paso_a_paso.txt")
+    traza_sintactica = None
+    try:
+        if traza:
+            traza_sintactica = ArbolSintactico.TrazaArchivo(analisis_sintactico)
+        elif traza_ultimos:
+            traza_sintactica = ArbolSintactico.TrazaUltimos(traza_ultimos)
+    except IOError as e:
+        _log.error("Error al abrir el archivo de análisis sintáctico: %s", e)
 
     try:
-        with open(analisis_sintactico, "w", encoding="utf-8") as f_analisis:
-            f_analisis.write("| Paso | Pila | Entrada | Acción |\n")
-            f_analisis.write("|------|------|---------|--------|\n")
-            if historial_sintactico: # si existe historial sintactico entonces ...
-
-                for paso_info in historial_sintactico:
-                    
-                    pila_escaped = paso_info['pila'].replace('|', '\\|')
-                    entrada_escaped = paso_info['entrada'].replace('|', '\\|')
-                    accion_escaped = paso_info['accion'].replace('|', '\\|')
-                    f_analisis.write(f"| {paso_info['paso']} | {pila_escaped} | {entrada_escaped} | {accion_escaped} |\n")
-            else:
-                f_analisis.write("|      |      |         |                |\n") # Fila vacía si no hay historial
-
-        print(f"Análisis sintáctico paso a paso guardado en: {analisis_sintactico}")
+        aceptado, error_info, ast_root = ArbolSintactico.analizar_cadena(tabla, tokens, terminales, contenido, traza=traza_sintactica)
+    finally:
+        if isinstance(traza_sintactica, ArbolSintactico.TrazaArchivo):
+            traza_sintactica.cerrar()
 
-    except IOError as e:
-        print(f"Error al escribir el archivo de análisis sintáctico: {e}")
+    if isinstance(traza_sintactica, ArbolSintactico.TrazaArchivo):
+        _log.info("Análisis sintáctico paso a paso guardado en: %s", analisis_sintactico)
+    elif isinstance(traza_sintactica, ArbolSintactico.TrazaUltimos):
+        try:
+            with ArbolSintactico.TrazaArchivo(analisis_sintactico) as f_analisis:
+                traza_sintactica.volcar(f_analisis)
+            _log.info("Últimos %s pasos del análisis sintáctico guardados en: %s", traza_ultimos, analisis_sintactico)
+        except IOError as e:
+            _log.error("Error al escribir el archivo de análisis sintáctico: %s", e)
 
     if not aceptado:
-        print("Error en el análisis sintáctico.")
-        print(f"  - Token problemático: '{error_info.get('token', '?')}'")
-        print(f"  - Posición: línea {error_info.get('linea', '?')}, columna {error_info.get('columna', '?')}")
-        print(f"  - Tipo error {error_info.get('error','?')}")
+        _log.error("Error en el análisis sintáctico.")
+        _log.error("  - Token problemático: '%s'", error_info.get('token', '?'))
+        _log.error("  - Posición: línea %s, columna %s", error_info.get('linea', '?'), error_info.get('columna', '?'))
+        _log.error("  - Tipo error %s", error_info.get('error','?'))
         return
-    print("--- Análisis sintáctico completado con éxito.---")
+    if isinstance(tokens, ArbolSintactico.FlujoTokens):
+        _log.info("Tokens consumidos: %s", tokens.consumidos)
+    _log.info("--- Análisis sintáctico completado con éxito.---")
 
     # 4. Generar Arbol Sintantactico AST
     if ast_root: # si existe una razi entonces
-        print("\n--- 4. Árbol Sintáctico (AST) generado. ---")
+        _log.info("\n--- 4. Árbol Sintáctico (AST) generado. ---")
         try:
             ArbolSintactico.guardar_ast(ast_root, terminales, ast_output_file)
-            print(f"AST guardado en imágenes en: {ast_output_file}.(dot/png)")
+            _log.info("AST guardado en imágenes en: %s.(dot/png)", ast_output_file)
         except Exception as e:
-            print(f"Advertencia: No se pudo guardar la imagen del AST: {e}")
+            _log.warning("Advertencia: No se pudo guardar la imagen del AST: %s", e)
     else:
-        print("Advertencia: El análisis sintáctico fue aceptado pero no se generó un AST.")
+        _log.warning("Advertencia: El análisis sintáctico fue aceptado pero no se generó un AST.")
 
     # 5. Análisis Semántico
-    print("\n--- 5. Fase Semántica ---")
+    _log.info("\n--- 5. Fase Semántica ---")
     if not ast_root:
-        print("Error: No se puede realizar el análisis semántico sin un AST.")
+        _log.error("Error: No se puede realizar el análisis semántico sin un AST.")
         return
-    
-    analyzer = SemanticAnalyzer(ast_root)
-    analyzer.analyze() 
 
-    symbol_table_output = analyzer.get_symbol_table_formatted()
-    semantic_errors_output = analyzer.get_errors_formatted()
+    # El análisis semántico y la generación de código recorren el AST abstracto, no el árbol de derivación
+    ast_abstracto = ArbolAbstracto.construir_ast(ast_root)
+    if _log.isEnabledFor(Diagnosticos.INFO): # contar_nodos recorre ambos árboles
+        _log.info("AST abstracto: %s nodos (árbol de derivación: %s nodos)",
+                  ArbolAbstracto.contar_nodos(ast_abstracto), ArbolAbstracto.contar_nodos(ast_root))
 
-    print("Análisis semántico completado.")
+    analyzer = SemanticAnalyzer(ast_abstracto)
+    analyzer.analyze() 
 
-    # 6. Mostrar Resultados
-    print("\n--- Resultados del Análisis Semántico ---")
-    print("\n" + symbol_table_output)
-    print("\n" + semantic_errors_output) # Debería estar vacío si llegamos aquí
+    _log.info("Análisis semántico completado.")
+
+    # 6. Mostrar Resultados (la tabla solo se formatea si se va a mostrar; los errores siempre)
+    if _log.isEnabledFor(Diagnosticos.INFO):
+        _log.info("\n--- Resultados del Análisis Semántico ---")
+        _log.info("\n%s", analyzer.get_symbol_table_formatted())
+    nivel_errores = Diagnosticos.ERROR if analyzer.symbol_table.errors else Diagnosticos.INFO
+    if _log.isEnabledFor(nivel_errores):
+        _log.log(nivel_errores, "\n%s", analyzer.get_errors_formatted()) # Debería estar vacío si llegamos aquí
 
     # 7. Generación de Código SPIM
     # Solo proceder a la generación de código si no hay errores semánticos
     if analyzer.symbol_table.errors:
-        print("Errores semánticos encontrados. No se generará código SPIM.")
-        print("\n--- Compilador Finalizado con Errores ---")
+        _log.error("Errores semánticos encontrados. No se generará código SPIM.")
+        _log.error("\n--- Compilador Finalizado con Errores ---")
         return
 
-    print("\n--- 7. Fase de Generación de Código SPIM ---") # Cambiado el número de fase
+    _log.info("\n--- 7. Fase de Generación de Código SPIM ---") # Cambiado el número de fase
     spim_output_file = os.path.join(output_dir, "codigo_ensamblado.asm") # Definir aquí también por si acaso
     generador = GeneradorSPIM()
-    codigo_spim = generador.generar(ast_root, analyzer.symbol_table) # Pasamos la tabla de símbolos del analizador
+    codigo_spim = generador.generar(ast_abstracto, analyzer.symbol_table) # Pasamos la tabla de símbolos del analizador
 
     try:
         with open(spim_output_file, "w", encoding="utf-8") as f_spim:
             f_spim.write(codigo_spim)
-        print(f"Código SPIM generado con éxito en: {spim_output_file}")
+        _log.info("Código SPIM generado con éxito en: %s", spim_output_file)
     except IOError as e:
-        print(f"Error al escribir el archivo de código SPIM: {e}")
+        _log.error("Error al escribir el archivo de código SPIM: %s", e)
+
+    _log.info("\n--- Compilador Finalizado ---")
+
+# === Compilación por lotes ===
+# El lexer (prototipo de AnalizadorLexico) y la tabla LL(1) se cargan una sola vez por
+# proceso y se reutilizan para todos los archivos. Cada archivo pasa por las mismas fases
+# que run_compiler, pero sin imprimir el fuente ni renderizar el árbol con graphviz; lo
+# que las fases imprimen se guarda en el resultado de ese archivo.
+EXTENSION_FUENTE = ".txt"
+
+class ResultadoCompilacion:
+    """Resultado de compilar un archivo del lote. estado es 'ok', 'sintactico',
+    'semantico', 'io' o 'interno' (excepción inesperada del compilador); salida es la ruta del .asm (None si no se generó) y tiempos
+    guarda los segundos de cada fase."""
+    __slots__ = ('entrada', 'estado', 'salida', 'errores', 'diagnosticos', 'tokens', 'tiempos')
+
+    def __init__(self, entrada):
+        self.entrada = entrada
+        self.estado = 'ok'
+        self.salida = None
+        self.errores = []
+        self.diagnosticos = ""
+        self.tokens = 0
+        self.tiempos = {}
+
+
+def expandir_entradas(rutas):
+    """Archivos a compilar: cada ruta puede ser un archivo o un directorio (se toman sus
+    archivos EXTENSION_FUENTE en orden alfabético)."""
+    archivos = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            archivos.extend(sorted(os.path.join(ruta, nombre) for nombre in os.listdir(ruta)
+                                   if nombre.endswith(EXTENSION_FUENTE) and os.path.isfile(os.path.join(ruta, nombre))))
+        elif os.path.isfile(ruta):
+            archivos.append(ruta)
+        else:
+            raise FileNotFoundError(ruta)
+    return archivos
+
+
+def compilar_fuente(contenido, tabla, resultado, lexer="ply"):
+    """Léxico + sintáctico, AST abstracto, semántico y generación de código sobre
+    'contenido'. Llena 'resultado' (estado, errores, tiempos) y devuelve el código SPIM,
+    o None si alguna fase falló."""
+    tiempos = resultado.tiempos
+    inicio = time.perf_counter()
+    tokens = ArbolSintactico.FlujoTokens(contenido) if lexer == "ply" else ArbolSintactico.ejecutar_lexer(contenido, motor=lexer)
+    aceptado, error_info, ast_root = ArbolSintactico.analizar_cadena(tabla, tokens, tabla.terminales, contenido)
+    resultado.tokens = tokens.consumidos if isinstance(tokens, ArbolSintactico.FlujoTokens) else len(tokens)
+    tiempos['sintactico'] = time.perf_counter() - inicio
+    if not aceptado:
+        resultado.estado = 'sintactico'
+        resultado.errores.append(f"Error sintáctico: token '{error_info.get('token', '?')}' en línea "
+                                 f"{error_info.get('linea', '?')}, columna {error_info.get('columna', '?')}")
+        return None
+
+    inicio = time.perf_counter()
+    ast_abstracto = ArbolAbstracto.construir_ast(ast_root)
+    del ast_root # El árbol de derivación ya no se usa
+    tiempos['ast'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    analyzer = SemanticAnalyzer(ast_abstracto)
+    analyzer.analyze()
+    tiempos['semantico'] = time.perf_counter() - inicio
+    if analyzer.symbol_table.errors:
+        resultado.estado = 'semantico'
+        resultado.errores.extend(analyzer.symbol_table.errors)
+        return None
+
+    inicio = time.perf_counter()
+    codigo_spim = GeneradorSPIM().generar(ast_abstracto, analyzer.symbol_table)
+    tiempos['codigo'] = time.perf_counter() - inicio
+    return codigo_spim
+
+
+def compilar_archivo(ruta, dir_salida, tabla, lexer="ply"):
+    """Compila 'ruta' y escribe dir_salida/<nombre>.asm, o dir_salida/<nombre>.errores.txt
+    con los errores y lo que imprimieron las fases si la compilación falla."""
+    resultado = ResultadoCompilacion(ruta)
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    inicio = time.perf_counter()
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            contenido = f.read()
+        with contextlib.redirect_stdout(io.StringIO()) as impreso:
+            codigo_spim = compilar_fuente(contenido, tabla, resultado, lexer)
+        resultado.diagnosticos = impreso.getvalue()
+        if codigo_spim is not None:
+            resultado.salida = os.path.join(dir_salida, nombre + ".asm")
+            with open(resultado.salida, "w", encoding="utf-8") as f_spim:
+                f_spim.write(codigo_spim)
+        else:
+            with open(os.path.join(dir_salida, nombre + ".errores.txt"), "w", encoding="utf-8") as f_errores:
+                f_errores.write("\n".join(resultado.errores) + "\n")
+                if resultado.diagnosticos:
+                    f_errores.write("\n--- Salida de las fases ---\n" + resultado.diagnosticos)
+    except (IOError, UnicodeDecodeError) as e:
+        resultado.estado = 'io'
+        resultado.salida = None
+        resultado.errores.append(f"Error de E/S: {e}")
+    except Exception: # Un fallo del compilador en un archivo no debe cortar el resto del lote
+        resultado.estado = 'interno'
+        resultado.salida = None
+        resultado.errores.append("Error interno del compilador:\n" + traceback.format_exc().rstrip())
+    resultado.tiempos['total'] = time.perf_counter() - inicio
+    return resultado
+
+
+def imprimir_resumen(resultados, segundos):
+    fases = ('sintactico', 'ast', 'semantico', 'codigo', 'total')
+    if _log.isEnabledFor(Diagnosticos.INFO):
+        ancho = max([len("archivo")] + [len(r.entrada) for r in resultados])
+        _log.info("%s", f"{'archivo':<{ancho}} | {'estado':<10} | {'tokens':>7} | " + " | ".join(f"{fase + ' (ms)':>15}" for fase in fases))
+        for r in resultados:
+            columnas = " | ".join(f"{r.tiempos[fase] * 1e3:>15.2f}" if fase in r.tiempos else f"{'-':>15}" for fase in fases)
+            _log.info("%s", f"{r.entrada:<{ancho}} | {r.estado:<10} | {r.tokens:>7} | {columnas}")
+    for r in resultados:
+        for error in r.errores:
+            _log.error("%s: %s", r.entrada, error)
+    _log.info("%s/%s archivos compilados en %.3f s", sum(r.estado == 'ok' for r in resultados), len(resultados), segundos)
+
+
+# Con jobs > 1 los archivos se reparten entre procesos. Cada trabajador recibe una sola
+# vez la tabla ya compilada (y tiene su propio lexer prototipo, construido al importar
+# AnalizadorLexico), así que por tarea solo viaja la ruta y vuelve el ResultadoCompilacion.
+_tabla_trabajador = None
+_lexer_trabajador = "ply"
+
+def _iniciar_trabajador(tabla, lexer, nivel_diagnosticos):
+    global _tabla_trabajador, _lexer_trabajador
+    _tabla_trabajador = tabla
+    _lexer_trabajador = lexer
+    Diagnosticos.configurar(nivel_diagnosticos) # Mismo nivel que el proceso principal
+
+
+def _compilar_en_trabajador(ruta, dir_salida):
+    return compilar_archivo(ruta, dir_salida, _tabla_trabajador, _lexer_trabajador)
+
+
+def compilar_lote(entradas, dir_salida, lexer="ply", tabla_desde_gramatica=False, jobs=1):
+    """Compila varios archivos, en este proceso o repartidos entre 'jobs' procesos.
+    Devuelve la lista de ResultadoCompilacion (siempre en el orden de las entradas) o
+    None si no se pudo empezar."""
+    base_dir = os.path.dirname(__file__)
+    cache_dir = os.path.join(base_dir, ".cache")
+    inicio = time.perf_counter()
+    try:
+        archivos = expandir_entradas(entradas)
+        if tabla_desde_gramatica:
+            tabla = ArbolSintactico.generar_tabla_compilada(os.path.join(base_dir, "gramatica.txt"), cache_dir)
+        else:
+            tabla = ArbolSintactico.cargar_tabla_compilada(os.path.join(base_dir, "tabla_sintactica.csv"),
+                                                           os.path.join(base_dir, "gramatica.txt"), cache_dir)
+    except FileNotFoundError as e:
+        _log.error("Error: El archivo '%s' no fue encontrado.", e.filename or e)
+        return None
+    nombres = [os.path.splitext(os.path.basename(ruta))[0] for ruta in archivos]
+    repetidos = sorted({nombre for nombre in nombres if nombres.count(nombre) > 1})
+    if repetidos:
+        _log.error("Error: Varias entradas generarían la misma salida en %s: %s", dir_salida, ", ".join(repetidos))
+        return None
+    os.makedirs(dir_salida, exist_ok=True)
+
+    if jobs > 1 and len(archivos) > 1:
+        jobs = min(jobs, len(archivos))
+        with ProcessPoolExecutor(jobs, initializer=_iniciar_trabajador,
+                                 initargs=(tabla, lexer, Diagnosticos.nivel())) as ejecutor:
+            # map devuelve los resultados en el orden de las entradas, no en el que terminan
+            resultados = list(ejecutor.map(_compilar_en_trabajador, archivos, itertools.repeat(dir_salida),
+                                           chunksize=max(1, len(archivos) // (jobs * 4))))
+    else:
+        resultados = [compilar_archivo(ruta, dir_salida, tabla, lexer) for ruta in archivos]
+    imprimir_resumen(resultados, time.perf_counter() - inicio)
+    return resultados
+
+
+def _entero_positivo(texto):
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"no es un entero: {texto}")
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"debe ser al menos 1: {texto}")
+    return valor
 
-    print("\n--- Compilador Finalizado ---")
 
 if __name__ == "__main__":
-    run_compiler()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Compilador a SPIM MIPS")
+    parser.add_argument("--traza", action="store_true",
+                        help="Escribir el análisis sintáctico paso a paso en salida/ mientras se analiza")
+    parser.add_argument("--traza-ultimos", type=_entero_positivo, metavar="N",
+                        help="Conservar solo los últimos N pasos del análisis sintáctico")
+    parser.add_argument("--tabla-desde-gramatica", action="store_true",
+                        help="Generar la tabla LL(1) desde gramatica.txt al iniciar, sin usar el CSV")
+    parser.add_argument("--lexer", choices=ArbolSintactico.MOTORES_LEXER, default="ply",
+                        help="Motor del análisis léxico: PLY o el lexer rápido de regex maestra (mismos tokens)")
+    parser.add_argument("entradas", nargs="*", metavar="ENTRADA",
+                        help=f"Modo lote: archivos o directorios (sus archivos {EXTENSION_FUENTE}) a compilar "
+                             "en este proceso. Sin entradas se compila codigo.txt")
+    parser.add_argument("--salida", metavar="DIR", default=os.path.join(os.path.dirname(__file__), "salida"),
+                        help="Directorio de los .asm (y .errores.txt) del modo lote")
+    parser.add_argument("--jobs", type=_entero_positivo, default=1, metavar="N",
+                        help="Modo lote: compilar con N procesos en paralelo (por defecto 1)")
+    verbosidad = parser.add_mutually_exclusive_group()
+    verbosidad.add_argument("--silencioso", action="store_const", dest="nivel", const=Diagnosticos.ADVERTENCIA,
+                            default=Diagnosticos.INFO,
+                            help="Modo producción: solo advertencias y errores (no se formatea nada más)")
+    verbosidad.add_argument("--depuracion", action="store_const", dest="nivel", const=Diagnosticos.DEPURACION,
+                            help="Mostrar también el código fuente y las trazas internas de las fases")
+    args = parser.parse_args()
+    Diagnosticos.configurar(args.nivel)
+    if args.entradas:
+        if args.traza or args.traza_ultimos:
+            parser.error("--traza y --traza-ultimos solo se usan al compilar codigo.txt")
+        resultados = compilar_lote(args.entradas, args.salida, lexer=args.lexer,
+                                   tabla_desde_gramatica=args.tabla_desde_gramatica, jobs=args.jobs)
+        sys.exit(0 if resultados is not None and all(r.estado == 'ok' for r in resultados) else 1)
+    run_compiler(traza=args.traza, traza_ultimos=args.traza_ultimos,
+                 tabla_desde_gramatica=args.tabla_desde_gramatica, lexer=args.lexer)
\ No newline at end of file
@@ -0,0 +1,64 @@
+import contextlib
+import io
+
+import ArbolAbstracto
+import ArbolSintactico
+from AnalizadorSintactico import SemanticAnalyzer
+import SimuladorSPIM
+from GeneradorSPIM import GeneradorSPIM
+
+
+def compilar_spim(contenido, tabla, clase_generador=GeneradorSPIM, **opciones):
+    """Compila 'contenido' en memoria y devuelve (generador, código SPIM). Las opciones
+    van al constructor del generador."""
+    tokens = ArbolSintactico.ejecutar_lexer(contenido)
+    aceptado, error, arbol = ArbolSintactico.analizar_cadena(tabla, tokens, tabla.terminales, "")
+    assert aceptado, error
+    ast = ArbolAbstracto.construir_ast(arbol)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analizador = SemanticAnalyzer(ast)
+        analizador.analyze()
+        assert not analizador.symbol_table.errors, analizador.symbol_table.errors[:3]
+        generador = clase_generador(**opciones)
+        codigo = generador.generar(ast, analizador.symbol_table)
+    return generador, codigo
+
+
+def salida_o_error(codigo):
+    """Lo que imprime 'codigo' en SimuladorSPIM. Una división por cero termina la salida con
+    una marca: el orden de evaluación puede hacer que la primera sea otra (entera o float)."""
+    simulador = SimuladorSPIM.Simulador(SimuladorSPIM.ProgramaSPIM(codigo))
+    try:
+        return simulador.ejecutar()
+    except ZeroDivisionError:
+        return "".join(simulador.salida) + "<división por cero>"
+
+
+def expresion_aleatoria(azar, tipo, profundidad):
+    """Fuente de una expresión bien tipada con literales, las variables i, f, b y los
+    neutros 0/1/true/false para que aparezcan las identidades."""
+    if profundidad == 0 or azar.random() < 0.25:
+        if tipo == "int":
+            return azar.choice(["i", "0", "1", str(azar.randint(2, 40))])
+        if tipo == "float":
+            return azar.choice(["f", "1.0", "0.0", "0.1", "2.5", f"{azar.randint(1, 99) / 8}"])
+        return azar.choice(["b", "true", "false"])
+    sub = lambda t: expresion_aleatoria(azar, t, profundidad - 1)
+    if tipo == "int":
+        return f"({sub('int')} {azar.choice('+-*/%')} {sub('int')})"
+    if tipo == "float":
+        izq, der = azar.choice([("float", "float"), ("int", "float"), ("float", "int")])
+        return f"({sub(izq)} {azar.choice('+-*/')} {sub(der)})"
+    if azar.random() < 0.5:
+        return f"({sub('bool')} {azar.choice(['&&', '||', '==', '!='])} {sub('bool')})"
+    operandos = azar.choice(["int", "float"])
+    return f"({sub(operandos)} {azar.choice(['<', '>', '<=', '>=', '==', '!='])} {sub(operandos)})"
+
+
+def programa_aleatorio(azar):
+    """main() con las variables i, f, b y diez print de expresiones aleatorias."""
+    lineas = ["main() {", "  int i = 7;", "  float f = 2.5;", "  bool b = true;"]
+    lineas.extend(f"  print({expresion_aleatoria(azar, azar.choice(['int', 'float', 'bool']), 4)});"
+                  for _ in range(10))
+    lineas.append("}")
+    return "\n".join(lineas) + "\n"
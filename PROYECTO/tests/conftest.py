@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Los módulos del compilador son planos y se importan desde PROYECTO, como hace main.py
+DIR_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if DIR_PROYECTO not in sys.path:
+    sys.path.insert(0, DIR_PROYECTO)
+
+import ArbolSintactico
+
+
+@pytest.fixture(scope="session")
+def tabla():
+    return ArbolSintactico.cargar_tabla_compilada(os.path.join(DIR_PROYECTO, "tabla_sintactica.csv"))
+
+
+@pytest.fixture(scope="session")
+def codigo():
+    with open(os.path.join(DIR_PROYECTO, "codigo.txt"), encoding="utf-8") as archivo:
+        return archivo.read()
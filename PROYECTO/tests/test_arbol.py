@@ -0,0 +1,16 @@
+import pytest
+
+import ArbolSintactico
+
+
+def test_guardar_ast_escribe_junto_a_la_salida(tabla, codigo, tmp_path, monkeypatch):
+    graphviz = pytest.importorskip("graphviz")
+    monkeypatch.chdir(tmp_path) # guardar_ast no debe crear nada en el directorio actual
+    destino = tmp_path / "salida" / "arbol"
+    arbol = ArbolSintactico.analizar_cadena(tabla, ArbolSintactico.ejecutar_lexer(codigo), tabla.terminales, codigo)[2]
+    try:
+        ArbolSintactico.guardar_ast(arbol, tabla.terminales, str(destino))
+    except graphviz.ExecutableNotFound:
+        pass # Sin Graphviz instalado no hay .png, pero el .dot ya se escribió
+    assert (tmp_path / "salida" / "arbol.dot").read_text(encoding="utf-8").startswith("// https://")
+    assert not (tmp_path / "arbol_sintactico").exists()
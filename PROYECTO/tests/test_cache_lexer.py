@@ -0,0 +1,72 @@
+import sys
+
+import pytest
+
+import AnalizadorLexico
+
+
+@pytest.fixture
+def clave(monkeypatch):
+    # Claves propias de la prueba: el lextab real de .cache ya está importado en sys.modules
+    claves = []
+
+    def usar(valor):
+        claves.append(valor)
+        monkeypatch.setattr(AnalizadorLexico, "clave_lextab", lambda: valor)
+
+    yield usar
+    for valor in claves:
+        sys.modules.pop(AnalizadorLexico.PREFIJO_LEXTAB + valor, None)
+
+
+def _tokens(lexer):
+    lexer = lexer.clone()
+    lexer.input("main() { print(1.5 + x); }")
+    return [(t.type, t.value) for t in iter(lexer.token, None)]
+
+
+def test_cache_se_reutiliza_y_se_invalida(tmp_path, clave):
+    esperados = _tokens(AnalizadorLexico.lexer)
+    (tmp_path / "lextab_viejo.py").write_text("# lextab de otra clave\n")
+    (tmp_path / "tmp_lextab_otro_1.py").write_text("# temporal de otro proceso\n")
+
+    clave("prueba01")
+    construido = AnalizadorLexico.construir_lexer(str(tmp_path))
+    assert not construido.lexoptimize
+    assert sorted(p.name for p in tmp_path.glob("*.py")) == ["lextab_prueba01.py", "tmp_lextab_otro_1.py"]
+
+    cargado = AnalizadorLexico.construir_lexer(str(tmp_path))
+    assert cargado.lexoptimize # Desde el lextab, sin validar las reglas
+    assert _tokens(construido) == _tokens(cargado) == esperados
+
+    # Otra clave (cambiaron las reglas o PLY): se reconstruye y se borra el lextab anterior
+    clave("prueba02")
+    reconstruido = AnalizadorLexico.construir_lexer(str(tmp_path))
+    assert not reconstruido.lexoptimize
+    assert sorted(p.name for p in tmp_path.glob("*.py")) == ["lextab_prueba02.py", "tmp_lextab_otro_1.py"]
+    assert _tokens(reconstruido) == esperados
+
+
+def test_temporal_no_lo_borra_otro_proceso(tmp_path, clave, monkeypatch):
+    # Un proceso que arranca a la vez borra los PREFIJO_LEXTAB*.py de otras claves: el
+    # temporal que todavía no se publicó no puede tener ese prefijo
+    escritos = []
+    writetab = AnalizadorLexico.lex.Lexer.writetab
+
+    def espiar(self, nombre, directorio):
+        escritos.append(nombre)
+        return writetab(self, nombre, directorio)
+
+    monkeypatch.setattr(AnalizadorLexico.lex.Lexer, "writetab", espiar)
+    clave("prueba04")
+    AnalizadorLexico.construir_lexer(str(tmp_path))
+    assert len(escritos) == 1 and not escritos[0].startswith(AnalizadorLexico.PREFIJO_LEXTAB)
+    assert (tmp_path / "lextab_prueba04.py").exists()
+
+
+def test_cache_corrupta_se_reconstruye(tmp_path, clave):
+    clave("prueba03")
+    (tmp_path / "lextab_prueba03.py").write_text("esto no es python (\n")
+    lexer = AnalizadorLexico.construir_lexer(str(tmp_path))
+    assert not lexer.lexoptimize
+    assert AnalizadorLexico.construir_lexer(str(tmp_path)).lexoptimize
@@ -0,0 +1,64 @@
+import pytest
+
+import SimuladorSPIM
+
+from apoyo import compilar_spim
+
+# return deja el valor en $v0/$f0 (convertido al tipo de la función) y salta al epílogo;
+# for evalúa la condición en cada vuelta y ejecuta el paso después del cuerpo. Los
+# argumentos pasan por la pila y se convierten al tipo del parámetro
+FUENTE_CONTROL = """int suma_hasta(int n) {
+  int s;
+  int i;
+  s = 0;
+  for (i = 1; i <= n; i = i + 1) {
+    s = s + i;
+  }
+  return s;
+  print(99);
+}
+float tres() {
+  return 3;
+}
+int entero() {
+  float y = 2.5;
+  return y;
+}
+float escala(float x, int k) {
+  return x * k;
+}
+bool positivo(int n) {
+  if (suma_hasta(n) > 0) {
+    return true;
+  }
+  return false;
+}
+main() {
+  int i;
+  for (i = 0; i < 3; i = i + 1) {
+    print(i);
+  }
+  print(suma_hasta(4));
+  print(tres());
+  print(entero());
+  print(escala(1.5, 3));
+  print(escala(2, suma_hasta(2)));
+  print(positivo(0));
+  print(positivo(suma_hasta(1)));
+  return;
+  print(7);
+}
+"""
+
+
+@pytest.mark.parametrize("reglas", [None, ()], ids=["con_mirilla", "sin_mirilla"])
+def test_return_y_for(tabla, reglas):
+    codigo = compilar_spim(FUENTE_CONTROL, tabla, reglas_mirilla=reglas)[1]
+    assert SimuladorSPIM.ejecutar(codigo)[0].split() == ["0", "1", "2", "10", "3", "2", "4.5", "6", "0", "1"]
+
+
+def test_return_final_no_deja_salto(tabla):
+    generador = compilar_spim(FUENTE_CONTROL, tabla)[0]
+    # tres, entero, escala y positivo terminan con return: el salto va a la instrucción
+    # siguiente y la mirilla lo quita
+    assert generador.eliminadas_mirilla["salto_al_siguiente"] == 4
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+import crearTabla
+
+DIR_PROYECTO = os.path.dirname(os.path.abspath(crearTabla.__file__))
+
+# Regresión de la gramática: gramatica.txt tiene que seguir siendo LL(1) y generar
+# exactamente la tabla_sintactica.csv que usa el parser
+
+
+@pytest.fixture(scope="module")
+def generada():
+    return crearTabla.generar_tabla(os.path.join(DIR_PROYECTO, "gramatica.txt"))
+
+
+def test_gramatica_es_ll1(generada):
+    assert generada.conflictos == []
+    assert generada.es_ll1()
+    assert generada.simbolos_no_definidos == []
+
+
+def test_tabla_coincide_con_el_csv(generada):
+    assert crearTabla.diferencias_con_csv(generada, os.path.join(DIR_PROYECTO, "tabla_sintactica.csv")) == []
+
+
+TIPOS = {'BOOL', 'FLOAT', 'INT', 'STRING', 'VOID'}
+INSTRUCCIONES = TIPOS | {'FOR', 'ID', 'IF', 'PRINT', 'RETURN', 'WHILE'}
+
+
+@pytest.mark.parametrize("no_terminal, first, follow", [
+    ("programa", TIPOS | {'MAIN', 'ε'}, {'$'}),
+    ("funcion", TIPOS | {'MAIN'}, TIPOS | {'MAIN', '$'}),
+    ("tipo", TIPOS, {'ID'}),
+    ("parametros", TIPOS | {'ε'}, {'RPAREN'}),
+    ("bloque", INSTRUCCIONES | {'ε'}, {'RBRACE'}),
+    ("instruccion", INSTRUCCIONES, INSTRUCCIONES | {'RBRACE'}),
+    ("E", {'FALSE', 'FLOAT_NUM', 'ID', 'INT_NUM', 'LPAREN', 'STRING_LITERAL', 'TRUE'}, {'COMMA', 'RPAREN', 'SEMI'}),
+])
+def test_first_y_follow(generada, no_terminal, first, follow):
+    assert set(generada.first[no_terminal]) == first
+    assert set(generada.follow[no_terminal]) == follow
+
+
+def test_predict_de_parametros(generada):
+    celdas = {t: cuerpo for t, cuerpo in generada.tabla['parametros'].items() if cuerpo}
+    assert celdas == {**dict.fromkeys(TIPOS, 'parametro parametros_rest'), 'RPAREN': 'ε'}
+
+
+def test_conflicto_first_first():
+    # La celda en conflicto se queda con la primera producción en el orden de la gramática
+    generada = crearTabla.generar_tabla([('S', ['a', 'x']), ('S', ['a', 'y']), ('S', ['ε'])])
+    assert generada.conflictos == ["Conflicto en [S, a]: múltiples producciones (a x | a y)"]
+    assert generada.tabla['S']['a'] == 'a x'
+    assert generada.tabla['S']['$'] == 'ε'
@@ -0,0 +1,55 @@
+import contextlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import AnalizadorLexicoRapido
+import ArbolSintactico
+from benchmarks import generar_fuente_main
+
+# Prueba diferencial: el lexer rápido debe dar los mismos tokens (tipo, valor, línea,
+# posición) y los mismos mensajes de error que PLY
+CASOS_LEXER = [
+    "int x = 1.5e3 + .5 + 3. + 2e5; // comentario\n/* bloque\n de varias líneas */ y<=z==w!=q&&r||s",
+    "string s = \"con \\\"escape\\\"\"; \"sin cerrar\n print(s);",
+    "@ # $ 12abc _a1 true false truex mainx main() {\t}\n\n\n%",
+    "",
+]
+
+
+def _tokens_y_mensajes(tokenizar, contenido):
+    with contextlib.redirect_stdout(io.StringIO()) as impreso:
+        tokens = tokenizar(contenido)
+    return tokens, impreso.getvalue()
+
+
+def _comparar_con_ply(contenido):
+    esperados, mensajes_ply = _tokens_y_mensajes(ArbolSintactico.ejecutar_lexer, contenido)
+    obtenidos, mensajes_rapido = _tokens_y_mensajes(AnalizadorLexicoRapido.tokenizar, contenido)
+    assert obtenidos.como_dicts() == esperados
+    assert mensajes_rapido == mensajes_ply
+
+
+@pytest.mark.parametrize("contenido", CASOS_LEXER)
+def test_casos_borde(contenido):
+    _comparar_con_ply(contenido)
+
+
+def test_codigo_de_ejemplo(codigo):
+    _comparar_con_ply(codigo)
+
+
+def test_entrada_sintetica():
+    _comparar_con_ply(generar_fuente_main(2000))
+
+
+def test_lexers_ply_en_paralelo(codigo):
+    # Cada compilación tiene su propio lexer (nuevo_lexer): tokenizar las mismas entradas en
+    # varios hilos a la vez debe dar los mismos tokens y líneas que hacerlo una tras otra
+    contenidos = [codigo, generar_fuente_main(500)] + CASOS_LEXER
+    with contextlib.redirect_stdout(io.StringIO()):
+        esperados = [ArbolSintactico.ejecutar_lexer(c) for c in contenidos]
+        with ThreadPoolExecutor(8) as ejecutor:
+            obtenidos = list(ejecutor.map(ArbolSintactico.ejecutar_lexer, contenidos * 8))
+    assert obtenidos == esperados * 8
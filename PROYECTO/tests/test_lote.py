@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import main
+
+FUENTE_VALIDA = "main() {\n  print(1);\n}\n"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_excepcion_interna_no_corta_el_lote(tmp_path, monkeypatch, jobs):
+    # Con fork los trabajadores heredan el compilar_fuente parcheado
+    compilar_fuente = main.compilar_fuente
+
+    def compilar_o_fallar(contenido, *argumentos, **opciones):
+        if "explota" in contenido:
+            raise RuntimeError("fallo simulado")
+        return compilar_fuente(contenido, *argumentos, **opciones)
+
+    monkeypatch.setattr(main, "compilar_fuente", compilar_o_fallar)
+    entradas = tmp_path / "entradas"
+    salida = tmp_path / "salida"
+    entradas.mkdir()
+    salida.mkdir()
+    (entradas / "a.txt").write_text(FUENTE_VALIDA, encoding="utf-8")
+    (entradas / "b.txt").write_text("// explota\n" + FUENTE_VALIDA, encoding="utf-8")
+    (entradas / "c.txt").write_text(FUENTE_VALIDA, encoding="utf-8")
+
+    resultados = main.compilar_lote([str(entradas)], str(salida), jobs=jobs)
+    assert [r.estado for r in resultados] == ['ok', 'interno', 'ok']
+    fallido = resultados[1]
+    assert fallido.salida is None
+    assert "RuntimeError: fallo simulado" in fallido.errores[0]
+    assert sorted(os.listdir(salida)) == ["a.asm", "c.asm"]
+
+
+@pytest.mark.parametrize("valor, mensaje", [("0", "debe ser al menos 1: 0"), ("x", "no es un entero: x")])
+def test_jobs_se_valida_como_traza_ultimos(valor, mensaje):
+    for opcion in ("--jobs", "--traza-ultimos"):
+        proceso = subprocess.run([sys.executable, main.__file__, opcion, valor], capture_output=True, text=True)
+        assert proceso.returncode == 2
+        assert f"argument {opcion}: {mensaje}" in proceso.stderr
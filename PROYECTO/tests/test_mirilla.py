@@ -0,0 +1,105 @@
+import random
+import re
+
+import pytest
+
+import SimuladorSPIM
+from InstruccionesMIPS import COMENTARIO, ETIQUETA, Instruccion
+from OptimizadorMirilla import REGLAS, optimizar
+
+from apoyo import compilar_spim, programa_aleatorio, salida_o_error
+
+FUENTE_LLAMADA_EN_PRINT = """int f(int n) {
+  return n;
+}
+main() {
+  print(f(1));
+}
+"""
+VENTANAS = (1, 2, 4, 8, 16)
+
+
+def _reales(generador):
+    return [i for i in generador.codigo_text if i.op != COMENTARIO and i.op != ETIQUETA]
+
+
+def test_llamada_en_print_pliega_move_move(tabla):
+    # move $t0, $v0 ; move $a0, $t0: la regla de la posición 1 (move_redundante) se prueba
+    # aunque epilogo_sp_fp también se dispare con 'move' en la posición 0
+    generador = compilar_spim(FUENTE_LLAMADA_EN_PRINT, tabla)[0]
+    moves = [i.operandos for i in _reales(generador) if i.op == 'move']
+    assert ('$a0', '$v0') in moves
+    assert not any(destino == '$a0' and origen.startswith('$t') for destino, origen in moves)
+    assert generador.eliminadas_mirilla['move_redundante'] >= 1
+
+
+@pytest.mark.parametrize("ventana", VENTANAS)
+def test_ventanas_misma_salida(tabla, codigo, ventana):
+    base = compilar_spim(codigo, tabla, reglas_mirilla=())
+    optimizado = compilar_spim(codigo, tabla, ventana_mirilla=ventana)
+    eliminadas = sum(optimizado[0].eliminadas_mirilla.values())
+    assert len(_reales(optimizado[0])) == len(_reales(base[0])) - eliminadas
+    assert SimuladorSPIM.ejecutar(optimizado[1])[0] == SimuladorSPIM.ejecutar(base[1])[0]
+    if ventana == 1:
+        assert eliminadas == 0
+
+
+def test_ventana_invalida_y_reglas_desconocidas():
+    with pytest.raises(ValueError):
+        optimizar([], ventana=0)
+    with pytest.raises(ValueError):
+        optimizar([], reglas=["no_existe"])
+
+
+@pytest.mark.parametrize("nombre, entrada, esperada", [
+    ("move_redundante",
+     [("li", "$t0", "5"), ("move", "$a0", "$t0"), ("li", "$v0", "1"), ("syscall",)],
+     [("li", "$a0", "5"), ("li", "$v0", "1"), ("syscall",)]),
+    ("guardar_cargar",
+     [("sw", "$t0", "-4($fp)"), ("lw", "$t1", "-4($fp)")],
+     [("sw", "$t0", "-4($fp)"), ("move", "$t1", "$t0")]),
+    ("salto_al_siguiente",
+     [("j", "L2"), (ETIQUETA, "L1"), (ETIQUETA, "L2")],
+     [(ETIQUETA, "L1"), (ETIQUETA, "L2")]),
+    ("epilogo_sp_fp",
+     [("move", "$sp", "$fp"), ("lw", "$fp", "0($sp)"), ("lw", "$ra", "4($sp)"), ("addiu", "$sp", "$sp", "8")],
+     [("lw", "$ra", "4($fp)"), ("addiu", "$sp", "$fp", "8"), ("lw", "$fp", "0($fp)")]),
+])
+def test_cada_regla(nombre, entrada, esperada):
+    instrucciones = [Instruccion(op, tuple(operandos)) for op, *operandos in entrada]
+    resultado, eliminadas = optimizar(instrucciones, reglas=[nombre])
+    assert [(i.op, *i.operandos) for i in resultado] == esperada
+    assert eliminadas == {nombre: len(entrada) - len(esperada)}
+
+
+def test_registro_vivo_no_se_pliega():
+    # $t0 se vuelve a leer después del move: no se puede cambiar el destino del li
+    instrucciones = [Instruccion("li", ("$t0", "5")), Instruccion("move", ("$a0", "$t0")),
+                     Instruccion("add", ("$t1", "$t0", "$t0"))]
+    resultado, eliminadas = optimizar(instrucciones, reglas=["move_redundante"])
+    assert eliminadas["move_redundante"] == 0
+    assert len(resultado) == 3
+
+
+def test_comentarios_nombran_registros_en_uso(tabla, codigo):
+    # Un comentario suelto no acompaña a la instrucción que la mirilla reescribe: los
+    # registros que nombra tienen que aparecer en las instrucciones que le siguen
+    lineas = compilar_spim(codigo, tabla)[0].codigo_text
+    for posicion, instruccion in enumerate(lineas):
+        if instruccion.op != COMENTARIO or not instruccion.comentario:
+            continue
+        siguientes = [i for i in lineas[posicion + 1:posicion + 6] if i.op != COMENTARIO]
+        for registro in re.findall(r"\$[tf]\d+", instruccion.comentario):
+            assert any(registro in i.operandos for i in siguientes), instruccion.comentario
+
+
+@pytest.mark.parametrize("ventana", (1, 8))
+@pytest.mark.parametrize("semilla", range(10))
+def test_diferencial_con_y_sin_mirilla(tabla, ventana, semilla):
+    # Programas aleatorios bien tipados deben imprimir lo mismo con y sin mirilla
+    azar = random.Random(semilla)
+    for _ in range(20):
+        contenido = programa_aleatorio(azar)
+        sin_mirilla = salida_o_error(compilar_spim(contenido, tabla, reglas_mirilla=())[1])
+        con_mirilla = salida_o_error(compilar_spim(contenido, tabla, ventana_mirilla=ventana)[1])
+        assert con_mirilla == sin_mirilla, contenido
@@ -0,0 +1,97 @@
+import pytest
+
+import SimuladorSPIM
+from AsignadorRegistros import REGISTROS_ENTEROS, REGISTROS_FLOTANTES
+from benchmarks import generar_fuente_presion
+from GeneradorSPIM import GeneradorSPIM
+
+from apoyo import compilar_spim
+
+
+class _GeneradorIzquierdaDerecha(GeneradorSPIM):
+    # Orden anterior a Sethi–Ullman: siempre el operando izquierdo primero
+    def _evaluar_derecho_primero(self, izquierdo, derecho):
+        return False
+
+
+# (forma, expresión, pico izquierda a derecha, pico Sethi–Ullman, valor impreso)
+FORMAS_EXPRESION = (
+    ("espina izquierda", "(((a + b) * c) - d) / e", 2, 2, 3),
+    ("anidada a la derecha", "a + (b * (c - (d / e)))", 5, 2, 42),
+    ("balanceada", "(a + b) * (c - d)", 3, 3, -21),
+    ("balanceada, 3 niveles", "((a + b) * (c - d)) - ((e + f) / (g - h))", 4, 4, -11),
+    ("mixta", "a - ((b + c) * (d - e))", 4, 3, 41),
+    ("derecha, 12 niveles", "a - (b - (c - (d - (e - (f - (g - (h - (i - (j - (k - l))))))))))", 12, 2, -18),
+)
+
+
+def _pico_temporales(generador):
+    # El barrido lineal toma siempre el registro libre de menor índice, así que los $t
+    # distintos que aparecen son el pico de temporales vivos. Los derramados se suman: en
+    # estas formas todos siguen vivos en el punto de mayor presión
+    registros = {o for i in generador.codigo_text for o in i.operandos if o in REGISTROS_ENTEROS}
+    return len(registros) + generador.temporales_derramados
+
+
+@pytest.mark.parametrize("expresion, pico_izq_der, pico_su, valor", [f[1:] for f in FORMAS_EXPRESION],
+                         ids=[f[0] for f in FORMAS_EXPRESION])
+def test_pico_de_temporales(tabla, expresion, pico_izq_der, pico_su, valor):
+    variables = sorted(set(expresion) - set(" ()+-*/"))
+    lineas = ["main() {"]
+    lineas.extend(f"  int {v} = {3 * i + 2};" for i, v in enumerate(variables)) # Sin divisores 0
+    lineas.extend((f"  int x = {expresion};", "  print(x);", "}"))
+    contenido = "\n".join(lineas) + "\n"
+    # Sin mirilla: move_redundante cambia $t0 por $a0 y el pico contaría un registro menos
+    izq_der, codigo_izq_der = compilar_spim(contenido, tabla, _GeneradorIzquierdaDerecha, reglas_mirilla=())
+    su, codigo_su = compilar_spim(contenido, tabla, reglas_mirilla=())
+    assert _pico_temporales(izq_der) == pico_izq_der
+    assert _pico_temporales(su) == pico_su
+    assert su.temporales_derramados == 0
+    assert SimuladorSPIM.ejecutar(codigo_izq_der)[0] == SimuladorSPIM.ejecutar(codigo_su)[0] == f"{valor}\n"
+
+
+def _derrames(generador):
+    # Códigos de operación de los guardados de spill: 'sw' para $t y 's.s' para $f
+    return {i.op for i in generador.codigo_text if (i.comentario or "").startswith("Spill: guardar")}
+
+
+def test_derrame_de_flotantes(tabla):
+    # 30 niveles a la derecha en orden izquierda a derecha superan los 22 registros $f
+    contenido, esperado = generar_fuente_presion(30, "float", iteraciones=3)
+    izq_der, codigo_izq_der = compilar_spim(contenido, tabla, _GeneradorIzquierdaDerecha)
+    su, codigo_su = compilar_spim(contenido, tabla)
+    assert izq_der.temporales_derramados == 30 - len(REGISTROS_FLOTANTES)
+    assert _derrames(izq_der) == {"s.s"}
+    assert su.temporales_derramados == 0
+    assert float(SimuladorSPIM.ejecutar(codigo_izq_der)[0]) == float(SimuladorSPIM.ejecutar(codigo_su)[0]) == esperado
+
+
+# La función llamada usa los mismos $t/$f sin guardarlos: un temporal vivo a través del jal
+# tiene que pasar por la pila o la llamada lo pisa
+FUENTE_LLAMADAS = """int triple(int x) {
+  int a = 1;
+  int b = 2;
+  return x * 3 + a * b - b;
+}
+float mitad(float x) {
+  float m = 0.5;
+  return x * m + m - m;
+}
+main() {
+  int a = 5;
+  int b = 7;
+  float p = 1.5;
+  float q = 4.0;
+  print(a + b * triple(a - 1) - (a + triple(b)));
+  print(p * q - q * mitad(p + q) + mitad(q));
+}
+"""
+
+
+@pytest.mark.parametrize("clase", [_GeneradorIzquierdaDerecha, GeneradorSPIM], ids=["izq-der", "S-U"])
+@pytest.mark.parametrize("reglas", [None, ()], ids=["con_mirilla", "sin_mirilla"])
+def test_temporales_vivos_en_una_llamada(tabla, clase, reglas):
+    generador, codigo = compilar_spim(FUENTE_LLAMADAS, tabla, clase, reglas_mirilla=reglas)
+    assert generador.temporales_derramados > 0
+    assert _derrames(generador) == {"sw", "s.s"}
+    assert SimuladorSPIM.ejecutar(codigo)[0].split() == ["63", "-3"]
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+import SimuladorSPIM
+from GeneradorSPIM import GeneradorSPIM
+
+from apoyo import compilar_spim, programa_aleatorio, salida_o_error
+
+
+class _GeneradorSinPlegado(GeneradorSPIM):
+    def _plegar_constantes(self, ast_root):
+        pass
+
+
+def test_inicializadores_globales_constantes(tabla):
+    # Sin plegado, un inicializador global que no es un literal quedaba en 0
+    contenido = ("int g = 2 * (3 + 4) - 1;\nfloat h = 1.0 / 4 + 1;\nbool t = 1 < 2 && true;\n"
+                 "main() {\n  print(g);\n  print(h);\n  print(t);\n}\n")
+    codigo = compilar_spim(contenido, tabla)[1]
+    assert SimuladorSPIM.ejecutar(codigo)[0].split() == ["13", "1.25", "1"]
+
+
+def test_expresiones_constantes_no_llegan_al_asm(tabla):
+    contenido = "main() {\n  int s = 60 * 60 * 24;\n  float c = 1.0 / 4;\n  print(s);\n  print(c);\n}\n"
+    generador, codigo = compilar_spim(contenido, tabla)
+    assert not any(i.op in ("mul", "mult", "div.s") for i in generador.codigo_text)
+    assert SimuladorSPIM.ejecutar(codigo)[0].split() == ["86400", "0.25"]
+
+
+@pytest.mark.parametrize("semilla", range(20))
+def test_diferencial_con_y_sin_plegado(tabla, semilla):
+    # Programas aleatorios bien tipados deben imprimir lo mismo con y sin plegado
+    azar = random.Random(semilla)
+    for _ in range(10):
+        contenido = programa_aleatorio(azar)
+        sin_plegado = salida_o_error(compilar_spim(contenido, tabla, _GeneradorSinPlegado)[1])
+        con_plegado = salida_o_error(compilar_spim(contenido, tabla)[1])
+        assert con_plegado == sin_plegado, contenido
@@ -0,0 +1,47 @@
+import contextlib
+import io
+import sys
+
+import pytest
+
+import ArbolAbstracto
+import ArbolSintactico
+from AnalizadorSintactico import SemanticAnalyzer
+from benchmarks import generar_tokens_cuerpo
+from GeneradorSPIM import GeneradorSPIM
+
+# Prueba de estrés: un cuerpo muy largo y una cadena de operadores muy larga deben pasar
+# por todas las fases con el límite de recursión por defecto. Ninguna fase puede depender
+# de la recursión de Python para recorrer listas de instrucciones o cadenas de operadores.
+N = 5000 # Cinco veces el límite
+
+
+@pytest.fixture
+def limite_por_defecto():
+    anterior = sys.getrecursionlimit()
+    sys.setrecursionlimit(1000)
+    yield
+    sys.setrecursionlimit(anterior)
+
+
+@pytest.mark.parametrize("n_instrucciones, n_terminos", [(N, 2), (1, N)], ids=["cuerpo", "expresion"])
+def test_fases_sin_recursion(tabla, limite_por_defecto, n_instrucciones, n_terminos):
+    tokens = generar_tokens_cuerpo(n_instrucciones, n_terminos)
+    aceptado, error, arbol = ArbolSintactico.analizar_cadena(tabla, tokens, tabla.terminales, "")
+    assert aceptado, error
+    ast = ArbolAbstracto.construir_ast(arbol)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analizador = SemanticAnalyzer(ast)
+        analizador.analyze()
+        assert not analizador.symbol_table.errors
+        codigo = GeneradorSPIM().generar(ast, analizador.symbol_table)
+    assert codigo.count("\n") > n_instrucciones
+    del arbol, ast # La liberación tampoco puede ser recursiva
+
+
+@pytest.mark.parametrize("n_instrucciones, n_terminos", [(N, 2), (1, N)], ids=["cuerpo", "expresion"])
+def test_to_dot_sin_recursion(tabla, limite_por_defecto, n_instrucciones, n_terminos):
+    graphviz = pytest.importorskip("graphviz")
+    tokens = generar_tokens_cuerpo(n_instrucciones, n_terminos)
+    arbol = ArbolSintactico.analizar_cadena(tabla, tokens, tabla.terminales, "")[2]
+    arbol.to_dot(graphviz.Digraph(), tabla.terminales)
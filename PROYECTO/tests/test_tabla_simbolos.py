@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from TablaSimbolos import SymbolTable
+
+from apoyo import compilar_spim
+
+
+def _campos(simbolo):
+    if simbolo is None:
+        return None
+    return (simbolo.name, simbolo.kind, simbolo.type, simbolo.line, simbolo.scope_attr, simbolo.scope_id,
+            simbolo.param_types, simbolo.param_names, simbolo.offset)
+
+
+def test_ida_y_vuelta_de_codigo(tabla, codigo):
+    # Después de generar código los símbolos de locales y parámetros ya tienen offset
+    original = compilar_spim(codigo, tabla)[0].tabla_simbolos
+    serializada = original.serialize()
+    recuperada = SymbolTable.deserialize(serializada)
+
+    assert recuperada.serialize() == serializada
+    assert [s['name'] for s in recuperada.all_created_scopes_data] == [s['name'] for s in original.all_created_scopes_data]
+    nombres = {nombre for ambito in original.all_created_scopes_data for nombre in ambito['symbols']}
+    assert any(s.offset is not None for ambito in original.all_created_scopes_data for s in ambito['symbols'].values())
+    for ambito in [None] + [s['name'] for s in original.all_created_scopes_data]:
+        for nombre in nombres:
+            assert _campos(recuperada.lookup_symbol(nombre, ambito)) == _campos(original.lookup_symbol(nombre, ambito))
+
+
+def test_simbolo_duplicado_es_value_error():
+    datos = {'scopes': [['global', [["x", "variable", "int", 1, "global", [], [], None],
+                                    ["x", "variable", "float", 2, "global", [], [], None]]]],
+             'errors': []}
+    with pytest.raises(ValueError, match="'x' aparece dos veces"):
+        SymbolTable.deserialize(json.dumps(datos))
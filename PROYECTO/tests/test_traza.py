@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import pytest
+
+import ArbolSintactico
+import main
+
+# Gramática mínima S -> ID SEMI: la cadena termina coincidiendo un terminal, así que el
+# análisis da un paso más que coincide '$' (como el analizador original)
+TABLA_MINIMA = {'S': {'ID': 'ID SEMI', 'SEMI': '', '$': ''}}
+TOKENS_MINIMOS = [{'type': 'ID', 'value': 'x', 'lineno': 1, 'lexpos': 0},
+                  {'type': 'SEMI', 'value': ';', 'lineno': 1, 'lexpos': 1}]
+
+
+def test_traza_registra_coincidir_fin():
+    tabla = ArbolSintactico.compilar_tabla(TABLA_MINIMA, ['ID', 'SEMI', '$'], raiz='S')
+    traza = ArbolSintactico.TrazaUltimos()
+    aceptado, _, _ = ArbolSintactico.analizar_cadena(tabla, TOKENS_MINIMOS, tabla.terminales, "x;", traza=traza)
+    assert aceptado
+    assert [(f["pila"], f["entrada"], f["accion"]) for f in traza.filas()] == [
+        ("$ SEMI ID", "ID SEMI $", "S → ID SEMI"),
+        ("$ SEMI", "SEMI $", "Coincidir 'ID'"),
+        ("$", "$", "Coincidir 'SEMI'"),
+        ("", "", "Coincidir '$'"),
+    ]
+
+
+def test_traza_ultimos_conserva_los_ultimos_pasos(tabla, codigo):
+    completa = ArbolSintactico.TrazaUltimos()
+    ultimos = ArbolSintactico.TrazaUltimos(5)
+    for traza in (completa, ultimos):
+        tokens = ArbolSintactico.ejecutar_lexer(codigo)
+        assert ArbolSintactico.analizar_cadena(tabla, tokens, tabla.terminales, codigo, traza=traza)[0]
+    assert ultimos.filas() == completa.filas()[-5:]
+
+
+@pytest.mark.parametrize("n", [0, -1])
+def test_traza_ultimos_invalido(n):
+    with pytest.raises(ValueError):
+        ArbolSintactico.TrazaUltimos(n)
+    proceso = subprocess.run([sys.executable, main.__file__, "--traza-ultimos", str(n)],
+                             capture_output=True, text=True)
+    assert proceso.returncode == 2
+    assert "--traza-ultimos" in proceso.stderr
+    assert "Traceback" not in proceso.stderr